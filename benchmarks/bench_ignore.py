@@ -0,0 +1,113 @@
+# benchmarks/bench_ignore.py
+# Microbenchmark del comprobador de patrones .ignore compilado frente al recorrido lineal original.
+# Uso: python benchmarks/bench_ignore.py [--patrones 10000] [--rutas 100000] [--muestra-lineal 500]
+import os
+import sys
+import time
+import random
+import argparse
+from typing import List, Optional, Set, Tuple
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from proyscan.ignore_handler import PatronesIgnorar
+
+SEGMENTOS = ['src', 'lib', 'app', 'core', 'utils', 'web', 'static', 'tests', 'docs', 'vendor', 'build', 'dist']
+EXTENSIONES = ['.py', '.js', '.ts', '.css', '.html', '.json', '.md', '.txt', '.java', '.vue', '.log', '.tmp']
+
+def generar_patrones(n: int, rng: random.Random) -> List[str]:
+    """Mezcla realista: nombres de archivo/directorio, extensiones, comodines y rutas con '/'."""
+    patrones: Set[str] = set()
+    while len(patrones) < n:
+        tipo = rng.random()
+        sufijo = str(rng.randrange(n * 10))
+        if tipo < 0.3:
+            patrones.add(f"{rng.choice(SEGMENTOS)}_{sufijo}/")
+        elif tipo < 0.5:
+            patrones.add(f"archivo_{sufijo}{rng.choice(EXTENSIONES)}")
+        elif tipo < 0.65:
+            patrones.add(f".ext{sufijo}")
+        elif tipo < 0.8:
+            patrones.add(f"*.gen{sufijo}")
+        else:
+            patrones.add(f"{rng.choice(SEGMENTOS)}/{rng.choice(SEGMENTOS)}_{sufijo}/")
+    return sorted(patrones)
+
+def generar_rutas(n: int, rng: random.Random, patrones: List[str]) -> List[Tuple[str, bool]]:
+    """Rutas de 1 a 6 niveles; una parte de los nombres se toma de los patrones para que haya coincidencias."""
+    rutas: List[Tuple[str, bool]] = []
+    for _ in range(n):
+        niveles = [rng.choice(SEGMENTOS) for _ in range(rng.randint(0, 5))]
+        es_directorio = rng.random() < 0.2
+        if rng.random() < 0.1:
+            nombre = rng.choice(patrones).rstrip('/').rpartition('/')[2].replace('*', 'x')
+        else:
+            nombre = f"f{rng.randrange(1000)}{'' if es_directorio else rng.choice(EXTENSIONES)}"
+        rutas.append(('/'.join(niveles + [nombre]), es_directorio))
+    return rutas
+
+def ignorar_lineal(ruta: str, es_directorio: bool, patrones: Set[str]) -> Tuple[bool, Optional[str]]:
+    """Referencia: el recorrido de todos los patrones por ruta que hacía debe_ignorar (sin logs)."""
+    ruta_comparacion = ruta + '/' if es_directorio else ruta
+    nombre_base = ruta.rpartition('/')[2]
+    for patron in patrones:
+        es_patron_dir = patron.endswith('/')
+        base_patron = patron.rstrip('/')
+        if ruta_comparacion == patron:
+            return True, f"coincidencia_exacta ({patron})"
+        if '/' not in base_patron:
+            if es_patron_dir and es_directorio and nombre_base == base_patron:
+                return True, f"coincidencia_base_dir ({patron})"
+            if not es_patron_dir and not es_directorio and nombre_base == base_patron:
+                return True, f"coincidencia_base_archivo ({patron})"
+        if not es_directorio and not es_patron_dir and '/' not in patron:
+            if patron.startswith('.') and ruta.endswith(patron):
+                return True, f"coincidencia_extension ({patron})"
+            if patron.startswith('*.') and ruta.endswith(patron[1:]):
+                return True, f"coincidencia_comodin_ext ({patron})"
+        if es_patron_dir and ruta_comparacion.startswith(patron) and len(ruta_comparacion) > len(patron):
+            return True, f"coincidencia_dir_padre ({patron})"
+    return False, None
+
+def main():
+    parser = argparse.ArgumentParser(description="Microbenchmark del comprobador de patrones .ignore.")
+    parser.add_argument("--patrones", type=int, default=10000)
+    parser.add_argument("--rutas", type=int, default=100000)
+    parser.add_argument("--muestra-lineal", type=int, default=500, help="Rutas evaluadas con el recorrido lineal (es muy lento).")
+    parser.add_argument("--semilla", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.semilla)
+    patrones = generar_patrones(args.patrones, rng)
+    rutas = generar_rutas(args.rutas, rng, patrones)
+
+    inicio = time.perf_counter()
+    comparador = PatronesIgnorar(patrones)
+    t_compilar = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    decisiones = [comparador.comprobar(ruta, es_dir, None) for ruta, es_dir in rutas]
+    t_compilado = time.perf_counter() - inicio
+    ignoradas = sum(1 for ignorar, _ in decisiones if ignorar)
+
+    muestra = rutas[:args.muestra_lineal]
+    conjunto = set(patrones)
+    inicio = time.perf_counter()
+    decisiones_lineal = [ignorar_lineal(ruta, es_dir, conjunto) for ruta, es_dir in muestra]
+    t_lineal = time.perf_counter() - inicio
+
+    discrepancias = sum(1 for a, b in zip(decisiones_lineal, decisiones) if a[0] != b[0])
+    por_ruta_compilado = t_compilado / len(rutas) * 1e6
+    por_ruta_lineal = t_lineal / max(len(muestra), 1) * 1e6
+
+    print(f"Patrones: {len(patrones)}  Rutas: {len(rutas)}  Ignoradas: {ignoradas}")
+    print(f"Compilación:        {t_compilar * 1000:10.1f} ms")
+    print(f"Compilado:          {t_compilado * 1000:10.1f} ms  ({por_ruta_compilado:.2f} us/ruta)")
+    print(f"Lineal (muestra {len(muestra)}): {t_lineal * 1000:10.1f} ms  ({por_ruta_lineal:.2f} us/ruta, "
+          f"~{por_ruta_lineal * len(rutas) / 1e6:.1f} s estimados para todas)")
+    print(f"Aceleración:        {por_ruta_lineal / por_ruta_compilado:10.0f}x")
+    print(f"Discrepancias en la muestra: {discrepancias}")
+    return 1 if discrepancias else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,176 @@
+# benchmarks/bench_parsers.py
+# Microbenchmark por parser de dependencias sobre un corpus adversarial: bundles minificados,
+# barrels TS enormes, plantillas PHP y entradas pensadas para provocar backtracking en las regex.
+# Para cada caso mide ms por MB a dos tamaños (N y 2N): un escalado muy superior a 2x delata un
+# patrón superlineal aunque el tiempo absoluto aún sea pequeño. Sale con código 1 si algún caso
+# supera el límite de ms/MB o escala de forma superlineal.
+# Uso: python benchmarks/bench_parsers.py [--tamano-kb 256] [--parser js] [--repeticiones 5] [--factor-limites 1.0] [--json]
+import os
+import sys
+import gc
+import json
+import time
+import random
+import argparse
+from typing import Callable, Dict, List, Tuple
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from proyscan.dependency_analysis.analyzer import analizar_dependencias, PARSER_POR_LENGUAJE
+from proyscan.dependency_analysis.context import ContextoAnalisis
+
+# Peor caso admitido por parser (ms por MB de entrada), con margen ~3x sobre lo medido
+LIMITES_MS_POR_MB: Dict[str, float] = {
+    'js': 2500.0, 'regex': 2500.0, 'css': 2500.0, 'html': 1000.0, 'vue': 5000.0, 'python': 6000.0, 'java': 500.0,
+}
+# Tiempo(2N) / Tiempo(N) admitido. Lineal da 2 y cuadrático 4; 3.0 está por encima de la media
+# geométrica de ambos (2·√2 ≈ 2.83), así que falla todo lo que crezca más rápido que ~N^1.6. Con
+# GC desactivado y los dos tamaños alternados, los parsers lineales miden 1.8-2.5 (algún pico
+# aislado de ~3 por carga de la máquina): un caso que supera el límite se vuelve a medir y solo
+# falla si lo supera en ambas medidas, mientras que un patrón cuadrático mide ~4 las dos veces.
+MAX_ESCALADO = 3.0
+MIN_MS_ESCALADO = 25.0 # Por debajo, el escalado es ruido de medida
+CONTEXTO = ContextoAnalisis({'src/a.js', 'src/b.ts', 'src/estilos.css', 'src/index.html', 'src/a.php', 'app/mod.py'}, '.')
+
+def _repetir(fragmento: Callable[[int], str], tamano: int) -> str:
+    """Concatena fragmentos numerados hasta alcanzar `tamano` caracteres."""
+    partes, total, i = [], 0, 0
+    while total < tamano:
+        parte = fragmento(i)
+        partes.append(parte)
+        total += len(parte)
+        i += 1
+    return ''.join(partes)
+
+def _minificado(tamano: int) -> str:
+    rng = random.Random(1)
+    return _repetir(lambda i: (
+        f'var a{i}=function(b){{return b+{i}}};import{{x{i} as y{i}}}from"./m{i % 50}.js";'
+        f'const s{i}="import from require {rng.random()}";if(a{i}){{fetch("/api/{i}",{{}})}}'
+    ), tamano)
+
+CORPUS: Dict[str, List[Tuple[str, str, Callable[[int], str]]]] = {
+    # parser -> [(caso, lenguaje, generador(tamaño) -> texto)]
+    'js': [
+        ('js_bundle_minificado', 'javascript', _minificado),
+        ('js_import_sin_from', 'javascript', lambda n: 'import ' + _repetir(lambda i: f'a{i}, ', n)),
+        ('js_import_repetido', 'javascript', lambda n: _repetir(lambda i: 'import a ', n)),
+        ('js_espacios_tras_import', 'javascript', lambda n: 'import' + ' ' * n + 'x'),
+        ('js_require_sin_cerrar', 'javascript', lambda n: _repetir(lambda i: "require('", n)),
+        ('js_modulos_normales', 'javascript', lambda n: _repetir(lambda i: (
+            f"import {{ f{i}, g{i} }} from './mod{i % 40}.js';\nconst l{i} = require('lodash');\n"
+            f"export function h{i}(x) {{ return x * {i}; }}\n"
+        ), n)),
+        ('ts_barrel', 'typescript', lambda n: _repetir(lambda i: f"export * from './componentes/c{i}';\nexport {{ T{i} }} from \"./tipos/t{i}\";\n", n)),
+        ('ts_import_lista_enorme', 'typescript', lambda n: 'import {\n' + _repetir(lambda i: f'  Nombre{i},\n', n) + "} from './barrel';\n"),
+        ('ts_from_repetido', 'typescript', lambda n: _repetir(lambda i: 'from x ', n)),
+        ('ts_import_type_espacios', 'typescript', lambda n: _repetir(lambda i: 'import type' + ' ' * 3000 + 'x\n', n)),
+        ('ts_linea_unica', 'typescript', lambda n: _repetir(lambda i: f"import a{i} from 'm{i}'; let v{i} = 'from' + x; ", n)),
+    ],
+    'regex': [
+        ('php_plantilla', 'php', lambda n: _repetir(lambda i: (
+            f"<div class=\"fila{i}\"><?php include 'parciales/p{i % 30}.php'; ?>"
+            f"<?php require_once __DIR__ . '/lib/l{i % 7}.php'; echo $v{i}; ?></div>\n"
+        ), n)),
+        ('php_include_sin_comillas', 'php', lambda n: _repetir(lambda i: 'include x ', n)),
+        ('php_include_cadena_abierta', 'php', lambda n: 'include "' + 'a' * n),
+    ],
+    'html': [
+        ('html_pagina', 'html', lambda n: '<html><body>' + _repetir(lambda i: (
+            f'<div style="background:url(\'img/{i}.png\')"><a href="p{i}.html">x</a>'
+            f'<img src="i{i}.png" srcset="a.png 1x, b.png 2x"><script src="s{i}.js"></script></div>\n'
+        ), n) + '</body></html>'),
+        ('html_etiquetas_sin_cerrar', 'html', lambda n: _repetir(lambda i: '<a href="x" ', n)),
+        ('html_style_url_repetido', 'html', lambda n: '<div style="' + _repetir(lambda i: 'url(', n) + '"></div>'),
+    ],
+    'css': [
+        ('css_hoja', 'css', lambda n: _repetir(lambda i: f'@import "parcial{i % 20}.css";\n.c{i} {{ background: url("img/{i}.png"); margin: {i}px; }}\n', n)),
+        ('css_url_sin_cerrar', 'css', lambda n: _repetir(lambda i: 'url(', n)),
+        ('css_minificado', 'css', lambda n: _repetir(lambda i: f'.c{i}{{background:url(i{i}.png)}}', n)),
+    ],
+    'python': [
+        ('python_modulo', 'python', lambda n: _repetir(lambda i: f'import os\nfrom app import mod\nfrom .x{i % 9} import y\n\ndef f{i}(a):\n    return a + {i}\n', n)),
+    ],
+    'java': [
+        ('java_clase', 'java', lambda n: 'package com.ejemplo;\n' + ''.join(f'import com.ejemplo.util.C{i};\n' for i in range(200))
+            + 'public class A {\n' + _repetir(lambda i: f'    int m{i}(int x) {{ return x + {i}; }}\n', n) + '}\n'),
+    ],
+    'vue': [
+        ('vue_sfc', 'vue', lambda n: '<template><div>{{ x }}</div></template>\n<script>\n'
+            + _repetir(lambda i: f"import C{i} from './C{i}.vue';\n", n // 2)
+            + '</script>\n<style>\n' + _repetir(lambda i: f'.c{i} {{ background: url("i{i}.png"); }}\n', n // 2) + '</style>\n'),
+        ('vue_template_anidado', 'vue', lambda n: '<template>' + _repetir(lambda i: f'<template v-if="a{i}"><img src="i{i}.png">', n) + '</template>'),
+        ('vue_etiquetas_sin_cerrar', 'vue', lambda n: _repetir(lambda i: f'<style a="{i}" <script <i18n ', n)),
+    ],
+}
+
+def medir(lenguaje: str, texto: str, texto_doble: str, repeticiones: int) -> Tuple[float, float]:
+    """
+    Mejor tiempo (segundos) del analizador del lenguaje sobre `texto` y sobre `texto_doble`. Las
+    ejecuciones de ambos tamaños se alternan para que la carga de la máquina afecte a los dos por igual.
+    """
+    lineas, lineas_doble = texto.split('\n'), texto_doble.split('\n')
+    mejor, mejor_doble = float('inf'), float('inf')
+    gc.collect()
+    gc.disable() # Una pausa del recolector dentro de una sola medida basta para falsear el escalado
+    try:
+        for _ in range(repeticiones):
+            inicio = time.perf_counter()
+            analizar_dependencias(lineas, lenguaje, 'src/entrada', CONTEXTO, '.')
+            medio = time.perf_counter()
+            analizar_dependencias(lineas_doble, lenguaje, 'src/entrada', CONTEXTO, '.')
+            fin = time.perf_counter()
+            mejor, mejor_doble = min(mejor, medio - inicio), min(mejor_doble, fin - medio)
+    finally:
+        gc.enable()
+    return mejor, mejor_doble
+
+def main():
+    parser = argparse.ArgumentParser(description="Microbenchmark adversarial de los parsers de dependencias.")
+    parser.add_argument("--tamano-kb", type=int, default=256, help="Tamaño base de cada entrada (se mide también al doble).")
+    parser.add_argument("--parser", choices=sorted(CORPUS), action='append', help="Parser(s) a medir (por defecto: todos).")
+    parser.add_argument("--repeticiones", type=int, default=5, help="Se toma el mejor tiempo de N ejecuciones.")
+    parser.add_argument("--factor-limites", type=float, default=1.0, help="Multiplica LIMITES_MS_POR_MB (máquinas más lentas).")
+    parser.add_argument("--json", action='store_true', help="Imprime los resultados en JSON.")
+    args = parser.parse_args()
+
+    import logging
+    logging.disable(logging.CRITICAL) # Los parsers avisan de las entradas inválidas; aquí solo importa el tiempo
+    tamano = args.tamano_kb * 1024
+    resultados: Dict[str, Dict[str, Dict[str, float]]] = {}
+    fallos: List[str] = []
+    for nombre_parser in args.parser or sorted(CORPUS):
+        for caso, lenguaje, generador in CORPUS[nombre_parser]:
+            assert PARSER_POR_LENGUAJE[lenguaje] == nombre_parser, caso
+            texto, texto_doble = generador(tamano), generador(2 * tamano)
+            segundos, segundos_doble = medir(lenguaje, texto, texto_doble, args.repeticiones)
+            escalado = segundos_doble / segundos if segundos > 0 else 0.0
+            if segundos_doble * 1000 >= MIN_MS_ESCALADO and escalado > MAX_ESCALADO: # Se confirma con otra medida
+                repeticion, repeticion_doble = medir(lenguaje, texto, texto_doble, args.repeticiones)
+                if repeticion > 0 and repeticion_doble / repeticion < escalado:
+                    segundos, segundos_doble, escalado = repeticion, repeticion_doble, repeticion_doble / repeticion
+            ms_por_mb = segundos_doble * 1000 / (len(texto_doble) / 1e6)
+            resultados.setdefault(nombre_parser, {})[caso] = {
+                'ms_per_mb': round(ms_por_mb, 1), 'scaling_2x': round(escalado, 2), 'ms_2x': round(segundos_doble * 1000, 1),
+            }
+            limite = LIMITES_MS_POR_MB[nombre_parser] * args.factor_limites
+            if ms_por_mb > limite:
+                fallos.append(f"{nombre_parser}/{caso}: {ms_por_mb:.0f} ms/MB > {limite:.0f}")
+            if segundos_doble * 1000 >= MIN_MS_ESCALADO and escalado > MAX_ESCALADO:
+                fallos.append(f"{nombre_parser}/{caso}: escalado superlineal x{escalado:.1f} al duplicar la entrada")
+
+    if args.json:
+        print(json.dumps(resultados, indent=2))
+    else:
+        print(f"{'parser':<8} {'caso':<28} {'ms/MB':>9} {'x2':>6}")
+        for nombre_parser, casos in resultados.items():
+            for caso, medida in casos.items():
+                print(f"{nombre_parser:<8} {caso:<28} {medida['ms_per_mb']:>9.1f} {medida['scaling_2x']:>6.2f}")
+            peor = max(casos.items(), key=lambda item: item[1]['ms_per_mb'])
+            print(f"{nombre_parser:<8} {'-> peor caso: ' + peor[0]:<28} {peor[1]['ms_per_mb']:>9.1f}")
+    for fallo in fallos:
+        print(f"FALLO {fallo}", file=sys.stderr)
+    return 1 if fallos else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
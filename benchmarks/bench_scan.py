@@ -0,0 +1,196 @@
+# benchmarks/bench_scan.py
+# Benchmark reproducible del escaneo completo sobre proyectos sintéticos (ver synthetic_repo.py).
+# Mide tiempo total, tiempo por fase (sección `timing` de scan_info.json) y pico de memoria (RSS)
+# de cada modo, comprueba que los modos rápidos producen la misma salida que el escaneo en serie
+# y compara con una línea base guardada para detectar regresiones (sale con código 1 si las hay).
+# Uso:
+#   python benchmarks/bench_scan.py [--perfil mediano] [--repeticiones 3] [--jobs 4]
+#   python benchmarks/bench_scan.py --guardar-base benchmarks/base_local.json
+#   python benchmarks/bench_scan.py --comparar benchmarks/base_local.json [--tolerancia 0.25]
+import os
+import sys
+import json
+import time
+import shutil
+import platform
+import argparse
+import tempfile
+import statistics
+import subprocess
+from typing import Any, Dict, List, Optional
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from proyscan.config import ARCHIVO_CONTENIDO, ARCHIVO_ESTRUCTURA, ARCHIVO_GRAFO, ARCHIVO_GRAFO_COMPACTO, ARCHIVO_INFO
+from synthetic_repo import generar_proyecto
+
+PERFILES: Dict[str, Dict[str, int]] = {
+    'pequeno': {'num_archivos': 300, 'profundidad': 3, 'imports_por_archivo': 4, 'lineas_por_archivo': 80},
+    'mediano': {'num_archivos': 2000, 'profundidad': 4, 'imports_por_archivo': 6, 'lineas_por_archivo': 120},
+    'grande': {'num_archivos': 10000, 'profundidad': 5, 'imports_por_archivo': 8, 'lineas_por_archivo': 150},
+}
+ARCHIVOS_COMPARADOS = (ARCHIVO_CONTENIDO, ARCHIVO_ESTRUCTURA, ARCHIVO_GRAFO, ARCHIVO_GRAFO_COMPACTO)
+MIN_MS_COMPARABLE = 50.0 # Las fases más cortas son ruido y no se comparan con la base
+
+def _pico_rss_mb() -> Optional[float]:
+    """Pico de RSS de este proceso y de sus hijos (trabajadores del pool), en MB."""
+    try:
+        import resource
+    except ImportError: # Windows
+        return None
+    escala = 1024 * 1024 if sys.platform == 'darwin' else 1024 # ru_maxrss: bytes en macOS, KB en Linux
+    propio = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    hijos = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return round(max(propio, hijos) / escala, 1)
+
+def _ejecucion_aislada(parametros: Dict[str, Any]) -> int:
+    """Punto de entrada del subproceso: un escaneo por proceso para que el pico de RSS sea solo suyo."""
+    import logging
+    logging.basicConfig(level=logging.WARNING)
+    from proyscan.core import ejecutar_escaneo
+    inicio = time.perf_counter()
+    ejecutar_escaneo(
+        parametros['objetivo'], 'proyscan.py', parametros['salida'], False,
+        jobs=parametros['jobs'], directorio_previo=parametros.get('previo'),
+    )
+    segundos = time.perf_counter() - inicio
+    with open(os.path.join(parametros['salida'], ARCHIVO_INFO), 'r', encoding='utf-8') as f:
+        timing = json.load(f)['timing']
+    print(json.dumps({'wall_s': segundos, 'timing': timing, 'peak_rss_mb': _pico_rss_mb()}))
+    return 0
+
+def _lanzar(objetivo: str, salida: str, jobs: int, previo: Optional[str]) -> Dict[str, Any]:
+    os.makedirs(salida)
+    parametros = {'objetivo': objetivo, 'salida': salida, 'jobs': jobs, 'previo': previo}
+    resultado = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '--ejecucion-aislada', json.dumps(parametros)],
+        capture_output=True, text=True,
+    )
+    if resultado.returncode != 0:
+        raise RuntimeError(f"El escaneo falló (jobs={jobs}, previo={previo}):\n{resultado.stderr}")
+    return json.loads(resultado.stdout.strip().splitlines()[-1])
+
+def _mismas_salidas(referencia: str, candidata: str) -> List[str]:
+    """Nombres de los archivos de salida que difieren byte a byte de la referencia."""
+    distintos = []
+    for nombre in ARCHIVOS_COMPARADOS:
+        with open(os.path.join(referencia, nombre), 'rb') as fa, open(os.path.join(candidata, nombre), 'rb') as fb:
+            if fa.read() != fb.read():
+                distintos.append(nombre)
+    return distintos
+
+def _agregar(ejecuciones: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Medianas de tiempo y máximo de RSS sobre las repeticiones de un modo."""
+    fases: Dict[str, List[float]] = {}
+    for ejecucion in ejecuciones:
+        for nombre, tramo in ejecucion['timing']['spans'].items():
+            if tramo['category'] == 'phase':
+                fases.setdefault(nombre, []).append(tramo['total_ms'])
+    rss = [e['peak_rss_mb'] for e in ejecuciones if e['peak_rss_mb'] is not None]
+    return {
+        'wall_ms': round(statistics.median(e['wall_s'] for e in ejecuciones) * 1000, 1),
+        'phases_ms': {nombre: round(statistics.median(valores), 1) for nombre, valores in fases.items()},
+        'peak_rss_mb': max(rss) if rss else None,
+        'runs': len(ejecuciones),
+    }
+
+def medir_perfil(nombre: str, repeticiones: int, jobs: int, directorio_trabajo: str) -> Dict[str, Any]:
+    perfil = PERFILES[nombre]
+    objetivo = os.path.join(directorio_trabajo, f'proyecto_{nombre}')
+    if not os.path.isdir(objetivo):
+        generar_proyecto(objetivo, **perfil)
+    # modo -> (jobs, usa el escaneo en serie como --since)
+    modos = {'serial': (1, False), 'parallel': (jobs, False), 'incremental': (1, True)}
+    ejecuciones: Dict[str, List[Dict[str, Any]]] = {modo: [] for modo in modos}
+    diferencias: Dict[str, set] = {}
+    for repeticion in range(repeticiones):
+        referencia = os.path.join(directorio_trabajo, f'{nombre}_serial_{repeticion}')
+        for modo, (jobs_modo, incremental) in modos.items():
+            salida = os.path.join(directorio_trabajo, f'{nombre}_{modo}_{repeticion}')
+            shutil.rmtree(salida, ignore_errors=True)
+            ejecuciones[modo].append(_lanzar(objetivo, salida, jobs_modo, referencia if incremental else None))
+            if modo != 'serial':
+                distintos = _mismas_salidas(referencia, salida)
+                if distintos:
+                    diferencias.setdefault(modo, set()).update(distintos)
+            print(f"  {nombre}/{modo} #{repeticion + 1}: {ejecuciones[modo][-1]['wall_s'] * 1000:.0f} ms", file=sys.stderr)
+    return {
+        'profile': perfil,
+        'modes': {modo: _agregar(lista) for modo, lista in ejecuciones.items()},
+        'equivalence_failures': {modo: sorted(distintos) for modo, distintos in diferencias.items()},
+    }
+
+def comparar_con_base(resultados: Dict[str, Any], base: Dict[str, Any], tolerancia: float) -> List[str]:
+    """Lista de regresiones: tiempos o RSS por encima de la base en más de `tolerancia`."""
+    regresiones = []
+    for perfil, datos in resultados['profiles'].items():
+        datos_base = base.get('profiles', {}).get(perfil)
+        if not datos_base:
+            continue
+        for modo, medidas in datos['modes'].items():
+            medidas_base = datos_base['modes'].get(modo)
+            if not medidas_base:
+                continue
+            pares = [('wall_ms', medidas['wall_ms'], medidas_base['wall_ms'])]
+            pares += [
+                (f'phases_ms.{fase}', valor, medidas_base['phases_ms'][fase])
+                for fase, valor in medidas['phases_ms'].items() if fase in medidas_base['phases_ms']
+            ]
+            for clave, actual, anterior in pares:
+                if anterior >= MIN_MS_COMPARABLE and actual > anterior * (1 + tolerancia):
+                    regresiones.append(f"{perfil}/{modo} {clave}: {anterior} -> {actual} ms (+{(actual / anterior - 1) * 100:.0f}%)")
+            if medidas['peak_rss_mb'] and medidas_base.get('peak_rss_mb') and medidas['peak_rss_mb'] > medidas_base['peak_rss_mb'] * (1 + tolerancia):
+                regresiones.append(f"{perfil}/{modo} peak_rss_mb: {medidas_base['peak_rss_mb']} -> {medidas['peak_rss_mb']}")
+    return regresiones
+
+def main():
+    if len(sys.argv) == 3 and sys.argv[1] == '--ejecucion-aislada':
+        return _ejecucion_aislada(json.loads(sys.argv[2]))
+
+    parser = argparse.ArgumentParser(description="Benchmark del escaneo completo de ProyScan sobre proyectos sintéticos.")
+    parser.add_argument("--perfil", choices=sorted(PERFILES), action='append', help="Perfil(es) a medir (por defecto: mediano).")
+    parser.add_argument("--repeticiones", type=int, default=3)
+    parser.add_argument("--jobs", type=int, default=max(2, os.cpu_count() or 1), help="Procesos del modo paralelo.")
+    parser.add_argument("--directorio-trabajo", help="Dónde generar proyectos y salidas (por defecto: temporal, se borra al terminar).")
+    parser.add_argument("--guardar-base", metavar="RUTA", help="Guarda los resultados como línea base.")
+    parser.add_argument("--comparar", metavar="RUTA", help="Compara con una línea base y sale con 1 si hay regresiones.")
+    parser.add_argument("--tolerancia", type=float, default=0.25, help="Empeoramiento relativo admitido (0.25 = 25%%).")
+    args = parser.parse_args()
+
+    directorio_trabajo = args.directorio_trabajo or tempfile.mkdtemp(prefix='proyscan_bench_')
+    os.makedirs(directorio_trabajo, exist_ok=True)
+    resultados: Dict[str, Any] = {
+        'python': platform.python_version(), 'platform': platform.platform(),
+        'cpu_count': os.cpu_count(), 'jobs': args.jobs, 'repetitions': args.repeticiones, 'profiles': {},
+    }
+    try:
+        for perfil in args.perfil or ['mediano']:
+            print(f"Perfil '{perfil}' ({PERFILES[perfil]['num_archivos']} archivos)...", file=sys.stderr)
+            resultados['profiles'][perfil] = medir_perfil(perfil, args.repeticiones, args.jobs, directorio_trabajo)
+    finally:
+        if not args.directorio_trabajo:
+            shutil.rmtree(directorio_trabajo, ignore_errors=True)
+
+    print(json.dumps(resultados, indent=2))
+    codigo = 0
+    for perfil, datos in resultados['profiles'].items():
+        for modo, distintos in datos['equivalence_failures'].items():
+            print(f"SALIDA DISTINTA {perfil}/{modo}: {', '.join(distintos)}", file=sys.stderr)
+            codigo = 1
+    if args.guardar_base:
+        with open(args.guardar_base, 'w', encoding='utf-8') as f:
+            json.dump(resultados, f, indent=2)
+        print(f"Línea base guardada en {args.guardar_base}", file=sys.stderr)
+    if args.comparar:
+        with open(args.comparar, 'r', encoding='utf-8') as f:
+            regresiones = comparar_con_base(resultados, json.load(f), args.tolerancia)
+        for regresion in regresiones:
+            print(f"REGRESIÓN {regresion}", file=sys.stderr)
+        if regresiones:
+            codigo = 1
+        else:
+            print(f"Sin regresiones frente a {args.comparar} (tolerancia {args.tolerancia:.0%}).", file=sys.stderr)
+    return codigo
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,191 @@
+# benchmarks/synthetic_repo.py
+# Generador reproducible de proyectos sintéticos para los benchmarks: número de archivos,
+# mezcla de lenguajes, profundidad de directorios, imports por archivo y tamaño configurables.
+# Uso: python benchmarks/synthetic_repo.py DESTINO [--archivos 2000] [--profundidad 4] [--imports 5] [--lineas 120]
+import os
+import sys
+import random
+import argparse
+from typing import Dict, List, Optional
+
+# Mezcla por defecto (proporciones relativas)
+MEZCLA_DEFECTO: Dict[str, float] = {
+    'python': 0.35, 'javascript': 0.15, 'typescript': 0.15,
+    'html': 0.05, 'css': 0.10, 'java': 0.12, 'vue': 0.08,
+}
+RAIZ_LENGUAJE = {
+    'python': 'app', 'javascript': 'web/js', 'typescript': 'web/ts', 'html': 'web/pages',
+    'css': 'web/css', 'java': 'java/src/main/java/com/synth', 'vue': 'web/components',
+}
+EXTENSION = {
+    'python': '.py', 'javascript': '.js', 'typescript': '.ts', 'html': '.html',
+    'css': '.css', 'java': '.java', 'vue': '.vue',
+}
+LIBRERIAS = {
+    'python': ['requests', 'numpy', 'yaml'], 'python_stdlib': ['os', 'json', 're', 'typing', 'collections'],
+    'javascript': ['lodash', 'react', 'axios'], 'typescript': ['rxjs', '@angular/core', 'zod'],
+    'java': ['java.util.List', 'java.io.File', 'org.slf4j.Logger'],
+}
+RAMAS = 4 # Subdirectorios por nivel
+
+def _ruta_relativa(destino: str, origen: str) -> str:
+    relativa = os.path.relpath(destino, os.path.dirname(origen) or '.').replace(os.sep, '/')
+    return relativa if relativa.startswith('.') else './' + relativa
+
+def _directorio(indice: int, profundidad: int) -> str:
+    """Reparte los archivos en un árbol de RAMAS subdirectorios por nivel."""
+    partes = []
+    for nivel in range(profundidad):
+        partes.append(f"d{nivel}_{indice % RAMAS}")
+        indice //= RAMAS
+    return '/'.join(partes)
+
+def _relleno(rng: random.Random, lineas: int, comentario: str) -> List[str]:
+    return [f"{comentario} linea de relleno {i} {rng.random():.6f}" for i in range(lineas)]
+
+def _planificar(num_archivos: int, mezcla: Dict[str, float], profundidad: int) -> Dict[str, List[str]]:
+    """Rutas relativas de los archivos de cada lenguaje."""
+    total_peso = sum(mezcla.values())
+    rutas: Dict[str, List[str]] = {}
+    asignados = 0
+    lenguajes = [l for l in MEZCLA_DEFECTO if mezcla.get(l)]
+    for posicion, lenguaje in enumerate(lenguajes):
+        cantidad = num_archivos - asignados if posicion == len(lenguajes) - 1 else int(num_archivos * mezcla[lenguaje] / total_peso)
+        asignados += cantidad
+        lista = []
+        for i in range(cantidad):
+            directorio = _directorio(i, profundidad)
+            nombre = f"Clase{i}" if lenguaje in ('java', 'vue') else f"mod_{i}"
+            lista.append(f"{RAIZ_LENGUAJE[lenguaje]}/{directorio}/{nombre}{EXTENSION[lenguaje]}")
+        rutas[lenguaje] = lista
+    return rutas
+
+def _python(ruta: str, rng: random.Random, rutas: Dict[str, List[str]], imports: int, lineas: int) -> List[str]:
+    salida = [f"import {m}" for m in rng.sample(LIBRERIAS['python_stdlib'], 2)]
+    salida.append(f"import {rng.choice(LIBRERIAS['python'])}")
+    for objetivo in rng.sample(rutas['python'], min(imports, len(rutas['python']))):
+        modulo = objetivo[:-3].replace('/', '.')
+        paquete, _, nombre = modulo.rpartition('.')
+        salida.append(f"from {paquete} import {nombre}" if rng.random() < 0.5 else f"import {modulo}")
+    salida += ["", "", "def funcion_principal(valor):", "    return valor * 2", ""]
+    return salida + _relleno(rng, lineas, '#')
+
+def _javascript(ruta: str, rng: random.Random, rutas: Dict[str, List[str]], imports: int, lineas: int, lenguaje: str) -> List[str]:
+    salida = [f"import {{ algo }} from '{rng.choice(LIBRERIAS[lenguaje])}';"]
+    for i, objetivo in enumerate(rng.sample(rutas[lenguaje], min(imports, len(rutas[lenguaje])))):
+        relativa = _ruta_relativa(objetivo, ruta)
+        if lenguaje == 'typescript':
+            relativa = relativa[:-3] # TS importa sin extensión
+        salida.append(f"import {{ f{i} }} from '{relativa}';" if rng.random() < 0.8 else f"const m{i} = require('{relativa}');")
+    salida += ["", "export function principal(valor) {", "  return valor * 2;", "}", ""]
+    return salida + _relleno(rng, lineas, '//')
+
+def _html(ruta: str, rng: random.Random, rutas: Dict[str, List[str]], imports: int, lineas: int) -> List[str]:
+    salida = ["<!DOCTYPE html>", "<html>", "<head>"]
+    for objetivo in rng.sample(rutas.get('css', []), min(2, len(rutas.get('css', [])))):
+        salida.append(f'  <link rel="stylesheet" href="{_ruta_relativa(objetivo, ruta)}">')
+    for objetivo in rng.sample(rutas.get('javascript', []), min(imports, len(rutas.get('javascript', [])))):
+        salida.append(f'  <script src="{_ruta_relativa(objetivo, ruta)}"></script>')
+    salida += ["</head>", "<body>", '  <img src="https://example.com/logo.png">']
+    salida += [f"  <p>Parrafo {i} {rng.random():.6f}</p>" for i in range(lineas)]
+    return salida + ["</body>", "</html>"]
+
+def _css(ruta: str, rng: random.Random, rutas: Dict[str, List[str]], imports: int, lineas: int) -> List[str]:
+    salida = [f'@import "{_ruta_relativa(objetivo, ruta)}";' for objetivo in rng.sample(rutas['css'], min(max(1, imports // 2), len(rutas['css'])))]
+    salida.append('.logo { background: url("https://example.com/fondo.png"); }')
+    return salida + [f".clase{i} {{ margin: {i}px; }}" for i in range(lineas)]
+
+def _java(ruta: str, rng: random.Random, rutas: Dict[str, List[str]], imports: int, lineas: int) -> List[str]:
+    paquete = os.path.dirname(ruta).split('java/src/main/java/', 1)[1].replace('/', '.')
+    clase = os.path.basename(ruta)[:-5]
+    salida = [f"package {paquete};", ""]
+    salida += [f"import {libreria};" for libreria in rng.sample(LIBRERIAS['java'], 2)]
+    for objetivo in rng.sample(rutas['java'], min(imports, len(rutas['java']))):
+        salida.append(f"import {objetivo.split('java/src/main/java/', 1)[1][:-5].replace('/', '.')};")
+    salida += ["", f"public class {clase} {{", "    public int principal(int valor) { return valor * 2; }"]
+    return salida + ["    " + l for l in _relleno(rng, lineas, '//')] + ["}"]
+
+def _vue(ruta: str, rng: random.Random, rutas: Dict[str, List[str]], imports: int, lineas: int) -> List[str]:
+    salida = ["<template>", "  <div class=\"componente\">{{ mensaje }}</div>", "</template>", "", "<script>"]
+    for i, objetivo in enumerate(rng.sample(rutas['vue'], min(imports // 2 + 1, len(rutas['vue'])))):
+        salida.append(f"import Comp{i} from '{_ruta_relativa(objetivo, ruta)}';")
+    for i, objetivo in enumerate(rng.sample(rutas.get('javascript', []), min(imports // 2, len(rutas.get('javascript', []))))):
+        salida.append(f"import {{ f{i} }} from '{_ruta_relativa(objetivo, ruta)}';")
+    salida += ["export default {", "  data() { return { mensaje: 'hola' }; }", "};"]
+    salida += _relleno(rng, lineas, '//')
+    salida += ["</script>", "", "<style scoped>"]
+    if rutas.get('css'):
+        salida.append(f"@import '{_ruta_relativa(rng.choice(rutas['css']), ruta)}';")
+    return salida + [".componente { color: red; }", "</style>"]
+
+def generar_proyecto(
+    destino: str,
+    num_archivos: int = 2000,
+    mezcla: Optional[Dict[str, float]] = None,
+    profundidad: int = 4,
+    imports_por_archivo: int = 5,
+    lineas_por_archivo: int = 120,
+    semilla: int = 1234
+) -> int:
+    """Crea el proyecto en `destino` (que debe no existir o estar vacío). Devuelve el número de archivos."""
+    rng = random.Random(semilla)
+    rutas = _planificar(num_archivos, mezcla or MEZCLA_DEFECTO, profundidad)
+    # Los paquetes Python necesitan __init__.py en cada directorio
+    directorios_python = {os.path.dirname(r) for r in rutas.get('python', [])}
+    for directorio in list(directorios_python):
+        while directorio and directorio not in ('.',):
+            directorios_python.add(directorio)
+            directorio = os.path.dirname(directorio)
+
+    total = 0
+    for lenguaje, lista in rutas.items():
+        for ruta in lista:
+            lineas = max(1, int(rng.gauss(lineas_por_archivo, lineas_por_archivo / 4)))
+            if lenguaje == 'python':
+                contenido = _python(ruta, rng, rutas, imports_por_archivo, lineas)
+            elif lenguaje in ('javascript', 'typescript'):
+                contenido = _javascript(ruta, rng, rutas, imports_por_archivo, lineas, lenguaje)
+            elif lenguaje == 'html':
+                contenido = _html(ruta, rng, rutas, imports_por_archivo, lineas)
+            elif lenguaje == 'css':
+                contenido = _css(ruta, rng, rutas, imports_por_archivo, lineas)
+            elif lenguaje == 'java':
+                contenido = _java(ruta, rng, rutas, imports_por_archivo, lineas)
+            else:
+                contenido = _vue(ruta, rng, rutas, imports_por_archivo, lineas)
+            ruta_completa = os.path.join(destino, ruta.replace('/', os.sep))
+            os.makedirs(os.path.dirname(ruta_completa), exist_ok=True)
+            with open(ruta_completa, 'w', encoding='utf-8') as f:
+                f.write('\n'.join(contenido) + '\n')
+            total += 1
+    for directorio in sorted(directorios_python):
+        ruta_init = os.path.join(destino, directorio.replace('/', os.sep), '__init__.py')
+        if not os.path.exists(ruta_init):
+            open(ruta_init, 'w').close()
+            total += 1
+    # Algo de ruido que el .ignore debe descartar
+    os.makedirs(os.path.join(destino, 'node_modules', 'paquete'), exist_ok=True)
+    with open(os.path.join(destino, 'node_modules', 'paquete', 'index.js'), 'w', encoding='utf-8') as f:
+        f.write("module.exports = {};\n")
+    with open(os.path.join(destino, '.ignore'), 'w', encoding='utf-8') as f:
+        f.write("node_modules/\n*.log\n")
+    return total
+
+def main():
+    parser = argparse.ArgumentParser(description="Genera un proyecto sintético para benchmarks de ProyScan.")
+    parser.add_argument("destino")
+    parser.add_argument("--archivos", type=int, default=2000)
+    parser.add_argument("--profundidad", type=int, default=4)
+    parser.add_argument("--imports", type=int, default=5, help="Imports internos por archivo.")
+    parser.add_argument("--lineas", type=int, default=120, help="Líneas medias por archivo.")
+    parser.add_argument("--semilla", type=int, default=1234)
+    args = parser.parse_args()
+    if os.path.exists(args.destino) and os.listdir(args.destino):
+        print(f"El destino {args.destino} no está vacío.", file=sys.stderr)
+        return 1
+    total = generar_proyecto(args.destino, args.archivos, None, args.profundidad, args.imports, args.lineas, args.semilla)
+    print(f"Proyecto sintético generado en {args.destino}: {total} archivos.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
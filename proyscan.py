@@ -6,6 +6,19 @@ import string
 import random
 import logging # Importar logging aquí también
 
+# Subcomandos `impact`, `pack` y `chunks`: solo leen los resultados de un escaneo existente, así
+# que se despachan antes de importar el escáner y la CLI interactiva (y sus dependencias)
+if __name__ == "__main__" and len(sys.argv) > 1 and sys.argv[1] in ("impact", "pack", "chunks"):
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
+    if sys.argv[1] == "impact":
+        from proyscan.impact import ejecutar_impacto as ejecutar_subcomando
+    elif sys.argv[1] == "pack":
+        from proyscan.context_pack import ejecutar_pack as ejecutar_subcomando
+    else:
+        from proyscan.chunk_export import ejecutar_fragmentos as ejecutar_subcomando
+    sys.exit(ejecutar_subcomando(sys.argv[2:]))
+
 # Importar la función principal
 try:
     from proyscan.core import ejecutar_escaneo
@@ -72,6 +85,22 @@ def main():
         "-d", "--debug", action="store_true",
         help="Habilitar salida de depuración detallada."
     )
+    parser.add_argument(
+        "-j", "--jobs", metavar="N", type=int, default=None,
+        help="Procesos para analizar archivos en paralelo (por defecto: nº de CPUs; 1 = en serie)."
+    )
+    parser.add_argument(
+        "--since", metavar="DIRECTORIO_ESCANEO_PREVIO", type=str, default=None,
+        help="Carpeta de un escaneo anterior: reutiliza sus resultados para los archivos sin cambios."
+    )
+    parser.add_argument(
+        "--gitignore", action="store_true",
+        help="Respetar también los .gitignore (y .ignore anidados) con la semántica de git."
+    )
+    parser.add_argument(
+        "--trace", action="store_true",
+        help="Guardar scan_trace.json (Chrome Trace / Perfetto) con un tramo por archivo, parser y fase."
+    )
     # Argumento de ayuda manual
     parser.add_argument(
          '-h', '--help', action='help', default=argparse.SUPPRESS,
@@ -90,6 +119,10 @@ def main():
             logger_launcher.error(f"Directorio objetivo inválido: {target_dir}")
             sys.exit(1)
         target_dir_abs = os.path.abspath(target_dir)
+        since_dir_abs = os.path.abspath(args.since) if args.since else None
+        if since_dir_abs and not os.path.isdir(since_dir_abs):
+            logger_launcher.error(f"Directorio de escaneo previo inválido: {args.since}")
+            sys.exit(1)
         nombre_base_proyecto = os.path.basename(target_dir_abs)
 
         # Cargar configuración para directorio de salida predeterminado
@@ -119,7 +152,9 @@ def main():
         script_name = os.path.basename(__file__)
         try:
             # Llamar directamente al core
-            ejecutar_escaneo(target_dir_abs, script_name, output_dir_escaneo_actual, debug_mode_enabled)
+            ejecutar_escaneo(target_dir_abs, script_name, output_dir_escaneo_actual, debug_mode_enabled,
+                             jobs=args.jobs, directorio_previo=since_dir_abs,
+                             usar_gitignore=args.gitignore, exportar_traza=args.trace)
         except Exception as e:
             logger_launcher.critical("ERROR INESPERADO DURANTE LA EJECUCIÓN:", exc_info=True)
             sys.exit(1)
@@ -0,0 +1,308 @@
+# proyscan/chunk_export.py
+# Subcomando `chunks`: reparte contenido_archivos.json en fragmentos numerados (chunk_0001.json...)
+# que caben en un presupuesto de tokens estimados o de bytes, para pasar un proyecto entero a un
+# LLM por partes. Los archivos de un directorio van juntos siempre que quepan y un archivo solo se
+# divide (por líneas) si por sí solo supera el presupuesto. chunks_manifest.json dice qué hay en cada uno.
+import os
+import re
+import json
+import logging
+import argparse
+import functools
+from itertools import islice
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .config import ARCHIVO_CONTENIDO, ARCHIVO_MANIFIESTO_FRAGMENTOS, DIRECTORIO_FRAGMENTOS, PRESUPUESTO_TOKENS_FRAGMENTO
+from .content_stream import (
+    APERTURA_CONTENIDO, SANGRIA_OBJETO, cierre_contenido, iterar_objetos_contenido,
+    leer_objetos_por_posicion, serializar_objeto_contenido
+)
+from .impact import cargar_grafo_escaneo
+from .models import FileObject
+
+logger = logging.getLogger(__name__) # Usa 'proyscan.chunk_export'
+
+_ALFANUMERICOS = bytes(range(0x30, 0x3a)) + bytes(range(0x41, 0x5b)) + bytes(range(0x61, 0x7b))
+_ALFANUMERICOS_Y_BLANCOS = _ALFANUMERICOS + b' \t\r\n'
+_NO_ASCII = bytes(range(0x80, 0x100))
+_SEPARADOR = b',\n'
+_SANGRIA_LINEA = b' ' * 16 # Elementos de content_lines dentro de un objeto de la lista 'files'
+# Comienzo de cada objeto serializado: permite comprobar la ruta sin decodificarlo
+_PREFIJO_RUTA = (SANGRIA_OBJETO + '{\n' + SANGRIA_OBJETO + '    "metadata": {\n' + SANGRIA_OBJETO + '        "path": ').encode('utf-8')
+_NOMBRE_FRAGMENTO = re.compile(r"chunk_\d{4,}\.json")
+
+Medida = Callable[[bytes], int]
+
+
+def estimar_tokens(datos: bytes) -> int:
+    """
+    Tokens BPE aproximados de un texto UTF-8, sin tokenizador (ni dependencias ni descargas):
+    ~4 caracteres alfanuméricos por token, un token por símbolo y por salto de línea (con su
+    sangría) y uno por carácter no ASCII. Solo usa bytes.translate/count, así que recorre cientos
+    de MB por segundo. En código y JSON queda algo por encima de un conteo por pre-tokenización
+    tipo cl100k, lo que deja margen al presupuesto.
+    """
+    alfanumericos = len(datos) - len(datos.translate(None, _ALFANUMERICOS))
+    simbolos = datos.translate(None, _ALFANUMERICOS_Y_BLANCOS)
+    no_ascii = len(simbolos) - len(simbolos.translate(None, _NO_ASCII))
+    return (alfanumericos + 3) // 4 + (len(simbolos) - no_ascii) + (no_ascii + 1) // 2 + datos.count(b'\n')
+
+
+def planificar_fragmentos(rutas: Sequence[str], costes: Sequence[int], capacidad: int) -> List[Tuple[int, int]]:
+    """
+    Rangos [inicio, fin) de archivos consecutivos, uno por fragmento. Con `rutas` ordenadas cada
+    directorio es un rango contiguo: si cabe entero en el fragmento actual se añade; si no cabe
+    ahí pero sí en uno vacío, abre fragmento; si no cabe en ninguno se reparte bajando un nivel
+    (sus archivos y subdirectorios, en orden). Un archivo mayor que `capacidad` queda solo en su rango.
+    """
+    acumulados = [0]
+    for coste in costes:
+        acumulados.append(acumulados[-1] + coste)
+    partes = [ruta.split('/') for ruta in rutas]
+    rangos: List[Tuple[int, int]] = []
+    inicio_actual = 0
+    ocupado = 0
+
+    def cerrar(hasta: int):
+        nonlocal inicio_actual, ocupado
+        if hasta > inicio_actual:
+            rangos.append((inicio_actual, hasta))
+        inicio_actual, ocupado = hasta, 0
+
+    def colocar(inicio: int, fin: int, nivel: int):
+        nonlocal ocupado
+        total = acumulados[fin] - acumulados[inicio]
+        if ocupado + total <= capacidad:
+            ocupado += total
+            return
+        if total <= capacidad:
+            cerrar(inicio)
+            ocupado = total
+            return
+        if fin - inicio == 1: # Archivo que no cabe ni solo: fragmento propio (se divide al escribir)
+            cerrar(inicio)
+            cerrar(fin)
+            return
+        i = inicio
+        while i < fin:
+            j = i + 1
+            if len(partes[i]) > nivel + 1: # Subdirectorio: todos sus archivos van seguidos
+                nombre = partes[i][nivel]
+                while j < fin and len(partes[j]) > nivel + 1 and partes[j][nivel] == nombre:
+                    j += 1
+            colocar(i, j, nivel + 1)
+            i = j
+
+    if rutas:
+        colocar(0, len(rutas), 0)
+    cerrar(len(rutas))
+    return rangos
+
+
+def dividir_objeto(file_object: FileObject, capacidad: int, medir: Medida) -> List[Tuple[bytes, Optional[Dict[str, int]]]]:
+    """
+    Partes serializadas de un archivo que no cabe en un fragmento: mismos metadatos y tramos
+    consecutivos de content_lines, marcados con 'chunk_part'. Sin líneas que repartir se devuelve
+    entero. Si los metadatos ocupan más de media parte (listas `dependencies` / `referenced_by`
+    enormes), esas listas van solo en la parte 1 y las demás las llevan a null, con
+    'metadata_in_part': 1 en su 'chunk_part'.
+    """
+    lineas = file_object.get("content_lines")
+    if not lineas or len(lineas) < 2:
+        return [(serializar_objeto_contenido(file_object), None)]
+    ruta = file_object["metadata"]["path"]
+    # Marcador con los números más largos posibles y cierre de la lista: el coste de una parte nunca se queda corto
+    maximo = len(lineas)
+    marcador = {"index": maximo, "count": maximo, "first_line": maximo, "last_line": maximo}
+    cierre = medir(_SEPARADOR) + medir(b'\n' + SANGRIA_OBJETO.encode('utf-8') + b'    ]')
+    disponible = capacidad - medir(serializar_objeto_contenido(dict(file_object, content_lines=[], chunk_part=marcador))) - cierre
+    metadatos_reducidos: Optional[Dict[str, Any]] = None
+    disponible_primera = disponible
+    if disponible < capacidad // 2:
+        metadatos_reducidos = dict(file_object["metadata"], dependencies=None, referenced_by=None)
+        base = dict(file_object, metadata=metadatos_reducidos, content_lines=[], chunk_part=dict(marcador, metadata_in_part=1))
+        disponible = capacidad - medir(serializar_objeto_contenido(base)) - cierre
+        if disponible_primera <= 0:
+            logger.warning(f"Las dependencias y referencias de '{ruta}' superan por sí solas el presupuesto: "
+                           f"van sin líneas en la parte 1, que lo supera.")
+        if disponible <= 0:
+            logger.warning(f"Los metadatos de '{ruta}' no caben en el presupuesto ni sin sus dependencias: sus partes lo superan.")
+            disponible = capacidad
+
+    tramos: List[Tuple[int, int]] = []
+    inicio = 0
+    ocupado = 0
+    limite = disponible_primera
+    for i, linea in enumerate(lineas):
+        coste = medir(_SANGRIA_LINEA + json.dumps(linea, ensure_ascii=False).encode('utf-8') + _SEPARADOR)
+        # Con los metadatos fuera, la parte 1 puede quedarse sin líneas
+        if ocupado + coste > limite and (i > inicio or (metadatos_reducidos is not None and not tramos)):
+            tramos.append((inicio, i))
+            inicio, ocupado, limite = i, 0, disponible
+        ocupado += coste
+    tramos.append((inicio, len(lineas)))
+
+    resultado = []
+    for indice, (inicio, fin) in enumerate(tramos, 1):
+        parte = dict(file_object) # Conserva el orden de claves del original
+        parte["content_lines"] = lineas[inicio:fin]
+        parte["chunk_part"] = {"index": indice, "count": len(tramos), "first_line": inicio + 1, "last_line": fin}
+        if metadatos_reducidos is not None and indice > 1:
+            parte["metadata"] = metadatos_reducidos
+            parte["chunk_part"]["metadata_in_part"] = 1
+        resultado.append((serializar_objeto_contenido(parte), parte["chunk_part"]))
+    return resultado
+
+
+def _objetos_por_posicion(directorio_escaneo: str, ruta_contenido: str) -> Optional[Callable[[], Iterator[Tuple[str, bytes]]]]:
+    """Lector de (ruta, bytes) por las posiciones del grafo compacto; None si el escaneo no las tiene."""
+    try:
+        grafo = cargar_grafo_escaneo(directorio_escaneo)
+    except (OSError, ValueError) as e:
+        logger.debug(f"Grafo no disponible ({e}); se recorre {ARCHIVO_CONTENIDO}.")
+        return None
+    if grafo is None or grafo.posiciones_contenido is None:
+        return None
+    inicios, fines = grafo.posiciones_contenido
+
+    def recorrer() -> Iterator[Tuple[str, bytes]]:
+        for ruta, datos in zip(grafo.rutas, leer_objetos_por_posicion(ruta_contenido, zip(inicios, fines))):
+            if not datos.startswith(_PREFIJO_RUTA + json.dumps(ruta, ensure_ascii=False).encode('utf-8') + b','):
+                raise ValueError(f"la posición de '{ruta}' no corresponde a su objeto")
+            yield ruta, datos
+    return recorrer
+
+
+def _objetos_recorriendo(ruta_contenido: str) -> Iterator[Tuple[str, bytes]]:
+    """Alternativa para escaneos sin posiciones: decodifica y vuelve a serializar cada objeto."""
+    for file_object in iterar_objetos_contenido(ruta_contenido):
+        yield file_object["metadata"]["path"], serializar_objeto_contenido(file_object)
+
+
+def _medir_objetos(recorrer: Callable[[], Iterator[Tuple[str, bytes]]], medir: Medida) -> Tuple[List[str], List[int]]:
+    rutas: List[str] = []
+    costes: List[int] = []
+    coste_separador = medir(_SEPARADOR)
+    for ruta, datos in recorrer():
+        rutas.append(ruta)
+        costes.append(medir(datos) + coste_separador)
+    return rutas, costes
+
+
+def _limpiar_fragmentos_previos(directorio_salida: str):
+    """Borra los chunk_NNNN.json de una exportación anterior para que no se mezclen con los nuevos."""
+    for nombre in os.listdir(directorio_salida):
+        if _NOMBRE_FRAGMENTO.fullmatch(nombre):
+            os.remove(os.path.join(directorio_salida, nombre))
+
+
+def exportar_fragmentos(
+    recorrer: Callable[[], Iterator[Tuple[str, bytes]]],
+    rutas: Sequence[str],
+    costes: Sequence[int],
+    presupuesto: int,
+    medir: Medida,
+    directorio_salida: str
+) -> List[Dict[str, Any]]:
+    """Escribe los fragmentos en orden (una sola pasada por el contenido) y devuelve sus entradas de manifiesto."""
+    capacidad = presupuesto - medir(APERTURA_CONTENIDO + cierre_contenido(1))
+    fragmentos: List[Dict[str, Any]] = []
+
+    def escribir(objetos: Sequence[bytes], rutas_fragmento: List[str], parte: Optional[Dict[str, int]]):
+        datos = b''.join([APERTURA_CONTENIDO, b'\n', _SEPARADOR.join(objetos), cierre_contenido(len(objetos))])
+        nombre = f"chunk_{len(fragmentos) + 1:04d}.json"
+        with open(os.path.join(directorio_salida, nombre), 'wb') as f:
+            f.write(datos)
+        entrada: Dict[str, Any] = {
+            "index": len(fragmentos) + 1,
+            "file": nombre,
+            "bytes": len(datos),
+            "estimated_tokens": estimar_tokens(datos),
+            "files": rutas_fragmento,
+        }
+        if parte is not None:
+            entrada["part"] = parte
+        fragmentos.append(entrada)
+
+    objetos = recorrer()
+    for inicio, fin in planificar_fragmentos(rutas, costes, capacidad):
+        bloque = [datos for _, datos in islice(objetos, fin - inicio)]
+        if fin - inicio == 1 and costes[inicio] > capacidad:
+            partes = dividir_objeto(json.loads(bloque[0]), capacidad, medir)
+            if partes[0][1] is None:
+                logger.warning(f"'{rutas[inicio]}' supera el presupuesto y tiene menos de dos líneas que repartir: fragmento propio.")
+            for datos, parte in partes:
+                escribir([datos], [rutas[inicio]], parte)
+        else:
+            escribir(bloque, list(rutas[inicio:fin]), None)
+    return fragmentos
+
+
+def ejecutar_fragmentos(argumentos: Sequence[str]) -> int:
+    """Punto de entrada de `proyscan.py chunks`; devuelve el código de salida."""
+    parser = argparse.ArgumentParser(
+        prog="proyscan.py chunks",
+        description="Reparte el contenido de un escaneo en fragmentos numerados que caben en un presupuesto de tokens (estimados) o de bytes."
+    )
+    parser.add_argument("scan_directory", metavar="DIRECTORIO_ESCANEO", help="Carpeta de resultados de un escaneo.")
+    limite = parser.add_mutually_exclusive_group()
+    limite.add_argument("--max-tokens", metavar="N", type=int, default=None, help=f"Tokens estimados por fragmento (por defecto: {PRESUPUESTO_TOKENS_FRAGMENTO}).")
+    limite.add_argument("--max-bytes", metavar="N", type=int, default=None, help="Bytes por fragmento, en lugar de tokens.")
+    parser.add_argument("-o", "--output", metavar="DIRECTORIO", default=None, help=f"Carpeta de salida (por defecto: DIRECTORIO_ESCANEO/{DIRECTORIO_FRAGMENTOS}).")
+    args = parser.parse_args(argumentos)
+
+    if args.max_bytes is not None:
+        unidad, presupuesto, medir = "bytes", args.max_bytes, len
+    else:
+        unidad, presupuesto, medir = "tokens", args.max_tokens or PRESUPUESTO_TOKENS_FRAGMENTO, estimar_tokens
+    minimo = 2 * medir(APERTURA_CONTENIDO + cierre_contenido(1))
+    if presupuesto < minimo:
+        parser.error(f"el presupuesto debe ser de al menos {minimo} {unidad}.")
+
+    ruta_contenido = os.path.join(args.scan_directory, ARCHIVO_CONTENIDO)
+    if not os.path.isfile(ruta_contenido):
+        logger.error(f"'{args.scan_directory}' no contiene {ARCHIVO_CONTENIDO}.")
+        return 1
+    directorio_salida = args.output or os.path.join(args.scan_directory, DIRECTORIO_FRAGMENTOS)
+
+    try:
+        recorrer = _objetos_por_posicion(args.scan_directory, ruta_contenido)
+        rutas: List[str] = []
+        costes: List[int] = []
+        if recorrer is not None:
+            try:
+                rutas, costes = _medir_objetos(recorrer, medir)
+            except ValueError as e:
+                logger.info(f"Posiciones del grafo no válidas ({e}): se recorre {ARCHIVO_CONTENIDO} completo.")
+                recorrer = None
+        if recorrer is None:
+            recorrer = functools.partial(_objetos_recorriendo, ruta_contenido)
+            rutas, costes = _medir_objetos(recorrer, medir)
+
+        os.makedirs(directorio_salida, exist_ok=True)
+        _limpiar_fragmentos_previos(directorio_salida)
+        fragmentos = exportar_fragmentos(recorrer, rutas, costes, presupuesto, medir, directorio_salida)
+
+        ubicacion: Dict[str, List[int]] = {}
+        for fragmento in fragmentos:
+            for ruta in fragmento["files"]:
+                ubicacion.setdefault(ruta, []).append(fragmento["index"])
+        manifiesto = {
+            "source": os.path.abspath(ruta_contenido),
+            "budget": {"unit": unidad, "limit": presupuesto},
+            "token_estimator": "heuristic",
+            "chunk_count": len(fragmentos),
+            "file_count": len(rutas),
+            "chunks": fragmentos,
+            "files": ubicacion,
+        }
+        with open(os.path.join(directorio_salida, ARCHIVO_MANIFIESTO_FRAGMENTOS), 'w', encoding='utf-8') as f:
+            json.dump(manifiesto, f, ensure_ascii=False, indent=4)
+    except (OSError, ValueError) as e:
+        logger.error(f"No se pudieron exportar los fragmentos: {e}")
+        return 1
+
+    divididos = sum(1 for indices in ubicacion.values() if len(indices) > 1)
+    logger.info(f"{len(rutas)} archivos en {len(fragmentos)} fragmentos de hasta {presupuesto} {unidad}"
+                f"{f' ({divididos} archivos divididos por líneas)' if divididos else ''} en '{directorio_salida}'.")
+    return 0
@@ -5,6 +5,15 @@ import os
 ARCHIVO_ESTRUCTURA = "estructura_archivos.txt"
 ARCHIVO_CONTENIDO = "contenido_archivos.json"
 ARCHIVO_IGNORAR = ".ignore"
+ARCHIVO_INFO = "scan_info.json"
+ARCHIVO_MANIFIESTO = "scan_manifest.json" # Huellas por archivo para re-escaneos incrementales (--since)
+ARCHIVO_TRAZA = "scan_trace.json" # Traza Chrome/Perfetto con un tramo por archivo (--trace)
+ARCHIVO_GRAFO = "dependency_graph.json" # Grafo de dependencias internas (CSR) con ciclos, capas y métricas
+ARCHIVO_GRAFO_COMPACTO = "dependency_graph.bin" # Solo rutas y arrays CSR, para consultas rápidas (impact)
+DIRECTORIO_FRAGMENTOS = "chunks" # Salida por defecto de `proyscan.py chunks`, dentro de la carpeta del escaneo
+ARCHIVO_MANIFIESTO_FRAGMENTOS = "chunks_manifest.json" # Qué archivos (o partes) hay en cada fragmento
+# Archivos de ignorados por directorio con sintaxis git (--gitignore), de menor a mayor precedencia
+ARCHIVOS_IGNORAR_GIT = (".gitignore", ".ignore")
 
 # --- Constantes de Procesamiento ---
 EXTENSIONES_BINARIAS = {
@@ -81,6 +90,19 @@ LENGUAJE_DEFECTO = 'text'
 MAX_TAMANO_MB_TEXTO = 5
 MAX_TAMANO_BYTES_TEXTO = MAX_TAMANO_MB_TEXTO * 1024 * 1024
 
+# Archivos mayores que el límite: se recorren con mmap (memoria acotada) para contar líneas y
+# extraer dependencias de la región de cabecera (imports, includes...) sin cargar el contenido.
+TAMANO_REGION_CABECERA_BYTES = 256 * 1024
+# Extracto opcional guardado en content_lines: primeras / últimas líneas (0 y 0 = sin extracto)
+LINEAS_EXTRACTO_INICIO = 0
+LINEAS_EXTRACTO_FINAL = 0
+
+# Presupuesto por defecto de cada fragmento de `proyscan.py chunks` (tokens estimados)
+PRESUPUESTO_TOKENS_FRAGMENTO = 100_000
+
+# Archivos examinados por extensión desconocida: si todos son binarios, la extensión se trata como binaria
+MUESTRAS_BINARIO_POR_EXTENSION = 3
+
 # --- Otras Configuraciones ---
 ANALIZAR_DEPENDENCIAS = True # Mantenemos esto
 
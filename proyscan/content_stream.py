@@ -0,0 +1,170 @@
+# proyscan/content_stream.py
+# Escritura y lectura en streaming de contenido_archivos.json, para que la memoria
+# no crezca con el tamaño del proyecto.
+import os
+import json
+import logging
+from array import array
+from typing import BinaryIO, Dict, Iterable, Iterator, Optional, Set, TextIO, Tuple
+
+from .models import FileObject
+
+logger = logging.getLogger(__name__) # Usa 'proyscan.content_stream'
+
+TAMANO_BLOQUE_LECTURA = 1024 * 1024
+SANGRIA_OBJETO = ' ' * 8 # Nivel de los objetos dentro de {"files": [...]} con indent=4
+APERTURA_CONTENIDO = b'{\n    "files": ['
+
+def serializar_objeto_contenido(file_object: FileObject) -> bytes:
+    """Un FileObject tal como aparece dentro de la lista 'files' (sangrado, sin separadores)."""
+    texto = json.dumps(file_object, ensure_ascii=False, indent=4, default=str)
+    # Las cadenas JSON no contienen saltos de línea literales: cada '\n' es estructural
+    return (SANGRIA_OBJETO + texto.replace('\n', '\n' + SANGRIA_OBJETO)).encode('utf-8')
+
+def cierre_contenido(total: int) -> bytes:
+    return b'\n    ]\n}' if total else b']\n}'
+
+class EscritorContenido:
+    """
+    Escribe {"files": [...]} objeto a objeto. La salida es byte a byte igual a
+    json.dump({"files": lista}, f, ensure_ascii=False, indent=4, default=str) (con saltos '\n'
+    en todas las plataformas). Guarda la posición en bytes [inicio, fin) de cada objeto para
+    poder leerlos después sin decodificar el archivo entero.
+    """
+
+    def __init__(self, ruta_salida: str):
+        self.ruta_salida = ruta_salida
+        self._f: Optional[BinaryIO] = None
+        self.total = 0
+        self.inicios = array('q')
+        self.fines = array('q')
+        self._posicion = 0
+
+    def __enter__(self) -> "EscritorContenido":
+        self._f = open(self.ruta_salida, 'wb')
+        self._escribir_bytes(APERTURA_CONTENIDO)
+        return self
+
+    def _escribir_bytes(self, datos: bytes):
+        self._f.write(datos)
+        self._posicion += len(datos)
+
+    def escribir(self, file_object: FileObject):
+        self._escribir_bytes(b'\n' if self.total == 0 else b',\n')
+        self.inicios.append(self._posicion)
+        self._escribir_bytes(serializar_objeto_contenido(file_object))
+        self.fines.append(self._posicion)
+        self.total += 1
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            if exc_type is None:
+                self._escribir_bytes(cierre_contenido(self.total))
+        finally:
+            self._f.close()
+
+class SpoolContenido:
+    """
+    Almacén temporal (JSON Lines) donde la Fase 2 deja cada FileObject en cuanto termina.
+    Las referencias inversas solo se conocen al final, así que se añaden en una segunda
+    pasada (ver `escribir_contenido_final`).
+    """
+
+    def __init__(self, ruta_spool: str):
+        self.ruta_spool = ruta_spool
+        self._f: Optional[TextIO] = None
+
+    def __enter__(self) -> "SpoolContenido":
+        self._f = open(self.ruta_spool, 'w', encoding='utf-8')
+        return self
+
+    def escribir(self, file_object: FileObject):
+        self._f.write(json.dumps(file_object, ensure_ascii=False, default=str))
+        self._f.write('\n')
+
+    def __exit__(self, exc_type, exc, tb):
+        self._f.close()
+
+    def iterar(self) -> Iterator[FileObject]:
+        with open(self.ruta_spool, 'r', encoding='utf-8') as f:
+            for linea in f:
+                yield json.loads(linea)
+
+    def eliminar(self):
+        try:
+            os.remove(self.ruta_spool)
+        except OSError as e:
+            logger.warning(f"No se pudo eliminar el archivo temporal {self.ruta_spool}: {e}")
+
+def escribir_contenido_final(spool: SpoolContenido, ruta_salida: str, dependencias_inversas: Dict[str, Set[str]]) -> EscritorContenido:
+    """
+    Segunda pasada: copia el spool a la salida final rellenando 'referenced_by'. Devuelve el
+    escritor ya cerrado (total de objetos y sus posiciones en bytes).
+    """
+    with EscritorContenido(ruta_salida) as escritor:
+        for file_object in spool.iterar():
+            ruta_archivo_actual = file_object["metadata"]["path"]
+            if ruta_archivo_actual in dependencias_inversas:
+                file_object["metadata"]["referenced_by"] = sorted(dependencias_inversas[ruta_archivo_actual])
+            escritor.escribir(file_object)
+    return escritor
+
+def leer_objetos_por_posicion(ruta_contenido: str, posiciones: Iterable[Tuple[int, int]]) -> Iterator[bytes]:
+    """Bytes de cada objeto [inicio, fin) de un contenido_archivos.json, en el orden pedido."""
+    with open(ruta_contenido, 'rb') as f:
+        for inicio, fin in posiciones:
+            f.seek(inicio)
+            yield f.read(fin - inicio)
+
+def iterar_objetos_contenido(ruta_contenido: str) -> Iterator[FileObject]:
+    """
+    Recorre los FileObject de un contenido_archivos.json sin cargarlo entero en memoria.
+    Solo mantiene en memoria el objeto que se está decodificando.
+    """
+    decodificador = json.JSONDecoder()
+    with open(ruta_contenido, 'r', encoding='utf-8') as f:
+        buffer = ''
+        eof = False
+
+        def leer_mas() -> bool:
+            nonlocal buffer, eof
+            if eof:
+                return False
+            # Crecer al menos al doble evita decodificaciones cuadráticas en objetos enormes
+            bloque = f.read(max(TAMANO_BLOQUE_LECTURA, len(buffer)))
+            if not bloque:
+                eof = True
+                return False
+            buffer += bloque
+            return True
+
+        # Localizar el inicio de la lista "files"
+        while True:
+            indice_clave = buffer.find('"files"')
+            indice_lista = buffer.find('[', indice_clave) if indice_clave != -1 else -1
+            if indice_lista != -1:
+                break
+            if not leer_mas():
+                raise ValueError(f"{ruta_contenido} no contiene la lista 'files'")
+        pos = indice_lista + 1
+
+        while True:
+            # Saltar espacios y separadores entre objetos
+            while True:
+                while pos < len(buffer) and buffer[pos] in ' \t\r\n,':
+                    pos += 1
+                if pos < len(buffer) or not leer_mas():
+                    break
+            if pos >= len(buffer):
+                raise ValueError(f"{ruta_contenido} está truncado")
+            if buffer[pos] == ']':
+                return
+            try:
+                objeto, fin = decodificador.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if leer_mas():
+                    continue # Objeto incompleto en el buffer: leer más y reintentar
+                raise
+            yield objeto
+            buffer = buffer[fin:]
+            pos = 0
@@ -0,0 +1,148 @@
+# proyscan/context_pack.py
+# Subcomando `pack`: exporta solo el contenido del cierre de dependencias internas de uno o varios
+# archivos de entrada, en orden topológico (primero lo que se usa, después quien lo usa), para
+# pasar a un LLM unos cientos de KB en lugar de todo contenido_archivos.json. Las posiciones en
+# bytes que guarda el grafo compacto permiten leer cada objeto directamente, sin decodificar el resto.
+import os
+import re
+import sys
+import json
+import logging
+import argparse
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .config import ARCHIVO_CONTENIDO, ARCHIVO_GRAFO_COMPACTO
+from .content_stream import (
+    APERTURA_CONTENIDO, cierre_contenido, iterar_objetos_contenido,
+    leer_objetos_por_posicion, serializar_objeto_contenido
+)
+from .dependency_graph import GrafoDependencias
+from .impact import cargar_grafo_escaneo, resolver_objetivos, ruta_proyecto_original
+from .models import FileObject
+
+logger = logging.getLogger(__name__) # Usa 'proyscan.context_pack'
+
+_COMILLAS_INVERSAS = re.compile(r"`{3,}")
+
+
+def _objetos_por_posicion(grafo: GrafoDependencias, ruta_contenido: str, ids: Sequence[int]) -> Optional[List[Tuple[bytes, FileObject]]]:
+    """(bytes, objeto) de cada ID leyendo solo sus bytes; None si las posiciones no cuadran con el archivo."""
+    inicios, fines = grafo.posiciones_contenido
+    objetos: List[Tuple[bytes, FileObject]] = []
+    posiciones = ((inicios[id_nodo], fines[id_nodo]) for id_nodo in ids)
+    for id_nodo, datos in zip(ids, leer_objetos_por_posicion(ruta_contenido, posiciones)):
+        try:
+            file_object = json.loads(datos)
+        except ValueError:
+            return None
+        if file_object.get("metadata", {}).get("path") != grafo.rutas[id_nodo]:
+            return None
+        objetos.append((datos, file_object))
+    return objetos
+
+
+def _objetos_recorriendo(grafo: GrafoDependencias, ruta_contenido: str, ids: Sequence[int]) -> List[Tuple[bytes, FileObject]]:
+    """Alternativa para escaneos sin posiciones: recorre contenido_archivos.json entero en streaming."""
+    buscadas = {grafo.rutas[id_nodo] for id_nodo in ids}
+    encontrados: Dict[str, FileObject] = {}
+    for file_object in iterar_objetos_contenido(ruta_contenido):
+        ruta = file_object["metadata"]["path"]
+        if ruta in buscadas:
+            encontrados[ruta] = file_object
+            if len(encontrados) == len(buscadas):
+                break
+    return [
+        (serializar_objeto_contenido(encontrados[grafo.rutas[id_nodo]]), encontrados[grafo.rutas[id_nodo]])
+        for id_nodo in ids if grafo.rutas[id_nodo] in encontrados
+    ]
+
+
+def generar_json(objetos: Sequence[Tuple[bytes, FileObject]]) -> Iterator[bytes]:
+    """Mismo formato que contenido_archivos.json ({"files": [...]}), copiando los bytes de cada objeto."""
+    yield APERTURA_CONTENIDO
+    for indice, (datos, _) in enumerate(objetos):
+        yield b'\n' if indice == 0 else b',\n'
+        yield datos
+    yield cierre_contenido(len(objetos))
+
+
+def generar_markdown(objetos: Sequence[Tuple[bytes, FileObject]], entradas: Sequence[str]) -> Iterator[bytes]:
+    """Un bloque de código por archivo, con su ruta como título."""
+    yield f"# Contexto de {', '.join(entradas)} ({len(objetos)} archivos, dependencias primero)\n".encode('utf-8')
+    for _, file_object in objetos:
+        metadata = file_object["metadata"]
+        lineas = file_object.get("content_lines")
+        partes = [f"\n## {metadata['path']}\n\n"]
+        if lineas is None:
+            partes.append(f"_(sin contenido: {metadata.get('status')})_\n")
+        else:
+            texto = "\n".join(lineas)
+            # La valla debe ser más larga que cualquier secuencia de comillas del propio archivo
+            valla = '`' * max([3] + [len(m) + 1 for m in _COMILLAS_INVERSAS.findall(texto)])
+            partes.append(f"{valla}{metadata.get('language') or ''}\n{texto}\n{valla}\n")
+        yield ''.join(partes).encode('utf-8')
+
+
+def ejecutar_pack(argumentos: Sequence[str]) -> int:
+    """Punto de entrada de `proyscan.py pack`; devuelve el código de salida."""
+    parser = argparse.ArgumentParser(
+        prog="proyscan.py pack",
+        description="Exporta el contenido de los archivos de entrada y de todo aquello de lo que dependen (dependencias internas), en orden topológico."
+    )
+    parser.add_argument("scan_directory", metavar="DIRECTORIO_ESCANEO", help="Carpeta de resultados de un escaneo.")
+    parser.add_argument("paths", metavar="ENTRADA", nargs='+', help="Archivos (o directorios) de entrada, relativos al proyecto escaneado.")
+    parser.add_argument("--max-depth", metavar="N", type=int, default=None, help="Saltos máximos desde las entradas (0 = solo las entradas).")
+    parser.add_argument("--format", choices=("json", "markdown"), default="json", help="json: como contenido_archivos.json; markdown: un bloque de código por archivo.")
+    parser.add_argument("-o", "--output", metavar="ARCHIVO", default=None, help="Archivo de salida (por defecto: salida estándar).")
+    args = parser.parse_args(argumentos)
+
+    ruta_contenido = os.path.join(args.scan_directory, ARCHIVO_CONTENIDO)
+    try:
+        grafo = cargar_grafo_escaneo(args.scan_directory)
+    except (OSError, ValueError) as e:
+        logger.error(f"No se pudo cargar el grafo de '{args.scan_directory}': {e}")
+        return 1
+    if grafo is None or not os.path.isfile(ruta_contenido):
+        logger.error(f"'{args.scan_directory}' no contiene {ARCHIVO_GRAFO_COMPACTO} y {ARCHIVO_CONTENIDO}. Vuelve a escanear el proyecto.")
+        return 1
+
+    ids_entrada, desconocidas = resolver_objetivos(grafo, args.paths, ruta_proyecto_original(args.scan_directory))
+    for ruta in desconocidas:
+        logger.warning(f"'{ruta}' no está en el escaneo.")
+    if not ids_entrada:
+        return 1
+    ids = grafo.cierre(ids_entrada, args.max_depth)
+
+    try:
+        objetos = _objetos_por_posicion(grafo, ruta_contenido, ids) if grafo.posiciones_contenido is not None else None
+        if objetos is None:
+            logger.info(f"Sin posiciones válidas en el grafo: se recorre {ARCHIVO_CONTENIDO} completo.")
+            objetos = _objetos_recorriendo(grafo, ruta_contenido, ids)
+    except (OSError, ValueError) as e:
+        logger.error(f"No se pudo leer {ruta_contenido}: {e}")
+        return 1
+
+    entradas = sorted({grafo.rutas[id_nodo] for id_nodo in ids_entrada})
+    bloques = generar_json(objetos) if args.format == "json" else generar_markdown(objetos, entradas)
+    total_bytes = 0
+    try:
+        destino = open(args.output, 'wb') if args.output else sys.stdout.buffer
+        try:
+            for bloque in bloques:
+                destino.write(bloque)
+                total_bytes += len(bloque)
+        finally:
+            if args.output:
+                destino.close()
+            else:
+                destino.flush()
+    except BrokenPipeError: # Salida cortada (| head): no es un error
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 0
+    except OSError as e:
+        logger.error(f"No se pudo escribir el paquete de contexto: {e}")
+        return 1
+
+    logger.info(f"Paquete de contexto: {len(objetos)} archivos, {total_bytes / 1024:.1f} KB "
+                f"(de {os.path.getsize(ruta_contenido) / (1024 * 1024):.1f} MB en {ARCHIVO_CONTENIDO}).")
+    return 0
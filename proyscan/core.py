@@ -1,36 +1,389 @@
 # proyscan/core.py
 import os
 import json
+import time
 import datetime
 import logging # Importar logging
-from typing import List, Set, Dict, Any, Optional
+from array import array
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from itertools import chain, islice
+from typing import List, Set, Dict, Any, Optional, Iterator, Iterable, Tuple, Deque
 
 # ... (otras importaciones sin cambios) ...
 from .config import (
-    ARCHIVO_IGNORAR, ARCHIVO_ESTRUCTURA, ARCHIVO_CONTENIDO,
+    ARCHIVO_IGNORAR, ARCHIVO_ESTRUCTURA, ARCHIVO_CONTENIDO, ARCHIVO_INFO, ARCHIVO_MANIFIESTO, ARCHIVO_TRAZA, ARCHIVO_GRAFO, ARCHIVO_GRAFO_COMPACTO,
     EXTENSIONES_BINARIAS, ANALIZAR_DEPENDENCIAS
 )
-from .ignore_handler import cargar_patrones_ignorar, debe_ignorar
-from .utils.file_utils import leer_lineas_texto
-from .utils.path_utils import obtener_lenguaje_extension, normalizar_ruta
+from .ignore_handler import cargar_patrones_ignorar
+from .directory_walker import EntradaArchivo, recorrer_proyecto, indexar_archivos
+from .utils.file_utils import ResumenArchivoGrande, leer_archivo_texto
+from .utils.path_utils import obtener_lenguaje_extension
+from .utils.binary_sniffer import detectar_extensiones_binarias
 from .tree_generator import generar_arbol_texto
 from .dependency_analysis.analyzer import analizar_dependencias
-from .models import FileObject, Metadata, OutputJson, ScanInfo, DependencyInfo
+from .dependency_analysis.context import ContextoAnalisis
+from .dependency_analysis.js_index import es_configuracion_js
+from .dependency_analysis.reference_cache import resumen_cache_referencias
+from .incremental import EscaneoPrevio, cargar_escaneo_previo, guardar_manifiesto, calcular_hash_archivo, calcular_hash_bytes
+from .content_stream import SpoolContenido, escribir_contenido_final
+from .dependency_graph import GrafoDependencias, guardar_grafo, guardar_grafo_compacto
+from .models import FileObject, Metadata, ScanInfo, DependencyInfo, Fingerprint
+from .tracing import Trazador, instalar_trazador, obtener_trazador, tramo
 
 # Obtener un logger para este módulo
 logger = logging.getLogger(__name__) # Usa 'proyscan.core'
 
+# --- Procesamiento por archivo (Fase 2) ---
+# Una tarea de la Fase 2: (ruta, tamaño conocido | None, hash previo a verificar | None, líneas previas a re-analizar | None)
+TareaArchivo = Tuple[str, Optional[int], Optional[str], Optional[List[str]]]
+# Resultado de una tarea: (tipo, carga, hash de contenido) donde tipo es
+#   'nuevo'        -> carga es el FileObject recién procesado
+#   'sin_cambios'  -> el contenido coincide con el escaneo previo, se reutiliza tal cual
+#   'dependencias' -> contenido reutilizado, carga son las dependencias re-analizadas
+ResultadoTarea = Tuple[str, Any, Optional[str]]
+# Entrada del plan de la Fase 2: (ruta, objeto previo reutilizable | None, tarea | None).
+# Sin tarea, el objeto previo se reutiliza tal cual.
+EntradaPlan = Tuple[str, Optional[FileObject], Optional[TareaArchivo]]
+
+def procesar_archivo(
+    ruta_relativa_norm: str,
+    directorio_objetivo: str,
+    contexto: ContextoAnalisis,
+    tamano_archivo: Optional[int] = None,
+    extensiones_binarias_detectadas: Optional[Set[str]] = None
+) -> Tuple[FileObject, Optional[str]]:
+    """
+    Lee, decodifica y analiza las dependencias de un único archivo.
+    `contexto` lleva el conjunto de archivos del proyecto y los índices que usan los parsers.
+    `tamano_archivo` viene del recorrido de la Fase 1; solo si falta se consulta al disco.
+    `extensiones_binarias_detectadas` son las extensiones que este escaneo ya vio binarias por contenido.
+    Devuelve el FileObject y el hash de su contenido (None si no se leyó como texto).
+    No toca estado compartido, por lo que puede ejecutarse en un proceso trabajador.
+    """
+    ruta_completa = os.path.join(directorio_objetivo, ruta_relativa_norm.replace('/', os.sep))
+    logger.info(f"  - Procesando: {ruta_relativa_norm}")
+
+    metadata: Metadata = { "path": ruta_relativa_norm, "size_bytes": None, "status": "unknown", "encoding": None, "language": None, "line_count": None, "dependencies": None, "referenced_by": None }
+    file_object: FileObject = { "metadata": metadata, "content_lines": None, "error_message": None }
+    hash_contenido: Optional[str] = None
+
+    try:
+        if tamano_archivo is None:
+            tamano_archivo = os.path.getsize(ruta_completa)
+        metadata["size_bytes"] = tamano_archivo
+        lenguaje = obtener_lenguaje_extension(ruta_relativa_norm)
+        metadata["language"] = lenguaje
+        extension = os.path.splitext(ruta_relativa_norm)[1]
+
+        if extension.lower() in EXTENSIONES_BINARIAS:
+            metadata["status"] = "binary"
+            file_object["error_message"] = f"Contenido omitido (extensión binaria: {extension})"
+            logger.debug(f"      * Binario por extensión ({extension})")
+        elif extensiones_binarias_detectadas and extension.lower() in extensiones_binarias_detectadas:
+            metadata["status"] = "binary"
+            file_object["error_message"] = f"Contenido omitido (extensión detectada como binaria: {extension})"
+            logger.debug(f"      * Binario por extensión detectada ({extension})")
+        else:
+            with tramo("read_decode", "read", path=ruta_relativa_norm):
+                (estado, codificacion, lineas_o_error), datos = leer_archivo_texto(ruta_completa, tamano_archivo)
+            metadata["status"] = estado
+            metadata["encoding"] = codificacion
+
+            if estado == "ok":
+                lineas_contenido = lineas_o_error
+                file_object["content_lines"] = lineas_contenido
+                metadata["line_count"] = len(lineas_contenido)
+                hash_contenido = calcular_hash_bytes(datos if datos is not None else b'')
+
+                if ANALIZAR_DEPENDENCIAS and lineas_contenido is not None:
+                     metadata["dependencies"] = analizar_dependencias(
+                         lineas_contenido, lenguaje, ruta_relativa_norm,
+                         contexto, directorio_objetivo
+                     )
+
+            elif estado == "binary":
+                 logger.debug(f"      * Binario por contenido ({lineas_o_error})")
+                 file_object["error_message"] = f"Contenido omitido (binario por contenido: {lineas_o_error})"
+
+            elif estado == "too_large" and isinstance(lineas_o_error, ResumenArchivoGrande):
+                 # Archivo grande resumido con mmap: recuento de líneas, dependencias de la cabecera y extracto opcional
+                 resumen = lineas_o_error
+                 logger.warning(f"      * Estado: {estado} en {ruta_relativa_norm} - {resumen.mensaje}")
+                 file_object["error_message"] = resumen.mensaje
+                 file_object["content_lines"] = resumen.extracto
+                 metadata["line_count"] = resumen.total_lineas
+                 if ANALIZAR_DEPENDENCIAS and resumen.lineas_cabecera is not None:
+                     metadata["dependencies"] = analizar_dependencias(
+                         resumen.lineas_cabecera, lenguaje, ruta_relativa_norm,
+                         contexto, directorio_objetivo
+                     )
+
+            elif estado in ["read_error", "too_large"]:
+                 logger.warning(f"      * Estado: {estado} en {ruta_relativa_norm} - {lineas_o_error}")
+                 file_object["error_message"] = lineas_o_error
+
+    except OSError as e:
+         logger.error(f"      * Error de acceso/lectura en {ruta_relativa_norm}: {e}")
+         metadata["status"] = "access_error"; file_object["error_message"] = str(e)
+    except Exception as e:
+         logger.exception(f"      * Error inesperado procesando {ruta_relativa_norm}")
+         metadata["status"] = "processing_error"; file_object["error_message"] = str(e)
+
+    return file_object, hash_contenido
+
+def procesar_tarea(
+    tarea: TareaArchivo,
+    directorio_objetivo: str,
+    contexto: ContextoAnalisis,
+    extensiones_binarias_detectadas: Optional[Set[str]] = None
+) -> ResultadoTarea:
+    """Ejecuta una tarea de la Fase 2 dentro de un tramo 'file' de la traza."""
+    with tramo("file", "file", path=tarea[0]):
+        return _procesar_tarea(tarea, directorio_objetivo, contexto, extensiones_binarias_detectadas)
+
+def _procesar_tarea(
+    tarea: TareaArchivo,
+    directorio_objetivo: str,
+    contexto: ContextoAnalisis,
+    extensiones_binarias_detectadas: Optional[Set[str]]
+) -> ResultadoTarea:
+    """
+    Ejecuta una tarea de la Fase 2. Si la tarea trae el hash del escaneo previo y el contenido
+    no ha cambiado, evita decodificar el archivo (y, si no hay líneas previas, también analizarlo).
+    """
+    ruta_relativa_norm, tamano_archivo, hash_previo, lineas_previas = tarea
+    ruta_completa = os.path.join(directorio_objetivo, ruta_relativa_norm.replace('/', os.sep))
+    if hash_previo is not None or lineas_previas is not None:
+        try:
+            hash_actual = calcular_hash_archivo(ruta_completa) if hash_previo is not None else None
+            if hash_previo is None or hash_actual == hash_previo:
+                if lineas_previas is None:
+                    logger.debug(f"  - Sin cambios (hash): {ruta_relativa_norm}")
+                    return "sin_cambios", None, hash_actual
+                logger.info(f"  - Re-analizando dependencias (contenido sin cambios): {ruta_relativa_norm}")
+                dependencias = None
+                if ANALIZAR_DEPENDENCIAS:
+                    dependencias = analizar_dependencias(
+                        lineas_previas, obtener_lenguaje_extension(ruta_relativa_norm), ruta_relativa_norm,
+                        contexto, directorio_objetivo
+                    )
+                return "dependencias", dependencias, hash_actual
+        except Exception as e:
+            logger.debug(f"No se pudo reutilizar el resultado previo de {ruta_relativa_norm} ({e}). Se procesa de nuevo.")
+
+    file_object, hash_contenido = procesar_archivo(
+        ruta_relativa_norm, directorio_objetivo, contexto, tamano_archivo, extensiones_binarias_detectadas
+    )
+    return "nuevo", file_object, hash_contenido
+
+# Estado de cada proceso trabajador (se fija una vez en el inicializador del pool,
+# así el contexto con el set de archivos del proyecto no viaja con cada tarea).
+_estado_trabajador: Dict[str, Any] = {}
+
+def _inicializar_trabajador(
+    directorio_objetivo: str,
+    contexto: ContextoAnalisis,
+    extensiones_binarias_detectadas: Set[str],
+    log_level: int,
+    registrar_eventos: bool,
+    origen_traza_ns: int
+):
+    """Inicializador de cada proceso del pool."""
+    if not logging.root.handlers: # Con 'spawn' el proceso hijo no hereda la configuración de logging
+        logging.basicConfig(level=log_level, format='%(asctime)s - %(name)-25s - %(levelname)-8s - %(message)s')
+    # Trazador propio: sus datos vuelven al proceso principal con cada lote
+    instalar_trazador(Trazador(registrar_eventos, origen_traza_ns))
+    _estado_trabajador["directorio_objetivo"] = directorio_objetivo
+    _estado_trabajador["contexto"] = contexto
+    _estado_trabajador["extensiones_binarias_detectadas"] = extensiones_binarias_detectadas
+
+def _procesar_tarea_en_trabajador(tarea: TareaArchivo) -> ResultadoTarea:
+    return procesar_tarea(
+        tarea,
+        _estado_trabajador["directorio_objetivo"],
+        _estado_trabajador["contexto"],
+        _estado_trabajador["extensiones_binarias_detectadas"]
+    )
+
+def _procesar_lote_en_trabajador(tareas: List[TareaArchivo]) -> Tuple[List[ResultadoTarea], Dict[str, Any]]:
+    resultados = [_procesar_tarea_en_trabajador(tarea) for tarea in tareas]
+    _estado_trabajador["contexto"].volcar_estadisticas()
+    return resultados, obtener_trazador().extraer()
+
+def obtener_num_procesos(jobs: Optional[int]) -> int:
+    """Número de procesos para la Fase 2 (None o <= 0 = número de CPUs)."""
+    if jobs is None or jobs <= 0:
+        return os.cpu_count() or 1
+    return jobs
+
+# Lenguajes cuyas dependencias dependen de la configuración JS/TS del proyecto
+LENGUAJES_RESOLUCION_JS = {'javascript', 'typescript', 'jsx', 'tsx', 'vue'}
+
+def _huella_cambiada(huella_previa: Optional[Fingerprint], entrada: EntradaArchivo) -> bool:
+    """True si el archivo no tiene huella previa o cambió su tamaño o mtime."""
+    return huella_previa is None or (huella_previa.get("size"), huella_previa.get("mtime_ns")) != (entrada.tamano, entrada.mtime_ns)
+
+def planificar_tareas(
+    rutas_ordenadas: List[str],
+    entradas_archivos: Dict[str, EntradaArchivo],
+    previo: Optional[EscaneoPrevio],
+    archivos_del_proyecto: Set[str],
+    huellas: Dict[str, Fingerprint]
+) -> Iterator[EntradaPlan]:
+    """
+    Decide, en orden, qué archivos hay que (re)procesar comparando con el escaneo previo.
+    Tamaño y mtime salen del modelo de la Fase 1 (sin stat adicional).
+    Una entrada sin tarea reutiliza el objeto previo tal cual; una con tarea y objeto previo
+    se verifica por hash o solo re-analiza dependencias. Rellena `huellas` a medida que avanza.
+    """
+    # Si cambió el conjunto de archivos, las dependencias reutilizadas podrían resolverse distinto
+    conjunto_cambiado = previo is not None and previo.archivos != archivos_del_proyecto
+    if conjunto_cambiado:
+        logger.info("El conjunto de archivos cambió desde el escaneo previo: se re-analizarán las dependencias de los archivos reutilizados.")
+    # Los imports Java se resuelven con la declaración `package` de los demás .java: si alguno
+    # cambió, también hay que re-analizar los .java reutilizados
+    java_cambiado = previo is not None and not conjunto_cambiado and any(
+        _huella_cambiada(previo.huellas.get(ruta), entradas_archivos[ruta])
+        for ruta in rutas_ordenadas if ruta.endswith('.java')
+    )
+    if java_cambiado:
+        logger.info("Cambió algún archivo Java desde el escaneo previo: se re-analizarán las dependencias de los .java reutilizados.")
+    # Igual con los tsconfig/jsconfig/package.json: definen alias y entradas de los imports JS/TS
+    configuracion_js_cambiada = previo is not None and not conjunto_cambiado and any(
+        _huella_cambiada(previo.huellas.get(ruta), entradas_archivos[ruta])
+        for ruta in rutas_ordenadas if es_configuracion_js(ruta)
+    )
+    if configuracion_js_cambiada:
+        logger.info("Cambió algún tsconfig/jsconfig/package.json desde el escaneo previo: se re-analizarán las dependencias de los JS/TS/Vue reutilizados.")
+
+    for ruta in rutas_ordenadas:
+        entrada = entradas_archivos[ruta]
+        if entrada.tamano is None:
+            yield ruta, None, (ruta, None, None, None) # procesar_archivo registrará el error de acceso
+            continue
+        huellas[ruta] = {"size": entrada.tamano, "mtime_ns": entrada.mtime_ns, "hash": None}
+
+        huella_previa = previo.huellas.get(ruta) if previo else None
+        objeto_previo = previo.obtener(ruta) if previo and huella_previa and huella_previa.get("size") == entrada.tamano else None
+        if objeto_previo is None:
+            yield ruta, None, (ruta, entrada.tamano, None, None)
+            continue
+
+        huellas[ruta]["hash"] = huella_previa.get("hash")
+        reanalizar = (
+            conjunto_cambiado
+            or (java_cambiado and ruta.endswith('.java'))
+            or (configuracion_js_cambiada and obtener_lenguaje_extension(ruta) in LENGUAJES_RESOLUCION_JS)
+        )
+        if reanalizar and objeto_previo["metadata"]["status"] == "too_large" and objeto_previo["metadata"]["dependencies"]:
+            # Sus dependencias salen de la cabecera, que no se guarda: hay que volver a resumirlo
+            yield ruta, None, (ruta, entrada.tamano, None, None)
+            continue
+        lineas_a_reanalizar = objeto_previo["content_lines"] if reanalizar and objeto_previo["metadata"]["status"] == "ok" else None
+        if huella_previa.get("mtime_ns") == entrada.mtime_ns:
+            yield ruta, objeto_previo, ((ruta, entrada.tamano, None, lineas_a_reanalizar) if lineas_a_reanalizar is not None else None)
+        elif huella_previa.get("hash"):
+            # Mismo tamaño pero otro mtime (p.ej. un clon nuevo): verificar por hash de contenido
+            yield ruta, objeto_previo, (ruta, entrada.tamano, huella_previa["hash"], lineas_a_reanalizar)
+        else:
+            yield ruta, None, (ruta, entrada.tamano, None, None)
+
+def procesar_archivos(
+    entradas: Iterable[EntradaPlan],
+    total_entradas: int,
+    directorio_objetivo: str,
+    contexto: ContextoAnalisis,
+    jobs: Optional[int],
+    log_level: int = logging.INFO,
+    extensiones_binarias_detectadas: Optional[Set[str]] = None
+) -> Iterator[Tuple[EntradaPlan, Optional[ResultadoTarea]]]:
+    """
+    Ejecuta las tareas del plan y devuelve (entrada, resultado) EN EL MISMO ORDEN que `entradas`,
+    sin importar en qué orden terminen los trabajadores (la salida es idéntica a la ejecución en serie).
+    Las entradas sin tarea se devuelven con resultado None. Solo hay un número acotado de lotes
+    en vuelo, así que la memoria no depende del tamaño del proyecto.
+    """
+    iterador_entradas = iter(entradas)
+    num_procesos = min(obtener_num_procesos(jobs), total_entradas)
+    if num_procesos <= 1:
+        logger.debug("Fase 2 en serie (1 proceso).")
+        for entrada in iterador_entradas:
+            yield entrada, (procesar_tarea(entrada[2], directorio_objetivo, contexto, extensiones_binarias_detectadas) if entrada[2] else None)
+        return
+
+    # Lotes medianos: suficientes para repartir la carga sin pagar IPC por cada archivo
+    tamano_lote = max(1, min(64, total_entradas // (num_procesos * 4)))
+    max_lotes_en_vuelo = num_procesos * 4
+    logger.info(f"Fase 2 en paralelo: {num_procesos} procesos (lotes de {tamano_lote}).")
+    contexto.preparar_para_trabajadores() # El índice Java se lee una vez aquí, no en cada trabajador
+    pendientes: Deque[Tuple[List[EntradaPlan], Optional[Future]]] = deque()
+    trazador = obtener_trazador()
+    lote_sin_enviar: Optional[List[EntradaPlan]] = None
+
+    def entregar_lote(lote: List[EntradaPlan], futuro: Optional[Future]) -> Iterator[Tuple[EntradaPlan, Optional[ResultadoTarea]]]:
+        resultados_lote, datos_traza = futuro.result() if futuro else ([], None)
+        if datos_traza:
+            trazador.fusionar(datos_traza)
+        resultados = iter(resultados_lote)
+        for entrada in lote:
+            yield entrada, (next(resultados) if entrada[2] else None)
+
+    try:
+        with ProcessPoolExecutor(
+            max_workers=num_procesos,
+            initializer=_inicializar_trabajador,
+            initargs=(
+                directorio_objetivo, contexto, extensiones_binarias_detectadas or set(), log_level,
+                trazador.registrar_eventos, trazador.origen_ns
+            )
+        ) as pool:
+            while True:
+                lote_sin_enviar = list(islice(iterador_entradas, tamano_lote))
+                if not lote_sin_enviar:
+                    lote_sin_enviar = None
+                    break
+                tareas_lote = [entrada[2] for entrada in lote_sin_enviar if entrada[2]]
+                futuro = pool.submit(_procesar_lote_en_trabajador, tareas_lote) if tareas_lote else None
+                pendientes.append((lote_sin_enviar, futuro))
+                lote_sin_enviar = None
+                # Entregar en orden el lote más antiguo cuando la ventana está llena
+                while len(pendientes) >= max_lotes_en_vuelo:
+                    yield from entregar_lote(*pendientes[0])
+                    pendientes.popleft()
+            while pendientes:
+                yield from entregar_lote(*pendientes[0])
+                pendientes.popleft()
+    except (OSError, NotImplementedError, BrokenProcessPool) as e:
+        # Sin soporte de multiprocessing (o un trabajador murió): continuar en serie donde se quedó
+        logger.warning(f"No se pudo usar el pool de procesos ({e}). Continuando en serie.")
+        restantes = [entrada for lote, _ in pendientes for entrada in lote] + (lote_sin_enviar or [])
+        for entrada in chain(restantes, iterador_entradas):
+            yield entrada, (procesar_tarea(entrada[2], directorio_objetivo, contexto, extensiones_binarias_detectadas) if entrada[2] else None)
+
 # --- Actualizar firma y añadir configuración de logging ---
 def ejecutar_escaneo(
     directorio_objetivo: str,
     nombre_script_ignorar: Optional[str],
     directorio_salida_escaneo: str,
     debug_mode: bool,
-    ruta_ignore_especifica: Optional[str] = None
+    ruta_ignore_especifica: Optional[str] = None,
+    jobs: Optional[int] = None,
+    directorio_previo: Optional[str] = None,
+    usar_gitignore: bool = False,
+    exportar_traza: bool = False
 ):
     """
     Función principal que ejecuta todo el proceso de escaneo y generación.
+
+    `jobs` indica cuántos procesos usar en la Fase 2 (None = número de CPUs, 1 = serie).
+    `directorio_previo` es la carpeta de un escaneo anterior cuyos resultados se reutilizan
+    para los archivos sin cambios (re-escaneo incremental).
+    Los tiempos por fase, parser y archivo siempre se resumen en scan_info.json; con
+    `exportar_traza` se escribe además scan_trace.json (Chrome Trace / Perfetto).
     """
+    trazador = instalar_trazador(Trazador(registrar_eventos=exportar_traza))
     # --- Configurar Logging Global basado en modo debug ---
     log_level = logging.DEBUG if debug_mode else logging.INFO
     log_format = '%(asctime)s - %(name)-25s - %(levelname)-8s - %(message)s'
@@ -63,137 +416,88 @@ def ejecutar_escaneo(
          # Mensaje de advertencia de ignore_handler ya se mostró
          pass
     
-    lista_final_archivos: List[FileObject] = []
-    items_ignorados_arbol: Set[str] = set()
-    archivos_del_proyecto: Set[str] = set()
+    if usar_gitignore:
+        logger.info("Aplicando también los .gitignore del proyecto (semántica de git, por directorio).")
+
     dependencias_inversas: Dict[str, Set[str]] = {}
 
-    # --- Fase 1 (usar logger) ---
+    # --- Fase 1: un único recorrido (os.scandir) que construye el modelo del árbol ---
     logger.info("Fase 1: Identificando archivos del proyecto...")
-    # ... (lógica de os.walk sin cambios) ...
-    for raiz, directorios, archivos in os.walk(directorio_objetivo, topdown=True):
-        raiz_relativa = os.path.relpath(raiz, directorio_objetivo)
-        if raiz == directorio_objetivo: raiz_relativa = '.'
-        logger.debug(f"Escaneando directorio: {raiz_relativa}") # DEBUG
-        # Filtrar directorios
-        for i in range(len(directorios) - 1, -1, -1):
-            nombre_dir = directorios[i]
-            ruta_rel_dir = os.path.relpath(os.path.join(raiz, nombre_dir), directorio_objetivo)
-            ignorar_dir, razon_dir = debe_ignorar(ruta_rel_dir, True, patrones_ignorar, nombre_script_ignorar)
-            if ignorar_dir:
-                ruta_norm_dir = normalizar_ruta(ruta_rel_dir) + '/'
-                logger.debug(f"Ignorando Directorio: {ruta_norm_dir} (Razón: {razon_dir})") # DEBUG
-                items_ignorados_arbol.add(ruta_norm_dir)
-                del directorios[i]
-        # Registrar archivos
-        for nombre_archivo in archivos:
-            ruta_completa = os.path.join(raiz, nombre_archivo)
-            try:
-                 # --- Calcular ruta relativa ---
-                 ruta_rel_archivo = os.path.relpath(ruta_completa, directorio_objetivo)
-                 logger.debug(f"  Archivo encontrado: '{ruta_rel_archivo}'") # NUEVO DEBUG
-
-                 # --- Llamar a debe_ignorar ---
-                 ignorar_archivo, razon_archivo = debe_ignorar(ruta_rel_archivo, False, patrones_ignorar, nombre_script_ignorar)
-                 ruta_norm = normalizar_ruta(ruta_rel_archivo)
-
-                 if not ignorar_archivo:
-                     if ruta_norm != '.':
-                          archivos_del_proyecto.add(ruta_norm)
-                          # --- Log de qué se añade ---
-                          logger.debug(f"    -> Añadido a archivos_del_proyecto: '{ruta_norm}'") # NUEVO DEBUG
-                 else:
-                     if ruta_norm != '.':
-                          # Log existente
-                          logger.debug(f"    -> Ignorando Archivo (no se añade a procesar): {ruta_norm} (Razón: {razon_archivo})")
-                          items_ignorados_arbol.add(ruta_norm)
-            except Exception as e_relpath:
-                 # Error calculando ruta relativa (raro pero posible)
-                 logger.error(f"Error calculando ruta relativa para {ruta_completa}: {e_relpath}")
-
-    logger.info(f"Fase 1: {len(archivos_del_proyecto)} archivos identificados para procesamiento.")
+    with tramo("phase1_walk"):
+        modelo_arbol, total_ignorados = recorrer_proyecto(directorio_objetivo, patrones_ignorar, nombre_script_ignorar, usar_gitignore)
+        entradas_archivos = indexar_archivos(modelo_arbol)
+    archivos_del_proyecto: Set[str] = set(entradas_archivos)
+
+    logger.info(f"Fase 1: {len(archivos_del_proyecto)} archivos identificados para procesamiento ({total_ignorados} entradas ignoradas).")
     logger.debug(f"Archivos a procesar (set): {archivos_del_proyecto}") # NUEVO DEBUG
-    logger.debug(f"Items a ignorar en árbol (set): {items_ignorados_arbol}") # NUEVO DEBUG
 
     # --- Fase 2: Procesar archivos y CONSTRUIR ÍNDICE INVERSO ---
+    # El trabajo por archivo (lectura + dependencias) puede repartirse en un pool de procesos;
+    # el proceso principal solo fusiona resultados (en orden) y construye el índice inverso.
     logger.info("Fase 2: Procesando archivos, extrayendo info y dependencias...")
-    for ruta_relativa_norm in sorted(list(archivos_del_proyecto)):
-        ruta_completa = os.path.join(directorio_objetivo, ruta_relativa_norm.replace('/', os.sep))
-        logger.info(f"  - Procesando: {ruta_relativa_norm}")
+    # Cada FileObject va al spool en cuanto está listo; en memoria solo queda el índice inverso.
+    rutas_ordenadas = sorted(archivos_del_proyecto)
+    previo = cargar_escaneo_previo(directorio_previo, directorio_objetivo) if directorio_previo else None
+    huellas: Dict[str, Fingerprint] = {}
+    with tramo("binary_extension_sniff"):
+        extensiones_binarias_detectadas = detectar_extensiones_binarias(rutas_ordenadas, directorio_objetivo)
+    plan = planificar_tareas(rutas_ordenadas, entradas_archivos, previo, archivos_del_proyecto, huellas)
+    spool = SpoolContenido(os.path.join(directorio_salida_escaneo, ARCHIVO_CONTENIDO + ".parcial"))
+    total_reutilizados = 0
+    tiempo_indice_ns = tiempo_spool_ns = 0
 
-        metadata: Metadata = { "path": ruta_relativa_norm, "size_bytes": None, "status": "unknown", "encoding": None, "language": None, "line_count": None, "dependencies": None, "referenced_by": None }
-        file_object: FileObject = { "metadata": metadata, "content_lines": None, "error_message": None }
-        lista_dependencias_actual: Optional[List[DependencyInfo]] = None # Definir ANTES del try
+    contexto = ContextoAnalisis(archivos_del_proyecto, directorio_objetivo)
 
-        try:
-            tamano_archivo = os.path.getsize(ruta_completa)
-            metadata["size_bytes"] = tamano_archivo
-            lenguaje = obtener_lenguaje_extension(ruta_relativa_norm)
-            metadata["language"] = lenguaje
-            extension = os.path.splitext(ruta_relativa_norm)[1]
-
-            if extension.lower() in EXTENSIONES_BINARIAS:
-                metadata["status"] = "binary"
-                file_object["error_message"] = f"Contenido omitido (extensión binaria: {extension})"
-                logger.debug(f"      * Binario por extensión ({extension})")
+    with tramo("phase2_process"), spool:
+        for (ruta_relativa_norm, objeto_previo, _), resultado in procesar_archivos(
+            plan, len(rutas_ordenadas), directorio_objetivo, contexto, jobs, log_level,
+            extensiones_binarias_detectadas
+        ):
+            if resultado is None or resultado[0] != "nuevo":
+                file_object = objeto_previo
+                total_reutilizados += 1
+                if resultado is not None and resultado[0] == "dependencias":
+                    file_object["metadata"]["dependencies"] = resultado[1]
             else:
-                estado, codificacion, lineas_o_error = leer_lineas_texto(ruta_completa, tamano_archivo)
-                metadata["status"] = estado
-                metadata["encoding"] = codificacion
-
-                if estado == "ok":
-                    lineas_contenido = lineas_o_error
-                    file_object["content_lines"] = lineas_contenido
-                    metadata["line_count"] = len(lineas_contenido)
-
-                    if ANALIZAR_DEPENDENCIAS and lineas_contenido is not None:
-                         lista_dependencias = analizar_dependencias(
-                             lineas_contenido, lenguaje, ruta_relativa_norm,
-                             archivos_del_proyecto, directorio_objetivo
-                         )
-                         metadata["dependencies"] = lista_dependencias
-                         lista_dependencias_actual = lista_dependencias # Guardar para índice inverso
-
-                         # --- POBLAR ÍNDICE INVERSO (MOVIDO AQUÍ DENTRO) ---
-                         if lista_dependencias_actual:
-                             for dependencia in lista_dependencias_actual:
-                                 if dependencia.get("type") == "internal":
-                                     ruta_dependencia = dependencia.get("path")
-                                     if ruta_dependencia:
-                                         dependencias_inversas.setdefault(ruta_dependencia, set()).add(ruta_relativa_norm)
-                                         logger.debug(f"Índice Inverso: '{ruta_relativa_norm}' depende de '{ruta_dependencia}'")
-                         # -----------------------------------------------
-
-                elif estado in ["read_error", "too_large"]:
-                     logger.warning(f"      * Estado: {estado} en {ruta_relativa_norm} - {lineas_o_error}")
-                     file_object["error_message"] = lineas_o_error
-
-        except OSError as e:
-             logger.error(f"      * Error de acceso/lectura en {ruta_relativa_norm}: {e}")
-             metadata["status"] = "access_error"; file_object["error_message"] = str(e)
-        except Exception as e:
-             logger.exception(f"      * Error inesperado procesando {ruta_relativa_norm}")
-             metadata["status"] = "processing_error"; file_object["error_message"] = str(e)
-
-        lista_final_archivos.append(file_object)
-        # El bloque para poblar dependencias_inversas ya no está aquí fuera.        
-
-    # --- Fase 2.5: Añadir Dependencias Inversas al Metadata ---
-    logger.info("Fase 2.5: Calculando referencias inversas...")
-    for file_object in lista_final_archivos:
-        ruta_archivo_actual = file_object["metadata"]["path"]
-        if ruta_archivo_actual in dependencias_inversas:
-            # Obtener el set de archivos que dependen de este, convertir a lista y ordenar
-            lista_referentes = sorted(list(dependencias_inversas[ruta_archivo_actual]))
-            file_object["metadata"]["referenced_by"] = lista_referentes
-            logger.debug(f"Archivo '{ruta_archivo_actual}' es referenciado por: {lista_referentes}") # DEBUG
-    # --------------------------------------------------------
+                file_object = resultado[1]
+            if resultado is not None and ruta_relativa_norm in huellas and (resultado[0] == "nuevo" or resultado[2] is not None):
+                huellas[ruta_relativa_norm]["hash"] = resultado[2]
+
+            # --- POBLAR ÍNDICE INVERSO ---
+            inicio_ns = time.perf_counter_ns()
+            lista_dependencias_actual = file_object["metadata"]["dependencies"]
+            if lista_dependencias_actual:
+                for dependencia in lista_dependencias_actual:
+                    if dependencia.get("type") == "internal":
+                        ruta_dependencia = dependencia.get("path")
+                        if ruta_dependencia:
+                            dependencias_inversas.setdefault(ruta_dependencia, set()).add(ruta_relativa_norm)
+                            logger.debug(f"Índice Inverso: '{ruta_relativa_norm}' depende de '{ruta_dependencia}'")
+            # -----------------------------------------------
+            medio_ns = time.perf_counter_ns()
+            spool.escribir(file_object)
+            tiempo_indice_ns += medio_ns - inicio_ns
+            tiempo_spool_ns += time.perf_counter_ns() - medio_ns
+
+    contexto.volcar_estadisticas() # Fase 2 en serie (o el resto tras un fallo del pool)
+    trazador.acumular("reverse_index", "phase", tiempo_indice_ns, veces=len(rutas_ordenadas))
+    trazador.acumular("spool_write", "phase", tiempo_spool_ns, veces=len(rutas_ordenadas))
+
+    cache_referencias = resumen_cache_referencias(trazador.contadores)
+    if cache_referencias["hit_rate"] is not None:
+        logger.info(f"Caché de referencias: {cache_referencias['hits']} aciertos, {cache_referencias['misses']} fallos ({cache_referencias['hit_rate']:.1%}).")
+
+    if previo:
+        logger.info(f"Escaneo incremental: {total_reutilizados} archivos reutilizados, {len(rutas_ordenadas) - total_reutilizados} procesados de nuevo.")
 
     # --- Fase 3 (usar logger) ---
     logger.info("Fase 3: Generando archivos de salida...")
     ruta_salida_estructura = os.path.join(directorio_salida_escaneo, ARCHIVO_ESTRUCTURA)
     ruta_salida_contenido = os.path.join(directorio_salida_escaneo, ARCHIVO_CONTENIDO)
-    ruta_salida_info = os.path.join(directorio_salida_escaneo, "scan_info.json") 
+    ruta_salida_info = os.path.join(directorio_salida_escaneo, ARCHIVO_INFO)
+    ruta_salida_manifiesto = os.path.join(directorio_salida_escaneo, ARCHIVO_MANIFIESTO)
+    ruta_salida_grafo = os.path.join(directorio_salida_escaneo, ARCHIVO_GRAFO)
+    posiciones_contenido: Optional[Tuple[array, array]] = None
 
     timestamp_actual = datetime.datetime.now(datetime.timezone.utc).isoformat()
     nombre_base_proyecto = os.path.basename(directorio_objetivo)
@@ -202,23 +506,49 @@ def ejecutar_escaneo(
     # 1. Archivo de Estructura
     try:
         logger.info(f"Generando {ARCHIVO_ESTRUCTURA}...")
-        salida_arbol = generar_arbol_texto(directorio_objetivo, items_ignorados_arbol)
-        with open(ruta_salida_estructura, 'w', encoding='utf-8') as f: f.write(salida_arbol)
+        with tramo("tree_generation"):
+            salida_arbol = generar_arbol_texto(modelo_arbol)
+            with open(ruta_salida_estructura, 'w', encoding='utf-8') as f: f.write(salida_arbol)
         logger.info(f"Estructura guardada en: {ruta_salida_estructura}")
     except Exception as e:
         logger.exception(f"Error al generar {ARCHIVO_ESTRUCTURA}") # logger.exception incluye traceback
 
-    # 2. Archivo JSON
-    datos_json_final: OutputJson = {"files": lista_final_archivos}
+    # 2. Archivo JSON (segunda pasada sobre el spool: aquí se añaden las referencias inversas)
     try:
-        logger.info(f"Generando {ARCHIVO_CONTENIDO}...")
-        with open(ruta_salida_contenido, 'w', encoding='utf-8') as f:
-            json.dump(datos_json_final, f, ensure_ascii=False, indent=4, default=str)
-        logger.info(f"Archivo JSON guardado en: {ruta_salida_contenido}")
+        logger.info(f"Generando {ARCHIVO_CONTENIDO} (añadiendo referencias inversas)...")
+        with tramo("json_write"):
+            escritor_contenido = escribir_contenido_final(spool, ruta_salida_contenido, dependencias_inversas)
+        logger.info(f"Archivo JSON guardado en: {ruta_salida_contenido} ({escritor_contenido.total} archivos)")
+        # Mismo orden que los IDs del grafo: el sidecar guarda dónde está cada objeto (para `pack`)
+        if escritor_contenido.total == len(rutas_ordenadas):
+            posiciones_contenido = (escritor_contenido.inicios, escritor_contenido.fines)
     except Exception as e:
         logger.exception(f"Error al escribir {ARCHIVO_CONTENIDO}")
+    finally:
+        spool.eliminar()
 
-    # --- 3. Crear archivo scan_info.json ---
+    # --- 3. Manifiesto de huellas (base para el próximo re-escaneo con --since) ---
+    try:
+        with tramo("manifest_write"):
+            guardar_manifiesto(ruta_salida_manifiesto, directorio_objetivo, huellas)
+        logger.info(f"Manifiesto de huellas guardado en: {ruta_salida_manifiesto}")
+    except Exception as e:
+        logger.error(f"No se pudo guardar {ARCHIVO_MANIFIESTO}: {e}", exc_info=True)
+
+    # --- 4. Grafo de dependencias internas (ciclos, capas, fan-in/fan-out, cierres transitivos) ---
+    estadisticas_grafo: Optional[Dict[str, int]] = None
+    try:
+        with tramo("graph_analysis"):
+            grafo = GrafoDependencias.desde_referencias_inversas(rutas_ordenadas, dependencias_inversas)
+            grafo.posiciones_contenido = posiciones_contenido
+            guardar_grafo(ruta_salida_grafo, grafo)
+            guardar_grafo_compacto(os.path.join(directorio_salida_escaneo, ARCHIVO_GRAFO_COMPACTO), grafo)
+        estadisticas_grafo = {"nodes": len(grafo), "edges": grafo.num_aristas, "cycles": len(grafo.ciclos())}
+        logger.info(f"Grafo de dependencias ({grafo.num_aristas} aristas, {estadisticas_grafo['cycles']} ciclos) guardado en: {ruta_salida_grafo}")
+    except Exception as e:
+        logger.error(f"No se pudo guardar {ARCHIVO_GRAFO}: {e}", exc_info=True)
+
+    # --- 5. Crear archivo scan_info.json (incluye el resumen de tiempos) ---
     info_escaneo: ScanInfo = {
         "project_name": nombre_base_proyecto,
         "original_project_path": directorio_objetivo,
@@ -227,8 +557,14 @@ def ejecutar_escaneo(
         "output_directory": directorio_salida_escaneo,
         "parameters_used": {
             "debug_mode": debug_mode,
-            "specific_ignore_file": ruta_ignore_especifica if ruta_ignore_especifica else None
-        }
+            "jobs": obtener_num_procesos(jobs),
+            "since": directorio_previo,
+            "gitignore": usar_gitignore,
+            "specific_ignore_file": ruta_ignore_especifica if ruta_ignore_especifica else None,
+            "trace": exportar_traza
+        },
+        "timing": trazador.resumen(),
+        "stats": {"reference_cache": cache_referencias, "dependency_graph": estadisticas_grafo}
     }
     try:
         logger.info(f"Generando scan_info.json...")
@@ -239,4 +575,13 @@ def ejecutar_escaneo(
         # No es crítico si esto falla, pero loggearlo
         logger.error(f"No se pudo guardar scan_info.json: {e}", exc_info=True)
 
+    # --- 6. Traza por archivo (opcional) ---
+    if exportar_traza:
+        ruta_salida_traza = os.path.join(directorio_salida_escaneo, ARCHIVO_TRAZA)
+        try:
+            trazador.escribir_traza(ruta_salida_traza)
+            logger.info(f"Traza ({len(trazador.eventos)} tramos) guardada en: {ruta_salida_traza}")
+        except Exception as e:
+            logger.error(f"No se pudo guardar {ARCHIVO_TRAZA}: {e}", exc_info=True)
+
     logger.info("¡Proceso completado!")
\ No newline at end of file
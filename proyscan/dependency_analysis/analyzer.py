@@ -5,43 +5,58 @@ from typing import List, Optional, Set, Dict
 # Importar todos los parsers
 from .python_parser import analizar_python
 from .regex_parser import analizar_regex
+from .js_parser import analizar_js
 from .html_parser import analizar_html
 from .css_parser import analizar_css
 from .java_parser import analizar_java
 from .vue_parser import analizar_vue
 
+from .context import ContextoAnalisis
 from ..models import DependencyInfo
+from ..tracing import tramo
 
 logger = logging.getLogger(__name__)
 
 
+# Parser que se usa para cada lenguaje (también da nombre a su tramo en la traza)
+PARSER_POR_LENGUAJE: Dict[str, str] = {
+    'python': 'python',
+    'html': 'html',
+    'css': 'css', 'scss': 'css', 'sass': 'css', 'less': 'css',
+    'java': 'java',
+    'vue': 'vue',
+    'javascript': 'js', 'typescript': 'js', 'jsx': 'js', 'tsx': 'js',
+    'php': 'regex',
+}
+
+
 def analizar_dependencias(
     contenido: List[str],
     lenguaje: str,
     ruta_archivo: str,
-    archivos_proyecto: Set[str],
+    contexto: ContextoAnalisis,
     dir_proyecto: str
 ) -> Optional[List[DependencyInfo]]:
     logger.debug(f"Analizador principal llamado para: {ruta_archivo} (Lenguaje: {lenguaje})")
 
-    if lenguaje == 'python':
-        return analizar_python(contenido, ruta_archivo, archivos_proyecto)
-    elif lenguaje == 'html':
-        return analizar_html(contenido, ruta_archivo, archivos_proyecto)
-    elif lenguaje in ['css', 'scss', 'sass', 'less']:
-        return analizar_css(contenido, ruta_archivo, archivos_proyecto)
-    elif lenguaje == 'java':
-        return analizar_java(contenido, ruta_archivo, archivos_proyecto)
-    # --- LLAMAR AL PARSER DE VUE ---
-    elif lenguaje == 'vue':
-        return analizar_vue(contenido, ruta_archivo, archivos_proyecto, dir_proyecto)
-    # ------------------------------
-    elif lenguaje in [ # Solo quedan JS/TS/PHP/JSX/TSX aquí
-        'javascript', 'typescript', 'jsx', 'tsx',
-        'php',
-        ]:
-        logger.debug(f"Usando parser Regex para lenguaje: {lenguaje}")
-        return analizar_regex(contenido, lenguaje, ruta_archivo, archivos_proyecto, dir_proyecto)
-    else:
+    parser = PARSER_POR_LENGUAJE.get(lenguaje)
+    if parser is None:
         logger.debug(f"Análisis de dependencias no implementado o no aplicable para lenguaje: {lenguaje}")
-        return None
\ No newline at end of file
+        return None
+
+    with tramo(f"parser:{parser}", "parser", path=ruta_archivo):
+        if parser == 'python':
+            return analizar_python(contenido, ruta_archivo, contexto.indice_python)
+        elif parser == 'html':
+            return analizar_html(contenido, ruta_archivo, contexto.referencias)
+        elif parser == 'css':
+            return analizar_css(contenido, lenguaje, ruta_archivo, contexto.indice_estilos, contexto.referencias)
+        elif parser == 'java':
+            return analizar_java(contenido, ruta_archivo, contexto.indice_java)
+        elif parser == 'vue':
+            return analizar_vue(contenido, ruta_archivo, contexto)
+        elif parser == 'js':
+            return analizar_js(contenido, lenguaje, ruta_archivo, contexto.indice_js, contexto.referencias)
+        else: # Solo queda PHP aquí
+            logger.debug(f"Usando parser Regex para lenguaje: {lenguaje}")
+            return analizar_regex(contenido, lenguaje, ruta_archivo, contexto.referencias, dir_proyecto)
@@ -0,0 +1,77 @@
+# proyscan/dependency_analysis/context.py
+# Contexto compartido por los parsers durante un escaneo: el conjunto de archivos del proyecto
+# y los índices derivados de él, que se construyen una sola vez por proceso y bajo demanda.
+from typing import Any, Dict, Optional, Set
+
+from .python_index import IndiceModulosPython
+from .java_index import IndiceJava
+from .js_index import IndiceModulosJs
+from .css_index import IndiceEstilos
+from .reference_cache import CacheReferencias
+
+class ContextoAnalisis:
+    """
+    Se crea una vez por escaneo en el proceso principal y viaja a cada trabajador del pool en
+    su inicializador. Cada proceso construye los índices que necesita la primera vez que un
+    parser los pide, salvo el índice Java: lee la cabecera de cada .java, así que se construye
+    una vez en el proceso principal (`preparar_para_trabajadores`) y viaja ya hecho.
+    """
+
+    def __init__(self, archivos_proyecto: Set[str], directorio_proyecto: str):
+        self.archivos = archivos_proyecto
+        self.directorio = directorio_proyecto
+        self._indice_python: Optional[IndiceModulosPython] = None
+        self._indice_java: Optional[IndiceJava] = None
+        self._indice_js: Optional[IndiceModulosJs] = None
+        self._indice_estilos: Optional[IndiceEstilos] = None
+        self._referencias: Optional[CacheReferencias] = None
+
+    @property
+    def indice_python(self) -> IndiceModulosPython:
+        if self._indice_python is None:
+            self._indice_python = IndiceModulosPython(self.archivos)
+        return self._indice_python
+
+    @property
+    def indice_java(self) -> IndiceJava:
+        # Lee la declaración `package` de cada .java del proyecto (solo el inicio del archivo)
+        if self._indice_java is None:
+            self._indice_java = IndiceJava(self.archivos, self.directorio)
+        return self._indice_java
+
+    @property
+    def indice_js(self) -> IndiceModulosJs:
+        # Lee los tsconfig.json/jsconfig.json y package.json del proyecto
+        if self._indice_js is None:
+            self._indice_js = IndiceModulosJs(self.archivos, self.directorio)
+        return self._indice_js
+
+    @property
+    def indice_estilos(self) -> IndiceEstilos:
+        if self._indice_estilos is None:
+            self._indice_estilos = IndiceEstilos(self.archivos)
+        return self._indice_estilos
+
+    @property
+    def referencias(self) -> CacheReferencias:
+        # Resolución de referencias de HTML, CSS, JS/TS, PHP y Vue (LRU por proceso)
+        if self._referencias is None:
+            self._referencias = CacheReferencias(self.archivos)
+        return self._referencias
+
+    def volcar_estadisticas(self):
+        """Pasa a los contadores de la traza los aciertos/fallos de caché de este proceso."""
+        if self._referencias is not None:
+            self._referencias.volcar_estadisticas()
+
+    def preparar_para_trabajadores(self):
+        """Construye antes de crear el pool los índices que se serializan con el contexto."""
+        if any(archivo.endswith('.java') for archivo in self.archivos):
+            self.indice_java
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {"archivos": self.archivos, "directorio": self.directorio, "indice_java": self._indice_java}
+
+    def __setstate__(self, estado: Dict[str, Any]):
+        self.__init__(estado["archivos"], estado["directorio"])
+        self._indice_java = estado.get("indice_java")
@@ -0,0 +1,105 @@
+# proyscan/dependency_analysis/css_index.py
+# Índice de hojas de estilo del proyecto para resolver imports de Sass (@use/@forward/@import con
+# parciales '_x.scss', índices '_index.scss' y load paths) y de LESS (extensión .less implícita).
+# Se construye en una pasada sobre la lista de archivos del escaneo; cada import se resuelve con
+# búsquedas en diccionario (memoizadas) en lugar de probar variantes de nombre contra el disco.
+import logging
+import posixpath
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__) # Usa 'proyscan.dependency_analysis.css_index'
+
+# Extensiones que Sass prueba para un import sin extensión, por prioridad
+EXTENSIONES_SASS = ('.scss', '.sass', '.css')
+EXTENSION_LESS = '.less'
+# Directorios que se tratan como load paths (además del directorio del archivo y de la raíz):
+# los proyectos suelen configurar `includePaths`/`loadPaths` apuntando a uno de ellos
+NOMBRES_LOAD_PATH = ('src', 'styles', 'style', 'scss', 'sass', 'stylesheets', 'less')
+
+
+def _unir(directorio: str, ruta: str) -> Optional[str]:
+    """Une y normaliza una ruta relativa al proyecto; None si sale de la raíz."""
+    unida = posixpath.normpath(posixpath.join(directorio, ruta)) if directorio else posixpath.normpath(ruta)
+    if unida == '..' or unida.startswith(('../', '/')):
+        return None
+    return '' if unida == '.' else unida
+
+
+class IndiceEstilos:
+    """
+    Mapea rutas de módulo Sass ('estilos/base/variables') al archivo que las implementa
+    ('estilos/base/_variables.scss', 'estilos/base/variables.sass', 'estilos/base/_index.scss'...)
+    y rutas LESS sin extensión a su .less. Los imports se buscan primero junto al archivo que
+    importa y después en cada load path ('' = raíz del proyecto).
+    """
+
+    def __init__(self, archivos_proyecto: Iterable[str]):
+        self.archivos: Set[str] = archivos_proyecto if isinstance(archivos_proyecto, set) else set(archivos_proyecto)
+        self._sass: Dict[str, str] = {}
+        self._less: Dict[str, str] = {}
+        prioridades: Dict[str, Tuple[int, int]] = {}
+        directorios_estilos: Set[str] = set()
+        for ruta in self.archivos:
+            directorio, _, nombre = ruta.rpartition('/')
+            raiz, punto, extension = nombre.rpartition('.')
+            extension = punto + extension
+            if extension == EXTENSION_LESS:
+                self._less[ruta[:-len(extension)]] = ruta
+            elif extension not in EXTENSIONES_SASS:
+                continue
+            while directorio and directorio not in directorios_estilos:
+                directorios_estilos.add(directorio)
+                directorio = directorio.rpartition('/')[0]
+            if extension == EXTENSION_LESS:
+                continue
+            directorio = ruta.rpartition('/')[0]
+            parcial = raiz.startswith('_')
+            modulo = raiz[1:] if parcial else raiz
+            claves = [f"{directorio}/{modulo}" if directorio else modulo]
+            if parcial:
+                claves.append(f"{directorio}/{modulo}{extension}" if directorio else modulo + extension) # '@use "x.scss"' -> _x.scss
+            if modulo == 'index' and directorio:
+                claves.append(directorio) # '@use "botones"' -> botones/_index.scss
+            prioridad = (EXTENSIONES_SASS.index(extension), parcial)
+            for clave in claves:
+                if clave != ruta and prioridad < prioridades.get(clave, (len(EXTENSIONES_SASS), True)):
+                    prioridades[clave] = prioridad
+                    self._sass[clave] = ruta
+
+        raices_estilos = {d for d in directorios_estilos if d.rpartition('/')[2] in NOMBRES_LOAD_PATH}
+        self.load_paths: List[str] = [''] + sorted(raices_estilos, key=lambda d: (d.count('/'), d))
+        if len(self.load_paths) > 1:
+            logger.debug(f"Load paths de estilos detectados: {self.load_paths[1:]}")
+        self._cache: Dict[Tuple[str, str, str], Optional[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._sass) + len(self._less)
+
+    def _buscar(self, ruta: str, dialecto: str) -> Optional[str]:
+        if ruta in self.archivos:
+            return ruta
+        return self._less.get(ruta) if dialecto == 'less' else self._sass.get(ruta)
+
+    def resolver(self, especificador: str, ruta_archivo_rel: str, dialecto: str) -> Optional[str]:
+        """
+        Archivo del proyecto para un import de estilos de `ruta_archivo_rel` ('sass' o 'less'),
+        o None si no está en el proyecto.
+        """
+        directorio = ruta_archivo_rel.rpartition('/')[0]
+        clave = (especificador, directorio, dialecto)
+        if clave not in self._cache:
+            resuelto: Optional[str] = None
+            if especificador.startswith('/'):
+                bases: List[str] = ['']
+                especificador_relativo = especificador[1:]
+            else:
+                bases = [directorio] + [raiz for raiz in self.load_paths if raiz != directorio]
+                especificador_relativo = especificador
+            for base in bases:
+                ruta = _unir(base, especificador_relativo)
+                if ruta is not None:
+                    resuelto = self._buscar(ruta, dialecto)
+                    if resuelto:
+                        break
+            self._cache[clave] = resuelto
+        return self._cache[clave]
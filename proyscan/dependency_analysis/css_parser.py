@@ -1,154 +1,153 @@
 # proyscan/dependency_analysis/css_parser.py
-import os
+# Dependencias de hojas de estilo CSS/SCSS/Sass/LESS con un escáner a nivel de token: salta
+# comentarios y cadenas y solo extrae url(...) y los preludios de @import/@use/@forward, sin
+# construir la hoja de estilos. Los imports de Sass y LESS se resuelven con el índice de estilos
+# del escaneo (parciales, _index y load paths).
+import re
 import logging # Importar logging
-from typing import List, Set, Optional, Dict
-import tinycss2 # Importar tinycss2
+from typing import List, Set, Optional, Dict, Tuple
 
 # Importar utilidades y modelos
-from ..utils.path_utils import resolver_ruta_referencia, normalizar_ruta
 from ..models import DependencyInfo
+from .regex_parser import MAX_REFERENCIA
+from .css_index import IndiceEstilos
+from .reference_cache import CacheReferencias
 
 # Obtener logger
 logger = logging.getLogger(__name__) # Usa 'proyscan.dependency_analysis.css_parser'
 
+# Dialecto de cada lenguaje: decide los comentarios de línea y cómo se resuelven los imports
+DIALECTOS = {'css': 'css', 'scss': 'sass', 'sass': 'sass', 'less': 'less'}
+
+_CADENA = r""""[^"\\\n]*(?:\\[\s\S][^"\\\n]*)*"|'[^'\\\n]*(?:\\[\s\S][^'\\\n]*)*'"""
+_URL = rf"""(?i:url)\(\s*(?:(?P<url_cadena>{_CADENA})|(?P<url>[^"'()\s]{{1,{MAX_REFERENCIA}}}))\s*\)"""
+_REGLA = r"""@(?P<regla>(?i:import|use|forward))\b"""
+# Bucles desenrollados: el comentario de bloque y las cadenas se consumen en una sola repetición
+_TOKEN_CSS = re.compile(rf"""/\*[^*]*\*+(?:[^/*][^*]*\*+)*/|/\*[\s\S]*|{_CADENA}|{_URL}|{_REGLA}""")
+# SCSS, Sass y LESS admiten además comentarios de línea ('//' dentro de url(...) o de una cadena no cuenta)
+_TOKEN_CSS_LINEA = re.compile(rf"""/\*[^*]*\*+(?:[^/*][^*]*\*+)*/|/\*[\s\S]*|//[^\n]*|{_CADENA}|{_URL}|{_REGLA}""")
+# Preludio de @import/@use/@forward: opciones LESS '(reference)', lista de cadenas o url() separadas por comas
+_OPCIONES_LESS = re.compile(r"\s*\([\w\s,-]*\)")
+_REFERENCIA_PRELUDIO = re.compile(rf"""\s*(?:(?P<cadena>{_CADENA})|{_URL})""")
+# En la sintaxis indentada (.sass) @import admite rutas sin comillas
+_REFERENCIA_SIN_COMILLAS = re.compile(r"""[ \t]*(?P<ruta>[^\s,;'"(){}]+)""")
+_SEPARADOR_PRELUDIO = re.compile(r"\s*,")
+
+
+def _sin_comillas(cadena: str) -> str:
+    return cadena[1:-1]
+
+
+def extraer_referencias_css(texto: str, lenguaje: str) -> List[Tuple[str, str]]:
+    """
+    Devuelve, en orden, (origen, referencia) donde origen es 'url' o la regla que la importa
+    ('import', 'use', 'forward'). Ignora lo que aparece en comentarios y cadenas sueltas.
+    """
+    referencias: List[Tuple[str, str]] = []
+    patron = _TOKEN_CSS if lenguaje == 'css' else _TOKEN_CSS_LINEA
+    posicion = 0
+    while True:
+        token = patron.search(texto, posicion)
+        if token is None:
+            break
+        posicion = token.end()
+        regla = token.group('regla')
+        if regla is None:
+            valor = token.group('url')
+            if valor is None and token.group('url_cadena') is not None:
+                valor = _sin_comillas(token.group('url_cadena'))
+            if valor is not None:
+                referencias.append(('url', valor))
+            continue # Comentario o cadena: se salta entero
+        regla = regla.lower()
+        if regla == 'import' and lenguaje == 'less':
+            opciones = _OPCIONES_LESS.match(texto, posicion)
+            if opciones:
+                posicion = opciones.end()
+        while True:
+            referencia = _REFERENCIA_PRELUDIO.match(texto, posicion)
+            if referencia:
+                valor = _sin_comillas(referencia.group('cadena')) if referencia.group('cadena') is not None else (
+                    referencia.group('url') if referencia.group('url') is not None else _sin_comillas(referencia.group('url_cadena')))
+            elif regla == 'import' and lenguaje == 'sass':
+                referencia = _REFERENCIA_SIN_COMILLAS.match(texto, posicion)
+                valor = referencia.group('ruta') if referencia else None
+            if not referencia:
+                break
+            referencias.append((regla, valor))
+            posicion = referencia.end()
+            separador = _SEPARADOR_PRELUDIO.match(texto, posicion)
+            if separador is None or regla != 'import': # @use/@forward cargan un único módulo
+                break
+            posicion = separador.end()
+    return referencias
+
+
+def _es_dinamica(referencia: str) -> bool:
+    """Interpolaciones de Sass ('#{$ruta}') o LESS ('@{ruta}') y variables: no se pueden resolver."""
+    return '#{' in referencia or '@{' in referencia or referencia.startswith(('$', '@'))
+
 
 def analizar_css(
     contenido_lineas: List[str],
+    lenguaje: str,
     ruta_archivo_rel: str,
-    archivos_proyecto: Set[str],
-    # dir_proyecto_raiz: str # No necesario directamente aquí
+    indice: IndiceEstilos,
+    referencias_proyecto: CacheReferencias
 ) -> Optional[List[DependencyInfo]]:
     """
-    Analiza dependencias en archivos CSS usando tinycss2. (Versión Corregida v2 con Logging)
+    Analiza dependencias en hojas de estilo (CSS, SCSS, Sass, LESS) con el escáner de tokens.
     """
-    logger.debug(f"--- Iniciando análisis CSS para {ruta_archivo_rel} ---") # DEBUG
+    logger.debug(f"--- Iniciando análisis CSS para {ruta_archivo_rel} (Lenguaje: {lenguaje}) ---") # DEBUG
     contenido_completo = "\n".join(contenido_lineas)
     if not contenido_completo.strip():
         logger.debug("Archivo CSS vacío.") # DEBUG
         return []
 
-    dependencias_encontradas_raw: Set[str] = set()
-    rules = []
-
+    lenguaje = lenguaje if lenguaje in DIALECTOS else 'css' # <style lang="stylus"> y similares: como CSS
+    dialecto = DIALECTOS[lenguaje]
     try:
-        # Parsear la hoja de estilo. skip_comments=True es bueno.
-        rules = tinycss2.parse_stylesheet(contenido_completo, skip_comments=True)
-        logger.debug(f"Parseo CSS inicial OK. {len(rules)} tokens principales.") # DEBUG
-
-        for i, token in enumerate(rules):
-            token_type = getattr(token, 'type', 'N/A')
-            # logger.debug(f"Procesando token CSS {i}: type={token_type}") # DEBUG (Muy verboso)
-
-            # --- Buscar @import ---
-            if token_type == 'at-rule':
-                rule_name_attr = getattr(token, 'name', None)
-                if rule_name_attr and isinstance(rule_name_attr, str):
-                    rule_name_lower = rule_name_attr.lower()
-                    if rule_name_lower == 'import':
-                        logger.debug("Encontrado @import.") # DEBUG
-                        import_value: Optional[str] = None
-                        prelude = getattr(token, 'prelude', [])
-                        for node in prelude:
-                            node_type = getattr(node, 'type', 'N/A')
-                            if node_type == 'string' or node_type == 'url':
-                                import_value = getattr(node, 'value', None)
-                                if import_value:
-                                    logger.debug(f"    -> Valor @import extraído: '{import_value}'") # DEBUG
-                                    dependencias_encontradas_raw.add(import_value.strip())
-                                    break
-
-            # --- Buscar funciones url() ---
-            tokens_a_buscar_url = []
-            prelude = getattr(token, 'prelude', [])
-            content = getattr(token, 'content', None)
-            tokens_a_buscar_url.extend(prelude)
-
-            if content:
-                 if token_type == 'qualified-rule':
-                      if isinstance(content, list):
-                           tokens_a_buscar_url.extend(content)
-                 elif token_type == 'at-rule':
-                      try:
-                           if hasattr(content, '__iter__'):
-                                declarations = tinycss2.parse_declaration_list(content, skip_comments=True)
-                                for decl in declarations:
-                                     if getattr(decl, 'type', '') == 'declaration':
-                                          value_tokens = getattr(decl, 'value', [])
-                                          tokens_a_buscar_url.extend(value_tokens)
-                           # else: logger.debug(f"  Content de AtRule no es iterable: {type(content)}") # DEBUG
-                      except Exception as e_decl:
-                           logger.warning(f"Error parseando declaraciones en AtRule '{getattr(token, 'name', 'N/A')}' en {ruta_archivo_rel}: {e_decl}")
-
-
-            # Iterar en la lista recolectada para encontrar 'url('
-            for node in tokens_a_buscar_url:
-                 node_type = getattr(node, 'type', '')
-                 func_name_attr = getattr(node, 'name', None)
-                 func_name_lower = func_name_attr.lower() if isinstance(func_name_attr, str) else None
-
-                 if node_type == 'function' and func_name_lower == 'url':
-                     logger.debug("Encontrada función url().") # DEBUG
-                     url_value: Optional[str] = None
-                     arguments = getattr(node, 'arguments', [])
-                     # logger.debug(f"  Argumentos url(): {[arg.type + ':' + repr(getattr(arg,'value','N/A')) for arg in arguments]}") # DEBUG (Muy verboso)
-                     for arg_node in arguments:
-                          arg_type = getattr(arg_node, 'type', '')
-                          if arg_type == 'whitespace': continue
-                          if arg_type in ('string', 'url', 'ident'):
-                               url_value = getattr(arg_node, 'value', None)
-                               if url_value:
-                                    logger.debug(f"    -> Valor url() extraído: '{url_value}'") # DEBUG
-                                    dependencias_encontradas_raw.add(url_value.strip())
-                                    break
-                     # if not url_value: logger.debug("  No se encontró valor útil en argumentos de url().") # DEBUG
-
-
+        referencias = extraer_referencias_css(contenido_completo, lenguaje)
     except Exception as e_parse:
-        logger.error(f"--- ERROR CRÍTICO DURANTE PARSEO CSS ({type(e_parse).__name__}) en {ruta_archivo_rel} ---", exc_info=True) # ERROR con traceback
+        logger.error(f"--- ERROR CRÍTICO DURANTE ANÁLISIS CSS ({type(e_parse).__name__}) en {ruta_archivo_rel} ---", exc_info=True) # ERROR con traceback
         return None
+    logger.debug(f"Dependencias crudas encontradas: {referencias}") # DEBUG
 
     # --- Resolución y Clasificación ---
-    dependencias_clasificadas: List[DependencyInfo] = []
-    rutas_procesadas = set()
-    logger.debug(f"Dependencias crudas encontradas: {dependencias_encontradas_raw}") # DEBUG
-
-    for ref in dependencias_encontradas_raw:
-        if ref == '#' or ref.startswith(('javascript:', 'mailto:', 'tel:', 'data:')):
+    dependencias: Set[Tuple[str, str]] = set()
+    for origen, ref in referencias:
+        ref = ref.strip()
+        if not ref or ref == '#' or ref.startswith(('javascript:', 'mailto:', 'tel:', 'data:')) or _es_dinamica(ref):
             logger.debug(f"Omitiendo referencia no procesable: '{ref}'") # DEBUG
             continue
 
+        if origen != 'url' and dialecto != 'css':
+            # Módulos de Sass ('sass:math'), paquetes ('~bootstrap/scss/x', 'pkg:x') e imports del proyecto
+            if ref.startswith('sass:'):
+                dependencias.add(('stdlib', ref))
+                continue
+            if ref.startswith(('~', 'pkg:')):
+                dependencias.add(('library', ref[4:] if ref.startswith('pkg:') else ref.lstrip('~')))
+                continue
+            resuelto = indice.resolver(ref, ruta_archivo_rel, dialecto)
+            if resuelto:
+                logger.debug(f"  -> '{ref}' resuelto por el índice de estilos: '{resuelto}'") # DEBUG
+                dependencias.add(('internal', resuelto))
+                continue
+
         logger.debug(f"Resolviendo referencia cruda: '{ref}'") # DEBUG
-        type_ref, ruta_resuelta_o_original = resolver_ruta_referencia(ref, ruta_archivo_rel)
+        type_ref, ruta_resuelta_o_original, en_proyecto = referencias_proyecto.resolver(ref, ruta_archivo_rel)
         logger.debug(f"  -> type Ref: '{type_ref}', Ruta/Original: '{ruta_resuelta_o_original}'") # DEBUG
-        dep_info: Optional[DependencyInfo] = None
-        key_to_check = ruta_resuelta_o_original
-
         if not ruta_resuelta_o_original: continue
 
-        if type_ref == 'url': dep_info = DependencyInfo(type='url', path=ruta_resuelta_o_original)
-        elif type_ref == 'external': dep_info = DependencyInfo(type='external', path=ruta_resuelta_o_original)
+        if type_ref == 'url': dependencias.add(('url', ruta_resuelta_o_original))
+        elif type_ref == 'externa' and origen != 'url': dependencias.add(('library', ruta_resuelta_o_original)) # '@import "bootstrap"' desde un load path externo
         elif type_ref in ['absoluta', 'relativa']:
-            ruta_norm = normalizar_ruta(ruta_resuelta_o_original)
-            key_to_check = ruta_norm
-            logger.debug(f"  -> Ruta normalizada interna/rota: '{ruta_norm}'") # DEBUG
-            if ruta_norm in archivos_proyecto:
-                 if ruta_norm not in rutas_procesadas:
-                      dep_info = DependencyInfo(type='internal', path=ruta_norm)
-                      logger.debug("    -> Clasificado como: INTERNAL") # DEBUG
-            else:
-                 if ruta_norm not in rutas_procesadas:
-                      dep_info = DependencyInfo(type='internal_broken', path=ruta_norm)
-                      logger.debug("    -> Clasificado como: INTERNAL_BROKEN") # DEBUG
+            dependencias.add(('internal' if en_proyecto else 'internal_broken', ruta_resuelta_o_original))
+            logger.debug(f"  -> Ruta normalizada interna/rota: '{ruta_resuelta_o_original}'") # DEBUG
         else:
              logger.debug(f"  -> type referencia no manejado para clasificación: '{type_ref}'") # DEBUG
 
-        if dep_info and key_to_check not in rutas_procesadas:
-             dependencias_clasificadas.append(dep_info)
-             rutas_procesadas.add(key_to_check)
-        elif dep_info:
-             logger.debug(f"  -> Duplicado omitido: '{key_to_check}'") # DEBUG
-
-    dependencias_clasificadas.sort(key=lambda x: (x['type'], x['path']))
+    dependencias_clasificadas = [DependencyInfo(type=t, path=p) for t, p in sorted(dependencias)]
     logger.debug(f"Dependencias CSS finales clasificadas: {dependencias_clasificadas}") # DEBUG
-
-    return dependencias_clasificadas
\ No newline at end of file
+    return dependencias_clasificadas
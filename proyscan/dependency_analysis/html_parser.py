@@ -2,18 +2,26 @@
 import os
 import re
 import logging # Importar
-from typing import List, Set, Optional, Dict
-from bs4 import BeautifulSoup, FeatureNotFound
+from html.parser import HTMLParser
+from typing import List, Set, Optional, Dict, Mapping
+
+# lxml (parser de libxml2 en C) es el preferido; sin él se usa html.parser de la biblioteca estándar
+try:
+    from lxml import etree as lxml_etree
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
 
-from ..utils.path_utils import resolver_ruta_referencia, normalizar_ruta
 from ..models import DependencyInfo
+from .regex_parser import MAX_REFERENCIA
+from .reference_cache import CacheReferencias
 
 # Obtener logger
 logger = logging.getLogger(__name__) # Usa 'proyscan.dependency_analysis.html_parser'
 
-# --- TAG_ATTR_MAP y STYLE_URL_REGEX sin cambios ---
+# --- TAG_ATTR_MAP y STYLE_URL_REGEX ---
 TAG_ATTR_MAP = { 'script': ['src'], 'link': ['href'], 'img': ['src', 'srcset'], 'audio': ['src'], 'video': ['src', 'poster'], 'source': ['src', 'srcset'], 'iframe': ['src'], 'embed': ['src'], 'form': ['action'], 'object': ['data'], }
-STYLE_URL_REGEX = re.compile(r"""url\(["']?([^"')]+?)["']?\)""", re.IGNORECASE)
+STYLE_URL_REGEX = re.compile(rf"""url\(["']?([^"'()]{{1,{MAX_REFERENCIA}}}?)["']?\)""", re.IGNORECASE) # Acotado contra backtracking
 
 def _extraer_de_srcset(srcset_value: str) -> List[str]:
     # ... (sin cambios, no necesita logging interno) ...
@@ -25,90 +33,78 @@ def _extraer_de_srcset(srcset_value: str) -> List[str]:
         if items: urls.append(items[0])
     return urls
 
-def analizar_html(contenido_lineas: List[str], ruta_archivo_rel: str, archivos_proyecto: Set[str]) -> Optional[List[DependencyInfo]]:
+# --- Extracción por eventos (sin construir el DOM) ---
+class _RecolectorReferencias:
+    """
+    Recibe cada etiqueta de apertura con sus atributos y guarda las referencias de
+    TAG_ATTR_MAP y los url() de los atributos style. Sirve de `target` para lxml.
+    """
+
+    def __init__(self):
+        self.referencias: Set[str] = set()
+
+    def start(self, tag: str, atributos: Mapping[str, Optional[str]]):
+        nombres_atributos = TAG_ATTR_MAP.get(tag)
+        if nombres_atributos:
+            # <link> solo cuenta como dependencia si es una hoja de estilos (rel admite varios valores)
+            if tag == 'link' and 'stylesheet' not in (atributos.get('rel') or '').lower().split():
+                nombres_atributos = ()
+            for nombre_atributo in nombres_atributos:
+                valor = atributos.get(nombre_atributo)
+                if not valor:
+                    continue
+                if nombre_atributo == 'srcset':
+                    self.referencias.update(url.strip() for url in _extraer_de_srcset(valor) if url.strip())
+                elif valor.strip():
+                    self.referencias.add(valor.strip())
+        estilo = atributos.get('style')
+        if estilo:
+            self.referencias.update(url.strip() for url in STYLE_URL_REGEX.findall(estilo) if url.strip())
+
+    def close(self) -> Set[str]:
+        return self.referencias
+
+class _ExtractorHtmlParser(HTMLParser):
+    """Alternativa sin lxml: mismos eventos con html.parser (Python puro)."""
+
+    def __init__(self, recolector: _RecolectorReferencias):
+        super().__init__(convert_charrefs=True)
+        self.recolector = recolector
+
+    def handle_starttag(self, tag, attrs):
+        atributos: Dict[str, Optional[str]] = {}
+        for nombre, valor in attrs:
+            atributos.setdefault(nombre, valor) # Atributo repetido: vale el primero, como en lxml
+        self.recolector.start(tag, atributos)
+
+    handle_startendtag = handle_starttag
+
+def extraer_referencias_html(contenido: str, ruta_archivo_rel: str = '') -> Set[str]:
+    """Referencias crudas (src, href, srcset, action, data, poster, url() de style) en una pasada."""
+    if LXML_AVAILABLE:
+        try:
+            parser = lxml_etree.HTMLParser(target=_RecolectorReferencias(), huge_tree=True)
+            parser.feed(contenido)
+            return parser.close()
+        except Exception as e_lxml:
+            logger.debug(f"lxml no pudo procesar {ruta_archivo_rel} ({e_lxml}); se usa html.parser.")
+    extractor = _ExtractorHtmlParser(_RecolectorReferencias())
+    extractor.feed(contenido)
+    extractor.close()
+    return extractor.recolector.referencias
+
+def analizar_html(contenido_lineas: List[str], ruta_archivo_rel: str, referencias: CacheReferencias) -> Optional[List[DependencyInfo]]:
     logger.debug(f"--- Iniciando análisis HTML para {ruta_archivo_rel} ---") # DEBUG
     contenido_completo = "\n".join(contenido_lineas)
     if not contenido_completo.strip():
         logger.debug("Archivo HTML vacío.") # DEBUG
         return []
 
-    dependencias_encontradas_raw: Set[str] = set()
-    soup: Optional[BeautifulSoup] = None # Inicializar
-
     try:
-        # Intentar con lxml, luego html.parser
-        try:
-             soup = BeautifulSoup(contenido_completo, 'lxml')
-             logger.debug("HTML parseado con lxml.") # DEBUG
-        except FeatureNotFound:
-             logger.debug("lxml no encontrado, usando html.parser para HTML.") # DEBUG
-             soup = BeautifulSoup(contenido_completo, 'html.parser')
-        except Exception as e_parse: # Capturar otros errores de BS
-             logger.error(f"Error parseando HTML en {ruta_archivo_rel}", exc_info=True) # ERROR con traceback
-             return None
-    except Exception as e_general: # Capturar si BS falla de forma inesperada
-         logger.error(f"Error inesperado inicializando BeautifulSoup para {ruta_archivo_rel}", exc_info=True)
-         return None
-
-    if soup is None: # Doble check por si algo muy raro pasa
-         logger.error(f"BeautifulSoup no pudo inicializarse para {ruta_archivo_rel}")
-         return None
-
-    # Buscar en tags y atributos definidos
-    for tag_name, attrs in TAG_ATTR_MAP.items():
-        logger.debug(f"Buscando tags '<{tag_name}>'...") # DEBUG
-        try:
-             tags_encontrados = soup.find_all(tag_name)
-        except Exception as e_find:
-             logger.warning(f"Error buscando tags '{tag_name}' en {ruta_archivo_rel}: {e_find}")
-             continue # Continuar con el siguiente tag
-
-        logger.debug(f"  Encontrados {len(tags_encontrados)} tags '<{tag_name}>'") # DEBUG
-        for i, tag in enumerate(tags_encontrados):
-            # print(f"    Tag {i+1}: {tag.name}") # Muy verboso
-            if tag_name == 'link':
-                rel_attr = tag.get('rel')
-                is_stylesheet = False
-                if rel_attr:
-                    rel_list = rel_attr if isinstance(rel_attr, list) else [rel_attr]
-                    if 'stylesheet' in [r.lower() for r in rel_list]:
-                         is_stylesheet = True
-                if not is_stylesheet:
-                     logger.debug(f"    Tag <link> omitido (no es rel='stylesheet')") # DEBUG
-                     continue
-
-            for attr_name in attrs:
-                value = tag.get(attr_name)
-                if value and isinstance(value, str):
-                     logger.debug(f"    Encontrado atributo '{attr_name}' con valor='{value[:50]}...'") # DEBUG (cortar valor largo)
-                     if attr_name == 'srcset':
-                         urls = _extraer_de_srcset(value)
-                         logger.debug(f"      -> srcset URLs extraídas: {urls}") # DEBUG
-                         for url in urls:
-                              if url.strip(): dependencias_encontradas_raw.add(url.strip())
-                     else:
-                         if value.strip(): dependencias_encontradas_raw.add(value.strip())
-
-    # Buscar url() en atributos 'style'
-    logger.debug(f"Buscando url() en atributos 'style'...") # DEBUG
-    try:
-         tags_con_style = soup.find_all(attrs={"style": True})
-    except Exception as e_find_style:
-         logger.warning(f"Error buscando tags con atributo 'style' en {ruta_archivo_rel}: {e_find_style}")
-         tags_con_style = []
-
-    logger.debug(f"  Encontrados {len(tags_con_style)} tags con atributo 'style'") # DEBUG
-    for tag_with_style in tags_con_style:
-         style_content = tag_with_style.get('style')
-         if isinstance(style_content, str):
-             try:
-                 urls_in_style = STYLE_URL_REGEX.findall(style_content)
-                 if urls_in_style: logger.debug(f"    URLs encontradas en style='{style_content[:50]}...': {urls_in_style}") # DEBUG
-                 for url in urls_in_style:
-                     if url.strip(): dependencias_encontradas_raw.add(url.strip())
-             except Exception as e_regex:
-                  logger.warning(f"Error con Regex de estilo en {ruta_archivo_rel}: {e_regex}")
-
+        dependencias_encontradas_raw = extraer_referencias_html(contenido_completo, ruta_archivo_rel)
+    except Exception as e_parse:
+        logger.error(f"Error parseando HTML en {ruta_archivo_rel}", exc_info=True) # ERROR con traceback
+        return None
 
     # --- Resolución y Clasificación (usar logger) ---
     dependencias_clasificadas: List[DependencyInfo] = []
@@ -121,7 +117,7 @@ def analizar_html(contenido_lineas: List[str], ruta_archivo_rel: str, archivos_p
             continue
 
         logger.debug(f"Resolviendo referencia cruda: '{ref}'") # DEBUG
-        type_ref, ruta_resuelta_o_original = resolver_ruta_referencia(ref, ruta_archivo_rel)
+        type_ref, ruta_resuelta_o_original, en_proyecto = referencias.resolver(ref, ruta_archivo_rel)
         logger.debug(f"  -> type Ref: '{type_ref}', Ruta/Original: '{ruta_resuelta_o_original}'") # DEBUG
         # ... (resto de lógica de clasificación igual) ...
         dep_info: Optional[DependencyInfo] = None
@@ -130,10 +126,10 @@ def analizar_html(contenido_lineas: List[str], ruta_archivo_rel: str, archivos_p
         if type_ref == 'url': dep_info = DependencyInfo(type='url', path=ruta_resuelta_o_original)
         elif type_ref == 'externall': dep_info = DependencyInfo(type='library', path=ruta_resuelta_o_original)
         elif type_ref in ['absoluta', 'relativa']:
-            ruta_norm = normalizar_ruta(ruta_resuelta_o_original)
+            ruta_norm = ruta_resuelta_o_original # Ya normalizada por la caché
             key_to_check = ruta_norm
             logger.debug(f"  -> Ruta normalizada internal/rota: '{ruta_norm}'") # DEBUG
-            if ruta_norm in archivos_proyecto:
+            if en_proyecto:
                  if ruta_norm not in rutas_procesadas:
                       dep_info = DependencyInfo(type='internal', path=ruta_norm)
                       logger.debug("    -> Clasificado como: internal") # DEBUG
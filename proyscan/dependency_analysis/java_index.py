@@ -0,0 +1,193 @@
+# proyscan/dependency_analysis/java_index.py
+# Lectura de la cabecera de archivos Java (declaraciones `package` e `import`, sin parsear el
+# resto de la unidad de compilación) e índice paquete/clase -> archivo del proyecto, construido
+# a partir de la declaración `package` de cada .java del escaneo.
+import os
+import re
+import logging
+import itertools
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+logger = logging.getLogger(__name__) # Usa 'proyscan.dependency_analysis.java_index'
+
+# Bytes que se leen de cada .java para construir el índice (la declaración `package` va antes
+# que cualquier import o tipo; solo la precede algún comentario de licencia)
+MAX_BYTES_CABECERA_INDICE = 16 * 1024
+
+# Tokens léxicos relevantes para la cabecera. Comentarios y espacios se descartan; las cadenas
+# solo aparecen en argumentos de anotaciones. Un comentario de bloque sin cerrar se marca aparte.
+_TOKEN_JAVA = re.compile(r"""
+    (?P<espacio>\s+)
+  | (?P<comentario>//[^\n]*|/\*.*?\*/)
+  | (?P<sin_cerrar>/\*)
+  | (?P<cadena>"(?:\\.|[^"\\\n])*"|'(?:\\.|[^'\\\n])*')
+  | (?P<nombre>[A-Za-z_$][\w$]*)
+  | (?P<simbolo>.)
+""", re.VERBOSE | re.DOTALL)
+
+
+class ImportJava(NamedTuple):
+    nombre: str # Como lo expone javalang: 'java.util.List', 'java.util' para 'java.util.*'
+    estatico: bool
+    comodin: bool
+
+
+class CabeceraJava(NamedTuple):
+    paquete: Optional[str] # None = paquete por defecto
+    imports: List[ImportJava]
+
+
+class ErrorCabeceraJava(Exception):
+    """La cabecera no es Java válido (import sin ';', comentario sin cerrar...)."""
+
+
+def _tokens(texto: str) -> Iterator[str]:
+    for coincidencia in _TOKEN_JAVA.finditer(texto):
+        tipo = coincidencia.lastgroup
+        if tipo == 'espacio' or tipo == 'comentario':
+            continue
+        if tipo == 'sin_cerrar':
+            raise ErrorCabeceraJava("comentario de bloque sin cerrar")
+        yield coincidencia.group()
+
+
+def _nombre_calificado(tokens: Iterator[str], permitir_comodin: bool, primero: Optional[str] = None) -> Tuple[str, bool]:
+    """Consume 'a.b.C' (o 'a.b.*') hasta el ';' final. Devuelve (nombre, comodín)."""
+    partes: List[str] = []
+    comodin = False
+    esperando_nombre = True
+    for token in itertools.chain((primero,) if primero is not None else (), tokens):
+        if esperando_nombre:
+            if token == '*' and permitir_comodin and partes:
+                comodin = True
+            elif token[0].isalpha() or token[0] in '_$':
+                partes.append(token)
+            else:
+                break
+            esperando_nombre = False
+        elif token == '.' and not comodin:
+            esperando_nombre = True
+        elif token == ';':
+            return '.'.join(partes), comodin
+        else:
+            break
+    raise ErrorCabeceraJava(f"declaración mal formada tras '{'.'.join(partes)}'")
+
+
+def _saltar_argumentos_anotacion(tokens: Iterator[str]):
+    """Consume '( ... )' con paréntesis anidados (el '(' ya se ha leído)."""
+    profundidad = 1
+    for token in tokens:
+        if token == '(':
+            profundidad += 1
+        elif token == ')':
+            profundidad -= 1
+            if profundidad == 0:
+                return
+    raise ErrorCabeceraJava("argumentos de anotación sin cerrar")
+
+
+def escanear_cabecera_java(texto: str, solo_paquete: bool = False) -> CabeceraJava:
+    """
+    Lee las declaraciones `package` e `import` y se detiene en la primera declaración de tipo
+    (o de módulo). Con `solo_paquete` se detiene también tras el `package`.
+    Lanza ErrorCabeceraJava si la cabecera está mal formada.
+    """
+    paquete: Optional[str] = None
+    imports: List[ImportJava] = []
+    tokens = _tokens(texto)
+    pendiente: Optional[str] = None # Token leído de más al mirar tras una anotación
+    anotado = False # Tras una anotación solo puede venir `package` o la declaración de tipo
+    while True:
+        token = pendiente if pendiente is not None else next(tokens, None)
+        pendiente = None
+        if token is None:
+            break
+        if token == ';':
+            continue
+        if token == '@':
+            # Anotación (de paquete en package-info.java o del primer tipo); '@interface' es un tipo
+            nombre = next(tokens, None)
+            if nombre is None or nombre == 'interface':
+                break
+            siguiente = next(tokens, None)
+            while siguiente == '.':
+                next(tokens, None)
+                siguiente = next(tokens, None)
+            if siguiente == '(':
+                _saltar_argumentos_anotacion(tokens)
+            else:
+                pendiente = siguiente
+            anotado = True
+            continue
+        if token == 'package' and paquete is None and not imports:
+            paquete, _ = _nombre_calificado(tokens, permitir_comodin=False)
+            anotado = False
+            if solo_paquete:
+                break
+            continue
+        if token == 'import':
+            if solo_paquete:
+                break
+            if anotado:
+                raise ErrorCabeceraJava("anotación antes de un import")
+            siguiente = next(tokens, None)
+            estatico = siguiente == 'static'
+            nombre, comodin = _nombre_calificado(tokens, True, None if estatico else siguiente)
+            imports.append(ImportJava(nombre, estatico, comodin))
+            continue
+        break # Modificador, 'class', 'interface', 'enum', 'record', 'module'...: fin de la cabecera
+    return CabeceraJava(paquete, imports)
+
+
+class IndiceJava:
+    """
+    Mapea nombres de clase completamente calificados ('com.acme.util.Helper') al archivo que
+    los declara, y cada paquete a sus archivos. El paquete sale de la declaración `package`
+    de cada archivo (no de su ruta); la clase, del nombre del archivo (clase pública de nivel
+    superior). Los archivos del paquete por defecto no son importables y no se indexan.
+    """
+
+    def __init__(self, archivos_proyecto: Iterable[str], directorio_proyecto: str):
+        self._clases: Dict[str, str] = {}
+        self._paquetes: Dict[str, List[str]] = {}
+        for ruta in sorted(archivo for archivo in archivos_proyecto if archivo.endswith('.java')):
+            paquete = self._leer_paquete(os.path.join(directorio_proyecto, ruta))
+            if not paquete:
+                continue
+            clase = f"{paquete}.{os.path.basename(ruta)[:-5]}"
+            if clase in self._clases:
+                logger.debug(f"Clase Java '{clase}' declarada en '{self._clases[clase]}' y '{ruta}'; se usa la primera.")
+            else:
+                self._clases[clase] = ruta
+            self._paquetes.setdefault(paquete, []).append(ruta)
+        logger.debug(f"Índice Java: {len(self._clases)} clases en {len(self._paquetes)} paquetes.")
+
+    def __len__(self) -> int:
+        return len(self._clases)
+
+    @staticmethod
+    def _leer_paquete(ruta_absoluta: str) -> Optional[str]:
+        try:
+            with open(ruta_absoluta, 'r', encoding='utf-8', errors='replace') as f:
+                inicio = f.read(MAX_BYTES_CABECERA_INDICE)
+            return escanear_cabecera_java(inicio, solo_paquete=True).paquete
+        except (OSError, ErrorCabeceraJava) as e:
+            logger.debug(f"No se pudo leer el paquete de '{ruta_absoluta}': {e}")
+            return None
+
+    def _clase_contenedora(self, nombre: str) -> Optional[str]:
+        """Archivo de la clase 'a.b.C' o de la que contiene 'a.b.C.Interna' / 'a.b.C.miembro'."""
+        while '.' in nombre:
+            archivo = self._clases.get(nombre)
+            if archivo:
+                return archivo
+            nombre = nombre.rpartition('.')[0]
+        return None
+
+    def resolver_import(self, importacion: ImportJava) -> List[str]:
+        """Archivos del proyecto a los que apunta un import ([] si no es interno)."""
+        if importacion.comodin and not importacion.estatico and importacion.nombre in self._paquetes:
+            return self._paquetes[importacion.nombre] # 'import a.b.*': todos los tipos del paquete
+        archivo = self._clase_contenedora(importacion.nombre)
+        return [archivo] if archivo else []
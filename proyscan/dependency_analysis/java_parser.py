@@ -1,22 +1,10 @@
 # proyscan/dependency_analysis/java_parser.py
 import logging
-from typing import List, Set, Optional, Dict
-
-# Intentar importar javalang
-try:
-    import javalang
-    from javalang.tokenizer import LexerError
-    from javalang.parser import JavaSyntaxError
-    JAVALANG_AVAILABLE = True
-except ImportError:
-    JAVALANG_AVAILABLE = False
-    # Definir clases dummy para que el resto del código no falle si no está instalado
-    class LexerError(Exception): pass
-    class JavaSyntaxError(Exception): pass
+from typing import List, Set, Optional
 
 # Importar modelos y utilidades
 from ..models import DependencyInfo
-from ..utils.path_utils import es_stdlib # Podríamos necesitar una versión Java de esto
+from .java_index import IndiceJava, ErrorCabeceraJava, escanear_cabecera_java
 
 logger = logging.getLogger(__name__) # Usa 'proyscan.dependency_analysis.java_parser'
 
@@ -30,68 +18,51 @@ def es_java_stdlib(nombre_paquete_completo: str) -> bool:
     return nombre_paquete_completo.startswith(JAVA_STDLIB_PREFIXES)
 
 def clasificar_dependencia_java(import_path: str) -> DependencyInfo:
-    """Clasifica una dependencia Java encontrada."""
+    """Clasifica una dependencia Java externa (no encontrada en el índice del proyecto)."""
     if es_java_stdlib(import_path):
         logger.debug(f"  -> Clasificado como Java STDLIB: '{import_path}'")
         return DependencyInfo(type='stdlib', path=import_path)
     else:
-        # Con javalang (análisis estático sin classpath), no podemos saber
-        # si 'com.mycompany.util.Calculator' es interno o una biblioteca externa.
-        # Por defecto, lo clasificamos como 'library'.
-        # Una mejora futura podría intentar mapear esto a archivos si la estructura sigue convenciones.
-        logger.debug(f"  -> Clasificado como Java LIBRARY (o interno no resoluble): '{import_path}'")
+        logger.debug(f"  -> Clasificado como Java LIBRARY: '{import_path}'")
         return DependencyInfo(type='library', path=import_path)
 
 
 def analizar_java(
     contenido_lineas: List[str],
     ruta_archivo_rel: str,
-    archivos_proyecto: Set[str] # No usado activamente aquí, pero mantenido por consistencia
+    indice: IndiceJava
 ) -> Optional[List[DependencyInfo]]:
     """
-    Analiza dependencias 'import' en archivos Java usando javalang.
+    Analiza las declaraciones 'import' de un archivo Java leyendo solo su cabecera (hasta la
+    primera declaración de tipo). Los imports de clases del proyecto se resuelven con el índice
+    de paquetes del escaneo (ver java_index.py) y se registran como 'internal'.
     """
-    if not JAVALANG_AVAILABLE:
-        logger.error("La biblioteca 'javalang' no está instalada. No se puede analizar Java.")
-        # Devolver None indica fallo, lista vacía indica que no se encontraron deps
-        return None
-
-    logger.debug(f"--- Iniciando análisis Java (javalang) para {ruta_archivo_rel} ---")
+    logger.debug(f"--- Iniciando análisis Java (cabecera) para {ruta_archivo_rel} ---")
     contenido_completo = "\n".join(contenido_lineas)
     if not contenido_completo.strip():
         logger.debug("Archivo Java vacío.")
         return []
 
-    dependencias_clasificadas: List[DependencyInfo] = []
-    imports_encontrados: Set[str] = set() # Usar set para evitar duplicados crudos
-
     try:
-        # Parsear el código fuente Java
-        tree = javalang.parse.parse(contenido_completo)
-
-        # Filtrar para encontrar nodos de importación
-        # Usamos filter() que devuelve un generador de (path_in_tree, node)
-        for _, node in tree.filter(javalang.tree.Import):
-            # node.path contiene el string completo del import (ej: 'java.util.ArrayList')
-            import_path = getattr(node, 'path', None)
-            if import_path and isinstance(import_path, str):
-                logger.debug(f"  -> Import crudo encontrado: '{import_path}'")
-                imports_encontrados.add(import_path) # Añadir al set
-
-    # Manejar errores específicos de javalang y errores generales
-    except (LexerError, JavaSyntaxError) as e_parse:
-        logger.warning(f"Error de sintaxis/lexer Java en {ruta_archivo_rel}: {e_parse}. No se analizan dependencias.")
+        cabecera = escanear_cabecera_java(contenido_completo)
+    except ErrorCabeceraJava as e_parse:
+        logger.warning(f"Error de sintaxis en la cabecera Java de {ruta_archivo_rel}: {e_parse}. No se analizan dependencias.")
         return None # Indicar fallo en el análisis de este archivo
-    except Exception as e_general:
-        logger.error(f"Error inesperado analizando Java en {ruta_archivo_rel}", exc_info=True)
-        return None
 
-    # Clasificar los imports únicos encontrados
-    for import_path in sorted(list(imports_encontrados)):
-         dependencia = clasificar_dependencia_java(import_path)
-         dependencias_clasificadas.append(dependencia)
+    dependencias_clasificadas: List[DependencyInfo] = []
+    vistas: Set[tuple] = set()
+    for importacion in sorted(cabecera.imports, key=lambda i: i.nombre):
+        logger.debug(f"  -> Import encontrado: '{importacion.nombre}'")
+        archivos = indice.resolver_import(importacion)
+        if archivos:
+            logger.debug(f"  -> Clasificado como INTERNA: {archivos}")
+        candidatas = [DependencyInfo(type='internal', path=archivo) for archivo in archivos if archivo != ruta_archivo_rel] \
+            if archivos else [clasificar_dependencia_java(importacion.nombre)]
+        for dependencia in candidatas:
+            clave = (dependencia['type'], dependencia['path'])
+            if clave not in vistas:
+                vistas.add(clave)
+                dependencias_clasificadas.append(dependencia)
 
-    # La ordenación final ya la hace obtener_dependencias si se quisiera
-    # dependencias_clasificadas.sort(key=lambda x: (x['type'], x['path']))
     logger.debug(f"Dependencias Java finales clasificadas: {dependencias_clasificadas}")
-    return dependencias_clasificadas
\ No newline at end of file
+    return dependencias_clasificadas
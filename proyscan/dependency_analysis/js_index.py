@@ -0,0 +1,303 @@
+# proyscan/dependency_analysis/js_index.py
+# Índice de módulos JavaScript/TypeScript del proyecto: se construye una vez por escaneo a partir
+# de la lista de archivos, los tsconfig.json/jsconfig.json (baseUrl, paths, extends) y los
+# package.json (name, exports, main) del proyecto, y resuelve cada especificador como lo haría
+# Node/TypeScript (sin extensión, index.*, alias de `paths`, paquetes del monorepo) con búsquedas
+# en diccionario memoizadas, sin probar rutas contra el disco.
+import os
+import re
+import json
+import logging
+import posixpath
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple, Union
+
+logger = logging.getLogger(__name__) # Usa 'proyscan.dependency_analysis.js_index'
+
+# Extensiones que se prueban para un especificador sin extensión, por prioridad
+EXTENSIONES_MODULO = ('.ts', '.tsx', '.d.ts', '.js', '.jsx', '.mjs', '.cjs', '.mts', '.cts', '.json')
+# En código TypeScript './a.js' apunta a 'a.ts' (la extensión es la del archivo compilado)
+EQUIVALENTES_TS = {'.js': ('.ts', '.tsx', '.d.ts'), '.jsx': ('.tsx',), '.mjs': ('.mts',), '.cjs': ('.cts',)}
+NOMBRES_CONFIGURACION_TS = ('tsconfig.json', 'jsconfig.json') # tsconfig tiene prioridad en el mismo directorio
+NOMBRE_PACKAGE_JSON = 'package.json'
+# Condiciones de `exports` que se aceptan, por prioridad
+CONDICIONES_EXPORTS = ('types', 'import', 'module', 'browser', 'require', 'node', 'default')
+MAX_NIVELES_EXTENDS = 10
+
+_PRIORIDAD_EXTENSION = {extension: i for i, extension in enumerate(EXTENSIONES_MODULO)}
+# JSON con comentarios y comas finales (formato de tsconfig.json)
+_RUIDO_JSONC = re.compile(r'("(?:\\.|[^"\\])*")|//[^\n]*|/\*[\s\S]*?\*/|,(?=\s*[}\]])')
+
+
+def es_configuracion_js(ruta: str) -> bool:
+    """True si el archivo influye en la resolución de imports JS/TS (tsconfig, jsconfig, package.json)."""
+    nombre = ruta.rpartition('/')[2]
+    return nombre in NOMBRES_CONFIGURACION_TS or nombre == NOMBRE_PACKAGE_JSON
+
+
+class PatronRuta(NamedTuple):
+    """Clave de `paths` o de `exports`: 'exacta' o 'prefijo*sufijo', con sus destinos."""
+    prefijo: str
+    sufijo: Optional[str] # None = patrón exacto (sin '*')
+    destinos: List[str] # Rutas del proyecto; pueden llevar un '*'
+
+    def sustituir(self, especificador: str) -> Optional[List[str]]:
+        if self.sufijo is None:
+            return self.destinos if especificador == self.prefijo else None
+        if len(especificador) < len(self.prefijo) + len(self.sufijo) or not especificador.startswith(self.prefijo) or not especificador.endswith(self.sufijo):
+            return None
+        comodin = especificador[len(self.prefijo):len(especificador) - len(self.sufijo)]
+        return [destino.replace('*', comodin, 1) for destino in self.destinos]
+
+
+class ConfiguracionTs(NamedTuple):
+    base_url: Optional[str] # Directorio del proyecto ('' = raíz) o None si no hay baseUrl
+    rutas: List[PatronRuta] # Ordenados de mayor a menor prefijo (como TypeScript)
+
+
+class PaqueteJs(NamedTuple):
+    directorio: str
+    entrada: Optional[str] # Ruta del proyecto (puede no tener extensión) o None
+    exports: List[PatronRuta] # Subrutas './x' de `exports`, sin el './'
+
+
+def _unir(directorio: str, ruta: str) -> Optional[str]:
+    """Une y normaliza una ruta relativa al proyecto; None si sale de la raíz."""
+    unida = posixpath.normpath(posixpath.join(directorio, ruta)) if directorio else posixpath.normpath(ruta)
+    if unida == '.':
+        return ''
+    if unida == '..' or unida.startswith(('../', '/')):
+        return None
+    return unida
+
+
+def _patron(clave: str, destinos: List[str]) -> Optional[PatronRuta]:
+    if clave.count('*') > 1:
+        return None
+    prefijo, comodin, sufijo = clave.partition('*')
+    return PatronRuta(prefijo, sufijo if comodin else None, destinos)
+
+
+def _destino_exports(valor: Union[str, list, dict, None]) -> Optional[str]:
+    """Primer destino de un valor de `exports` (cadena, lista de alternativas o mapa de condiciones)."""
+    if isinstance(valor, str):
+        return valor
+    if isinstance(valor, list):
+        return next((d for d in map(_destino_exports, valor) if d), None)
+    if isinstance(valor, dict):
+        return next((d for d in (_destino_exports(valor[c]) for c in CONDICIONES_EXPORTS if c in valor) if d), None)
+    return None
+
+
+class IndiceModulosJs:
+    """
+    Mapea rutas de módulo sin extensión ('src/utils') y directorios ('src/componentes', por su
+    index.*) al archivo que los implementa, y sabe qué tsconfig/jsconfig se aplica a cada
+    directorio. Los especificadores relativos se resuelven contra el archivo que importa; los
+    demás, por `paths`, `baseUrl` y los paquetes del propio proyecto (monorepos).
+    """
+
+    def __init__(self, archivos_proyecto: Iterable[str], directorio_proyecto: str):
+        self.archivos: Set[str] = archivos_proyecto if isinstance(archivos_proyecto, set) else set(archivos_proyecto)
+        self.directorio = directorio_proyecto
+        self._modulos: Dict[str, str] = {}
+        self._indices: Dict[str, str] = {}
+        prioridades: Dict[str, int] = {}
+        configuraciones: Dict[str, str] = {} # directorio -> tsconfig/jsconfig
+        paquetes_json: List[str] = []
+        for ruta in self.archivos:
+            directorio, _, nombre = ruta.rpartition('/')
+            if nombre in NOMBRES_CONFIGURACION_TS:
+                if nombre == NOMBRES_CONFIGURACION_TS[0] or directorio not in configuraciones:
+                    configuraciones[directorio] = ruta
+            elif nombre == NOMBRE_PACKAGE_JSON:
+                paquetes_json.append(ruta)
+            extension = '.d.ts' if nombre.endswith('.d.ts') else os.path.splitext(nombre)[1]
+            prioridad = _PRIORIDAD_EXTENSION.get(extension)
+            if prioridad is None:
+                continue
+            modulo = ruta[:-len(extension)]
+            if prioridad < prioridades.get(modulo, len(EXTENSIONES_MODULO)):
+                prioridades[modulo] = prioridad
+                self._modulos[modulo] = ruta
+                if nombre[:-len(extension)] == 'index':
+                    self._indices[directorio] = ruta
+
+        self._configuraciones: Dict[str, ConfiguracionTs] = {}
+        for directorio, ruta in configuraciones.items():
+            configuracion = self._leer_configuracion_ts(ruta, 0)
+            if configuracion:
+                self._configuraciones[directorio] = configuracion
+        self._paquetes: Dict[str, PaqueteJs] = {}
+        self._entradas_directorio: Dict[str, str] = {}
+        for ruta in sorted(paquetes_json):
+            self._leer_package_json(ruta)
+
+        self._cache_configuracion: Dict[str, Optional[ConfiguracionTs]] = {}
+        self._cache: Dict[Tuple[str, str, bool], Optional[str]] = {}
+        logger.debug(f"Índice JS/TS: {len(self._modulos)} módulos, {len(self._configuraciones)} tsconfig/jsconfig, {len(self._paquetes)} paquetes.")
+
+    def __len__(self) -> int:
+        return len(self._modulos)
+
+    # --- Lectura de configuración ---
+
+    def _leer_json(self, ruta: str) -> Optional[dict]:
+        try:
+            with open(os.path.join(self.directorio, ruta), 'r', encoding='utf-8-sig', errors='replace') as f:
+                texto = f.read()
+            datos = json.loads(_RUIDO_JSONC.sub(lambda m: m.group(1) or '', texto))
+        except (OSError, ValueError) as e:
+            logger.debug(f"No se pudo leer '{ruta}' para la resolución JS/TS: {e}")
+            return None
+        return datos if isinstance(datos, dict) else None
+
+    def _leer_configuracion_ts(self, ruta: str, nivel: int) -> Optional[ConfiguracionTs]:
+        """baseUrl y paths de un tsconfig/jsconfig, heredando de `extends` (solo archivos del proyecto)."""
+        datos = self._leer_json(ruta)
+        if datos is None:
+            return None
+        directorio = ruta.rpartition('/')[0]
+        heredada: Optional[ConfiguracionTs] = None
+        extends = datos.get('extends')
+        for base in ([extends] if isinstance(extends, str) else extends if isinstance(extends, list) else []):
+            if nivel >= MAX_NIVELES_EXTENDS or not isinstance(base, str) or not base.startswith('.'):
+                continue # Configuraciones de node_modules ('@tsconfig/node18') quedan fuera del escaneo
+            ruta_base = _unir(directorio, base)
+            if ruta_base is not None and ruta_base not in self.archivos and ruta_base + '.json' in self.archivos:
+                ruta_base += '.json'
+            if ruta_base in self.archivos:
+                heredada = self._leer_configuracion_ts(ruta_base, nivel + 1) or heredada
+
+        opciones = datos.get('compilerOptions')
+        opciones = opciones if isinstance(opciones, dict) else {}
+        base_url = _unir(directorio, opciones['baseUrl']) if isinstance(opciones.get('baseUrl'), str) else (heredada.base_url if heredada else None)
+        paths = opciones.get('paths')
+        if not isinstance(paths, dict):
+            return ConfiguracionTs(base_url, heredada.rutas if heredada else [])
+        # Los destinos de `paths` son relativos a baseUrl o, sin él, al archivo que declara `paths`
+        base_destinos = base_url if base_url is not None else directorio
+        rutas: List[PatronRuta] = []
+        for clave, destinos in paths.items():
+            destinos = [d for d in (_unir(base_destinos, destino) for destino in destinos if isinstance(destino, str)) if d is not None] if isinstance(destinos, list) else []
+            patron = _patron(clave, destinos)
+            if patron and destinos:
+                rutas.append(patron)
+        rutas.sort(key=lambda patron: (patron.sufijo is not None, -len(patron.prefijo)))
+        return ConfiguracionTs(base_url, rutas)
+
+    def _leer_package_json(self, ruta: str):
+        datos = self._leer_json(ruta)
+        if datos is None:
+            return
+        directorio = ruta.rpartition('/')[0]
+        exports = datos.get('exports')
+        subrutas: List[PatronRuta] = []
+        entrada: Optional[str] = None
+        if isinstance(exports, dict) and any(clave.startswith('.') for clave in exports):
+            for clave, valor in exports.items():
+                destino = _destino_exports(valor)
+                destino = _unir(directorio, destino) if destino else None
+                if destino is None:
+                    continue
+                if clave == '.':
+                    entrada = destino
+                elif clave.startswith('./'):
+                    patron = _patron(clave[2:], [destino])
+                    if patron:
+                        subrutas.append(patron)
+        else:
+            destino = _destino_exports(exports)
+            entrada = _unir(directorio, destino) if destino else None
+        if entrada is None:
+            campo = next((datos[c] for c in ('types', 'module', 'main') if isinstance(datos.get(c), str)), None)
+            entrada = _unir(directorio, campo) if campo else None
+        subrutas.sort(key=lambda patron: (patron.sufijo is not None, -len(patron.prefijo)))
+        if entrada is not None:
+            self._entradas_directorio[directorio] = entrada
+        nombre = datos.get('name')
+        if isinstance(nombre, str) and nombre:
+            if nombre in self._paquetes:
+                logger.debug(f"Paquete '{nombre}' declarado en '{self._paquetes[nombre].directorio}' y '{directorio}'; se usa el primero.")
+            else:
+                self._paquetes[nombre] = PaqueteJs(directorio, entrada, subrutas)
+
+    def _configuracion(self, directorio: str) -> Optional[ConfiguracionTs]:
+        """tsconfig/jsconfig más cercano hacia la raíz (memoizado por directorio)."""
+        if directorio not in self._cache_configuracion:
+            configuracion = self._configuraciones.get(directorio)
+            if configuracion is None and directorio:
+                configuracion = self._configuracion(directorio.rpartition('/')[0])
+            self._cache_configuracion[directorio] = configuracion
+        return self._cache_configuracion[directorio]
+
+    # --- Resolución ---
+
+    def _archivo(self, ruta: str, desde_typescript: bool) -> Optional[str]:
+        """Archivo para `ruta`: tal cual, con extensión, su equivalente TS, o su directorio."""
+        if ruta in self.archivos:
+            return ruta
+        archivo = self._modulos.get(ruta)
+        if archivo:
+            return archivo
+        base, extension = posixpath.splitext(ruta)
+        if desde_typescript and extension in EQUIVALENTES_TS:
+            archivo = next((base + e for e in EQUIVALENTES_TS[extension] if base + e in self.archivos), None)
+            if archivo:
+                return archivo
+        entrada = self._entradas_directorio.get(ruta)
+        if entrada is not None and entrada != ruta:
+            archivo = entrada if entrada in self.archivos else self._modulos.get(entrada) or self._indices.get(entrada)
+            if archivo:
+                return archivo
+        return self._indices.get(ruta)
+
+    def _resolver_paquete(self, especificador: str, desde_typescript: bool) -> Optional[str]:
+        """'@acme/utils' o '@acme/utils/fecha' declarado en un package.json del proyecto."""
+        partes = especificador.split('/')
+        corte = 2 if especificador.startswith('@') else 1
+        paquete = self._paquetes.get('/'.join(partes[:corte]))
+        if paquete is None:
+            return None
+        subruta = '/'.join(partes[corte:])
+        if not subruta:
+            return self._archivo(paquete.entrada, desde_typescript) if paquete.entrada is not None else self._archivo(paquete.directorio, desde_typescript)
+        for patron in paquete.exports:
+            destinos = patron.sustituir(subruta)
+            if destinos:
+                return next((a for a in (self._archivo(d, desde_typescript) for d in destinos) if a), None)
+        if paquete.exports:
+            return None # `exports` cierra las subrutas no declaradas
+        destino = _unir(paquete.directorio, subruta)
+        return self._archivo(destino, desde_typescript) if destino is not None else None
+
+    def resolver(self, especificador: str, ruta_archivo_rel: str) -> Optional[str]:
+        """Archivo del proyecto al que apunta un import de `ruta_archivo_rel`, o None."""
+        directorio = ruta_archivo_rel.rpartition('/')[0]
+        desde_typescript = ruta_archivo_rel.endswith(('.ts', '.tsx', '.mts', '.cts', '.vue'))
+        # El resultado depende de si importa código TypeScript ('./a.js' -> a.ts): forma parte de la clave
+        clave = (directorio, especificador, desde_typescript)
+        if clave in self._cache:
+            return self._cache[clave]
+        especificador_limpio = especificador.split('?')[0].split('#')[0]
+        resuelto: Optional[str] = None
+        if especificador_limpio.startswith(('./', '../')) or especificador_limpio in ('.', '..'):
+            ruta = _unir(directorio, especificador_limpio)
+            resuelto = self._archivo(ruta, desde_typescript) if ruta is not None else None
+        elif especificador_limpio.startswith('/'):
+            ruta = _unir('', especificador_limpio[1:])
+            resuelto = self._archivo(ruta, desde_typescript) if ruta is not None else None
+        elif especificador_limpio:
+            configuracion = self._configuracion(directorio)
+            if configuracion:
+                for patron in configuracion.rutas:
+                    destinos = patron.sustituir(especificador_limpio)
+                    if destinos is not None:
+                        resuelto = next((a for a in (self._archivo(d, desde_typescript) for d in destinos) if a), None)
+                        break # TypeScript solo prueba el patrón más específico
+                if resuelto is None and configuracion.base_url is not None:
+                    ruta = _unir(configuracion.base_url, especificador_limpio)
+                    resuelto = self._archivo(ruta, desde_typescript) if ruta is not None else None
+            if resuelto is None:
+                resuelto = self._resolver_paquete(especificador_limpio, desde_typescript)
+        self._cache[clave] = resuelto
+        return resuelto
@@ -0,0 +1,236 @@
+# proyscan/dependency_analysis/js_parser.py
+# Extractor de imports para JavaScript/TypeScript (y JSX/TSX) en una sola pasada sobre el texto.
+# Una regex de prefijo literal localiza las palabras clave candidatas (import, export, require,
+# import(), new Worker, importScripts, fetch) y un análisis léxico perezoso, que avanza a la par,
+# descarta las que caen dentro de comentarios, cadenas, plantillas o regex literales. El análisis
+# léxico solo llega hasta el último candidato: un archivo sin candidatos no se tokeniza.
+import re
+import heapq
+import logging
+from typing import List, Optional, Set, Tuple
+
+from ..models import DependencyInfo
+from .regex_parser import MAX_CLAUSULA, clasificar_referencias
+from .js_index import IndiceModulosJs
+from .reference_cache import CacheReferencias
+
+logger = logging.getLogger(__name__) # Usa 'proyscan.dependency_analysis.js_parser'
+
+# Candidatos: cada palabra se busca como literal (el motor de regex la localiza mucho más rápido
+# que una alternancia) y solo se aceptan si el análisis léxico confirma que están en código (no
+# en un comentario, cadena, plantilla o regex literal). 'import' cubre también importScripts.
+_CANDIDATOS = tuple(re.compile(re.escape(palabra)) for palabra in ('import', 'export', 'require', 'fetch', 'Worker', '///'))
+_NEW_ANTES_DE_WORKER = re.compile(r"new\s+(?:Shared)?\Z")
+# Región que no es código, desde su primer carácter (bucles "desenrollados": cada tramo sin escapes
+# es una sola repetición de clase de caracteres, mucho más rápida en el motor de regex)
+_CADENAS_Y_COMENTARIOS = r"""'[^'\\\n]*(?:\\[\s\S][^'\\\n]*)*'|"[^"\\\n]*(?:\\[\s\S][^"\\\n]*)*"|/\*[^*]*\*+(?:[^/*][^*]*\*+)*/"""
+_REGION = re.compile(rf"""{_CADENAS_Y_COMENTARIOS}|//[^\n]*|/\*[\s\S]*""")
+# Salto de código corriente, cadenas y comentarios completos en una sola llamada al motor de regex.
+# Se detiene en '`', en un '/' suelto, en una cadena o comentario que no se cierra antes del límite
+# (p. ej. porque contiene la posición consultada) y, dentro de ${...}, en las llaves.
+_SALTO = re.compile(rf"""(?:[^'"`/]+|{_CADENAS_Y_COMENTARIOS}|//[^\n]*(?=\n))*""")
+_SALTO_EN_PLANTILLA = re.compile(rf"""(?:[^'"`/{{}}]+|{_CADENAS_Y_COMENTARIOS}|//[^\n]*(?=\n))*""")
+_CUERPO_PLANTILLA = re.compile(r"[^`\\$]*(?:(?:\\[\s\S]|\$(?!\{))[^`\\$]*)*")
+_REGEX_LITERAL = re.compile(r"/(?:[^/\\\[\n]|\\.|\[(?:[^\]\\\n]|\\.)*\])+/")
+
+# Especificador: cadena simple o plantilla sin sustituciones
+_ESPECIFICADOR = r"""\s*(?:'([^'\\\n]+)'|"([^"\\\n]+)"|`([^`\\$]+)`)"""
+# Cláusula entre import/export y 'from' (puede llevar comentarios); no cruza otro import/export
+_CLAUSULA = rf"""(?:(?!\b(?:import|export)\b)[\w$*{{}},\s]|//[^\n]*|/\*(?:[^*]|\*(?!/))*\*/){{0,{MAX_CLAUSULA}}}?"""
+_TRAS_IMPORT = re.compile(rf"""
+    \s*\(\s*{_ESPECIFICADOR}                  # import('x')
+  | {_ESPECIFICADOR}                          # import 'x'
+  | \s*(?=[\w$*{{]){_CLAUSULA}\bfrom{_ESPECIFICADOR}  # import a, {{ b }} from 'x'
+""", re.VERBOSE)
+_TRAS_EXPORT = re.compile(rf"""\s*(?=type\b|[*{{]){_CLAUSULA}\bfrom{_ESPECIFICADOR}""", re.VERBOSE)
+_TRAS_LLAMADA = { # require('x'), fetch('x', ...), importScripts('x'), new Worker('x') / new Worker(new URL('x', ...))
+    'require': re.compile(rf"""\s*\({_ESPECIFICADOR}\s*\)"""),
+    'importScripts': re.compile(rf"""\s*\({_ESPECIFICADOR}\s*[,)]"""),
+    'fetch': re.compile(rf"""\s*\({_ESPECIFICADOR}\s*[,)]"""),
+    'Worker': re.compile(rf"""\s*\(\s*(?:new\s+URL\s*\()?{_ESPECIFICADOR}\s*[,)]"""),
+}
+_REFERENCIA_TS = re.compile(r"""///\s*<reference\s+path\s*=\s*["']([^"']+)["']\s*/>""", re.I)
+
+# Tras estas palabras un '/' abre una regex literal; tras otro identificador es una división
+_PALABRAS_ANTES_DE_REGEX = {
+    'return', 'typeof', 'instanceof', 'in', 'of', 'new', 'delete', 'void', 'throw',
+    'case', 'do', 'else', 'yield', 'await',
+}
+
+
+def _abre_regex(texto: str, posicion: int) -> bool:
+    """Decide si el '/' en `posicion` empieza una regex literal mirando el token anterior."""
+    j = posicion - 1
+    while j >= 0 and texto[j] in ' \t\r\n':
+        j -= 1
+    if j < 0:
+        return True
+    anterior = texto[j]
+    if anterior in ')]}<': # Fin de expresión, o '</' de una etiqueta JSX
+        return False
+    if anterior.isalnum() or anterior in '_$':
+        k = j
+        while k >= 0 and (texto[k].isalnum() or texto[k] in '_$'):
+            k -= 1
+        return texto[k + 1:j + 1] in _PALABRAS_ANTES_DE_REGEX
+    return True
+
+
+def _es_acceso_a_propiedad(texto: str, posicion: int) -> bool:
+    """True si la palabra en `posicion` va tras un '.' (obj.require, api?.fetch, cadenas de llamadas), salvo el spread '...'."""
+    j = posicion - 1
+    while j >= 0 and texto[j] in ' \t\r\n':
+        j -= 1
+    return j >= 0 and texto[j] == '.' and texto[max(0, j - 2):j + 1] != '...'
+
+
+class _AnalisisLexico:
+    """
+    Recorre el texto hacia delante, de región no-código en región no-código, solo hasta donde
+    se le pregunta. Todo lo anterior a `posicion` ya está clasificado.
+    """
+
+    def __init__(self, texto: str):
+        self.texto = texto
+        self.posicion = 0
+        self.llaves_plantillas: List[int] = [] # Profundidad de llaves de cada ${...} abierto
+
+    def _cuerpo_plantilla(self, desde: int) -> int:
+        """Salta el texto de una plantilla desde `desde`; abre ${...} o la cierra."""
+        texto = self.texto
+        posicion = _CUERPO_PLANTILLA.match(texto, desde).end()
+        if texto.startswith('${', posicion):
+            self.llaves_plantillas.append(1)
+            return posicion + 2
+        return posicion + 1 # Cierre de la plantilla (o fin del texto)
+
+    def en_codigo(self, objetivo: int) -> bool:
+        """True si la posición `objetivo` (>= a la de la consulta anterior) está en código."""
+        texto = self.texto
+        while self.posicion < objetivo:
+            salto = _SALTO_EN_PLANTILLA if self.llaves_plantillas else _SALTO
+            inicio = salto.match(texto, self.posicion, objetivo).end()
+            if inicio >= objetivo:
+                self.posicion = objetivo
+                break
+            caracter = texto[inicio]
+            if caracter == '`':
+                self.posicion = self._cuerpo_plantilla(inicio + 1)
+            elif caracter == '{':
+                self.llaves_plantillas[-1] += 1
+                self.posicion = inicio + 1
+            elif caracter == '}':
+                self.llaves_plantillas[-1] -= 1
+                self.posicion = inicio + 1
+                if self.llaves_plantillas[-1] == 0:
+                    self.llaves_plantillas.pop() # Fin de ${...}: sigue el cuerpo de la plantilla
+                    self.posicion = self._cuerpo_plantilla(inicio + 1)
+            else:
+                region = _REGION.match(texto, inicio) # Cadena o comentario que llega hasta el objetivo (o más)
+                if region:
+                    self.posicion = region.end()
+                elif caracter == '/' and _abre_regex(texto, inicio): # '/' suelto: regex literal o división
+                    regex_literal = _REGEX_LITERAL.match(texto, inicio)
+                    self.posicion = regex_literal.end() if regex_literal else inicio + 1
+                else: # División, o comilla sin cerrar en su línea
+                    self.posicion = inicio + 1
+        return self.posicion == objetivo
+
+    def saltar_hasta(self, posicion: int):
+        """Marca como ya analizado (código) el texto hasta `posicion`."""
+        self.posicion = max(self.posicion, posicion)
+
+
+def extraer_especificadores_js(texto: str, lenguaje: str) -> List[Tuple[str, str]]:
+    """
+    Devuelve, en orden de aparición, (palabra, ruta) de import/export ... from/require/import()
+    dinámico/new Worker/importScripts/fetch (y `/// <reference path>` en TypeScript), donde
+    palabra es 'import', 'export', 'require', 'Worker', 'importScripts', 'fetch' o 'reference'.
+    """
+    especificadores: List[Tuple[str, str]] = []
+    es_typescript = lenguaje in ('typescript', 'tsx')
+    lexico = _AnalisisLexico(texto)
+    candidatos = heapq.merge(*(patron.finditer(texto) for patron in _CANDIDATOS), key=lambda c: c.start())
+    for candidato in candidatos:
+        inicio = candidato.start()
+        elemento = candidato.group()
+        if elemento == 'Worker': # Solo cuenta como 'new Worker' / 'new SharedWorker'
+            new = _NEW_ANTES_DE_WORKER.search(texto, max(0, inicio - 64), inicio)
+            if new is None:
+                continue
+            inicio = new.start()
+        elif elemento == 'import' and texto.startswith('importScripts', inicio):
+            elemento = 'importScripts'
+        if inicio < lexico.posicion or not lexico.en_codigo(inicio):
+            continue
+        if elemento == '///': # Comentario triple: referencia TS o nada
+            fin_linea = texto.find('\n', inicio)
+            fin_linea = len(texto) if fin_linea < 0 else fin_linea
+            referencia = _REFERENCIA_TS.match(texto, inicio, fin_linea) if es_typescript else None
+            if referencia:
+                especificadores.append(('reference', referencia.group(1)))
+            lexico.saltar_hasta(fin_linea)
+            continue
+        # Descartar si forma parte de otro identificador o si es un acceso a propiedad (obj.require('x'))
+        fin = candidato.end() if elemento == 'Worker' else inicio + len(elemento)
+        anterior = texto[inicio - 1] if inicio else ' '
+        siguiente = texto[fin] if fin < len(texto) else ' '
+        if anterior.isalnum() or anterior in '_$' or siguiente.isalnum() or siguiente in '_$':
+            continue
+        if _es_acceso_a_propiedad(texto, inicio):
+            continue
+        if elemento == 'import' or elemento == 'export':
+            tras = (_TRAS_IMPORT if elemento == 'import' else _TRAS_EXPORT).match(texto, fin)
+        else:
+            tras = _TRAS_LLAMADA[elemento].match(texto, fin)
+        if tras:
+            especificadores.append((elemento, next(grupo for grupo in tras.groups() if grupo is not None)))
+            lexico.saltar_hasta(tras.end())
+    return especificadores
+
+
+# Palabras cuya ruta es un especificador de módulo (se resuelve con el índice); el resto son URLs o rutas
+PALABRAS_MODULO = ('import', 'export', 'require')
+
+
+def analizar_js(
+    contenido_lineas: List[str],
+    lenguaje: str,
+    ruta_archivo_rel: str,
+    indice: IndiceModulosJs,
+    referencias: CacheReferencias
+) -> Optional[List[DependencyInfo]]:
+    """
+    Analiza dependencias de JS/TS/JSX/TSX con el extractor de una sola pasada. Los especificadores
+    de módulo se resuelven con el índice del proyecto (sin extensión, index.*, tsconfig paths...);
+    los que no resuelve y no son relativos ('react', 'lodash/fp') se clasifican como `library`.
+    """
+    logger.debug(f"--- Iniciando análisis JS para {ruta_archivo_rel} (Lenguaje: {lenguaje}) ---")
+    contenido_completo = "\n".join(contenido_lineas)
+    if not contenido_completo.strip(): return []
+
+    internas: Set[str] = set()
+    bibliotecas: Set[str] = set()
+    otras: Set[str] = set() # URLs, rutas de fetch/Worker y referencias relativas rotas
+    for palabra, especificador in extraer_especificadores_js(contenido_completo, lenguaje):
+        especificador = especificador.strip()
+        if not especificador:
+            continue
+        if palabra not in PALABRAS_MODULO:
+            otras.add(especificador)
+            continue
+        resuelto = indice.resolver(especificador, ruta_archivo_rel)
+        if resuelto:
+            internas.add(resuelto)
+        elif especificador.startswith(('.', '/')) or ':' in especificador:
+            otras.add(especificador) # Relativa sin archivo (internal_broken), URL o 'node:fs'
+        else:
+            bibliotecas.add(especificador)
+    logger.debug(f"Dependencias crudas encontradas ({lenguaje}): internas={internas}, bibliotecas={bibliotecas}, otras={otras}")
+
+    dependencias = {(dep['type'], dep['path']) for dep in clasificar_referencias(otras, ruta_archivo_rel, referencias)}
+    dependencias.update(('internal', ruta) for ruta in internas)
+    dependencias.update(('library', nombre) for nombre in bibliotecas)
+    dependencias_clasificadas = [DependencyInfo(type=t, path=p) for t, p in sorted(dependencias)]
+    logger.debug(f"Dependencias JS finales clasificadas ({lenguaje}): {dependencias_clasificadas}")
+    return dependencias_clasificadas
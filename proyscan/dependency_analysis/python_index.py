@@ -0,0 +1,169 @@
+# proyscan/dependency_analysis/python_index.py
+# Índice de módulos Python del proyecto: se construye en una sola pasada sobre los archivos del
+# escaneo y resuelve imports absolutos y relativos con búsquedas en diccionario (memoizadas),
+# en lugar de construir y normalizar rutas candidatas para cada import.
+import os
+import logging
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__) # Usa 'proyscan.dependency_analysis.python_index'
+
+# Archivos que marcan la raíz de un (sub)proyecto Python instalable
+MARCADORES_PROYECTO_PYTHON = ('pyproject.toml', 'setup.py', 'setup.cfg')
+NOMBRES_RAIZ_FUENTES = ('src',) # Layout src/: los paquetes se importan sin el prefijo
+
+# Resolución de un import: [(nombre_original, ruta_resuelta | None), ...]
+Resoluciones = List[Tuple[str, Optional[str]]]
+
+class IndiceModulosPython:
+    """
+    Mapea rutas de módulo ('app/models', sin extensión) al archivo que las implementa
+    ('app/models.py' o 'app/models/__init__.py'; el .py tiene prioridad, como hace Python).
+    Detecta además raíces de código fuente (layouts `src/` y subproyectos con pyproject.toml/
+    setup.py) y paquetes de espacio de nombres (directorios con código pero sin __init__.py).
+    Los imports absolutos se buscan primero desde la raíz del proyecto y luego en cada raíz de fuentes.
+    """
+
+    def __init__(self, archivos_proyecto: Iterable[str]):
+        self.archivos: Set[str] = archivos_proyecto if isinstance(archivos_proyecto, set) else set(archivos_proyecto)
+        modulos_py: Dict[str, str] = {}
+        modulos_init: Dict[str, str] = {}
+        directorios_con_codigo: Set[str] = set()
+        marcadores: Set[str] = set()
+        for ruta in self.archivos:
+            directorio, _, nombre = ruta.rpartition('/')
+            if nombre in MARCADORES_PROYECTO_PYTHON and directorio:
+                marcadores.add(directorio) # setup.py también se indexa como módulo, abajo
+            if nombre.endswith('.py'):
+                if nombre == '__init__.py':
+                    modulos_init[directorio] = ruta
+                else:
+                    modulos_py[ruta[:-3]] = ruta
+                while directorio and directorio not in directorios_con_codigo:
+                    directorios_con_codigo.add(directorio)
+                    directorio = directorio.rpartition('/')[0]
+        self._modulos: Dict[str, str] = {**modulos_init, **modulos_py}
+        self._espacios_nombres: Set[str] = directorios_con_codigo - set(modulos_init)
+
+        # Raíces desde las que se resuelven los imports absolutos ('' = raíz del proyecto)
+        raices_fuentes = {
+            directorio for directorio in directorios_con_codigo
+            if directorio not in modulos_init
+            and (directorio.rpartition('/')[2] in NOMBRES_RAIZ_FUENTES or directorio in marcadores)
+        }
+        self.raices: List[str] = [''] + [d + '/' for d in sorted(raices_fuentes, key=lambda d: (d.count('/'), d))]
+        if len(self.raices) > 1:
+            logger.debug(f"Raíces de código Python detectadas: {self.raices[1:]}")
+
+        self._cache_base: Dict[Tuple[str, int, str], Tuple[Optional[str], Optional[str]]] = {}
+        self._cache_directorio: Dict[Tuple[str, int], Optional[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._modulos)
+
+    # --- Búsquedas básicas ---
+
+    def _directorio_base(self, directorio_actual: str, nivel: int) -> Optional[str]:
+        """
+        Directorio desde el que se resuelve un import relativo de `nivel` puntos, o None si sube
+        por encima de la raíz. '.' representa un archivo en la raíz (sin paquete padre): sus
+        imports de nivel 1 no se resuelven.
+        """
+        clave = (directorio_actual, nivel)
+        if clave not in self._cache_directorio:
+            directorio: Optional[str] = directorio_actual
+            for _ in range(nivel - 1):
+                padre = os.path.dirname(directorio)
+                if padre == directorio:
+                    directorio = None
+                    break
+                directorio = padre
+            self._cache_directorio[clave] = directorio
+        return self._cache_directorio[clave]
+
+    def _buscar(self, directorio: str, partes: str) -> Optional[str]:
+        """Módulo `partes` ('a/b') bajo `directorio` ('' = raíz)."""
+        if directorio == '.':
+            return None # Import relativo desde un archivo de la raíz: no tiene paquete padre
+        return self._modulos.get(f"{directorio}/{partes}" if directorio else partes)
+
+    def _resolver_base(self, modulo_base: str, nivel: int, directorio: str) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Resuelve el módulo base de un import (memoizado por módulo, nivel y directorio del paquete).
+        Devuelve (archivo | None, directorio del espacio de nombres | None) donde el segundo valor solo
+        se rellena si el módulo es un paquete de espacio de nombres (sin archivo propio).
+        """
+        clave = (modulo_base, nivel, directorio)
+        resultado = self._cache_base.get(clave)
+        if resultado is None:
+            partes = modulo_base.replace('.', '/')
+            if nivel == 0:
+                bases = self.raices
+                archivo = next((a for a in (self._modulos.get(raiz + partes) for raiz in bases) if a), None)
+            else:
+                bases = [] if directorio == '.' else [f"{directorio}/" if directorio else '']
+                archivo = self._buscar(directorio, partes)
+            espacio = None
+            if archivo is None:
+                espacio = next((base + partes for base in bases if base + partes in self._espacios_nombres), None)
+            resultado = (archivo, espacio)
+            self._cache_base[clave] = resultado
+        return resultado
+
+    # --- API para el parser ---
+
+    def resolver_import(
+        self,
+        modulo_base: str, # Ej: 'os', '', 'config', 'mi_app.utils' -> El módulo base del from/import (sin puntos iniciales)
+        nombres_importados: List[str], # Ej: ['path'], ['settings'], ['*']
+        nivel_relativo: int,
+        ruta_archivo_actual_rel: str
+    ) -> Resoluciones:
+        """
+        Resuelve un import a rutas del proyecto. Devuelve [(nombre_original, ruta_resuelta | None), ...]
+        (una tupla por nombre importado, así 'from . import a, b' resuelve cada uno).
+        """
+        puntos = '.' * nivel_relativo
+        directorio = ''
+        if nivel_relativo > 0:
+            directorio_base = self._directorio_base(os.path.dirname(ruta_archivo_actual_rel) or '.', nivel_relativo)
+            if directorio_base is None:
+                logger.warning(f"Import relativo nivel {nivel_relativo} desde '{ruta_archivo_actual_rel}' parece exceder la raíz.")
+                return [(f"{puntos}{modulo_base}.{nombre}" if modulo_base else f"{puntos}{nombre}", None) for nombre in nombres_importados]
+            directorio = directorio_base
+
+        if modulo_base:
+            archivo, espacio = self._resolver_base(modulo_base, nivel_relativo, directorio)
+            resoluciones: Resoluciones = []
+            for nombre in nombres_importados:
+                nombre_original = f"{puntos}{modulo_base}.{nombre}" if nombre != '*' else f"{puntos}{modulo_base}"
+                if archivo is None and espacio is not None and nombre != '*':
+                    # Paquete de espacio de nombres: cada nombre importado solo puede ser un submódulo
+                    resoluciones.append((nombre_original, self._modulos.get(f"{espacio}/{nombre}")))
+                else:
+                    resoluciones.append((nombre_original, archivo))
+            return resoluciones
+
+        if nivel_relativo > 0: # 'from . import a, b': cada nombre es un módulo del directorio base
+            resoluciones = []
+            for nombre in nombres_importados:
+                if nombre == '*': # 'from . import *' es difícil de resolver estáticamente
+                    logger.warning(f"No se puede resolver 'from . import *' en {ruta_archivo_actual_rel}")
+                    resoluciones.append((f"{puntos}*", None))
+                    continue
+                resoluciones.append((f"{puntos}{nombre}", self._resolver_base(nombre, nivel_relativo, directorio)[0]))
+            return resoluciones
+
+        logger.error(f"Caso de importación no manejado: Mod='{modulo_base}', Nivel={nivel_relativo}, Nombres={nombres_importados}")
+        return [(nombre, None) for nombre in nombres_importados]
+
+    def submodulo_de_paquete(self, nombre_original: str, ruta_paquete: str) -> Optional[str]:
+        """
+        Para 'from app import models' resuelto a 'app/__init__.py', devuelve 'app/models.py' si existe
+        (en la misma raíz de fuentes que el paquete), para que el índice inverso apunte al submódulo.
+        """
+        partes = nombre_original.replace('.', '/') + '.py'
+        for raiz in self.raices:
+            if ruta_paquete.startswith(raiz) and raiz + partes in self.archivos:
+                return raiz + partes
+        return None
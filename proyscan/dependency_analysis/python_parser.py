@@ -1,24 +1,28 @@
 # proyscan/dependency_analysis/python_parser.py
 import ast
-import os
 import logging
 from typing import List, Set, Dict, Optional, Tuple
 
 # Importar funciones de utilidad y modelos
-# Asegúrate de que path_utils tenga la versión más reciente de resolver_import_python
-from ..utils.path_utils import resolver_import_python, es_stdlib, normalizar_ruta
+from ..utils.path_utils import es_stdlib
 from ..models import DependencyInfo # Usar el TypedDict definido
+from .python_index import IndiceModulosPython
 
 # Obtener logger
 logger = logging.getLogger(__name__) # Usa 'proyscan.dependency_analysis.python_parser'
 
+# Campos de los nodos AST que contienen listas de sentencias (módulo, clases, funciones, if/for/
+# while/with/try/match). Un import siempre es una sentencia, así que basta recorrer estos campos
+# para encontrarlos todos sin descender a expresiones.
+CAMPOS_SENTENCIAS = ('body', 'orelse', 'finalbody', 'handlers', 'cases')
+
 class PythonImportVisitor(ast.NodeVisitor):
     """
     Visita nodos AST para encontrar declaraciones de importación.
     """
-    def __init__(self, ruta_archivo_actual_rel: str, archivos_proyecto: Set[str]):
+    def __init__(self, ruta_archivo_actual_rel: str, indice: IndiceModulosPython):
         self.ruta_actual_rel = ruta_archivo_actual_rel
-        self.archivos_proyecto = archivos_proyecto
+        self.indice = indice
         # Usamos tuplas (type, path) para poder añadirlas a un set y evitar duplicados exactos
         self.dependencias_encontradas: Set[tuple] = set()
         # Guardamos solo el nombre base del módulo externo/stdlib para evitar duplicados como 'os' y 'os.path'
@@ -44,19 +48,16 @@ class PythonImportVisitor(ast.NodeVisitor):
                 # Comprobamos si es un __init__ y si el import original tenía submódulos/nombres
                 # y NO es un import relativo que empiece justo con '.' (ej: from . import utils)
                 if ruta_resuelta_inicial.endswith('/__init__.py') and len(partes_original) > 1 and not nombre_original.startswith('.'):
-                    # Construir ruta al módulo/archivo específico como si fuera absoluto desde raíz
-                    ruta_especifica_tentativa = os.path.join(*partes_original)
-                    # Intentar encontrar .py para esa ruta específica
-                    ruta_especifica_py = normalizar_ruta(ruta_especifica_tentativa + ".py")
+                    # Buscar el módulo específico (app/models.py) en la misma raíz que el paquete
+                    ruta_especifica_py = self.indice.submodulo_de_paquete(nombre_original, ruta_resuelta_inicial)
 
-                    if ruta_especifica_py in self.archivos_proyecto:
+                    if ruta_especifica_py:
                         logger.debug(f"  -> Ajuste Paquete: Usando ruta específica '{ruta_especifica_py}' para índice inverso (encontrada).")
                         ruta_final_a_registrar = ruta_especifica_py # Usar esta para el registro inverso
                     else:
                          # Si no encontramos el archivo .py específico, mantenemos la dependencia
                          # hacia el __init__.py como indicador del paquete.
-                         logger.debug(f"  -> Ajuste Paquete: No se encontró '{ruta_especifica_py}', se mantiene dependencia a '{ruta_resuelta_inicial}'")
-                         # ruta_final_a_registrar ya es ruta_resuelta_inicial
+                         logger.debug(f"  -> Ajuste Paquete: No se encontró el submódulo de '{nombre_original}', se mantiene dependencia a '{ruta_resuelta_inicial}'")
                 # --- FIN AJUSTE ---
 
                 logger.debug(f"  -> Clasificado como INTERNA: '{ruta_final_a_registrar}'")
@@ -91,9 +92,8 @@ class PythonImportVisitor(ast.NodeVisitor):
         for nombre in nombres:
              # Para 'import x', el módulo base es 'x', los nombres importados son irrelevantes aquí
              # pero pasamos una lista con el nombre base para consistencia con la firma de resolver.
-             resoluciones = resolver_import_python(nombre, [nombre], 0, self.ruta_actual_rel, self.archivos_proyecto)
+             resoluciones = self.indice.resolver_import(nombre, [nombre], 0, self.ruta_actual_rel)
              self._procesar_resolucion(resoluciones)
-        self.generic_visit(node) # Continuar visitando hijos si es necesario
 
     def visit_ImportFrom(self, node: ast.ImportFrom):
         """Procesa declaraciones 'from modulo import nombre1, nombre2'."""
@@ -101,16 +101,35 @@ class PythonImportVisitor(ast.NodeVisitor):
         nombres_importados = [alias.name for alias in node.names]
         logger.debug(f"Visitando nodo ImportFrom: Mod='{modulo_base}', Nivel={node.level}, Nombres={nombres_importados}")
 
-        # Llamar a resolver_import_python pasando el módulo base y los nombres específicos
-        resoluciones = resolver_import_python(
+        # Resolver con el índice de módulos pasando el módulo base y los nombres específicos
+        resoluciones = self.indice.resolver_import(
             modulo_base,
             nombres_importados,
             node.level,
-            self.ruta_actual_rel,
-            self.archivos_proyecto
+            self.ruta_actual_rel
         )
         self._procesar_resolucion(resoluciones)
-        self.generic_visit(node)
+
+    def recorrer(self, arbol: ast.AST):
+        """
+        Recorre solo las listas de sentencias del árbol (en orden de documento) y procesa los
+        Import/ImportFrom. Equivale a visit() para los imports pero sin visitar cada expresión.
+        """
+        pendientes = [arbol]
+        while pendientes:
+            nodo = pendientes.pop()
+            if isinstance(nodo, ast.Import):
+                self.visit_Import(nodo)
+                continue
+            if isinstance(nodo, ast.ImportFrom):
+                self.visit_ImportFrom(nodo)
+                continue
+            hijos = []
+            for campo in CAMPOS_SENTENCIAS:
+                sentencias = getattr(nodo, campo, None)
+                if isinstance(sentencias, list):
+                    hijos.extend(sentencias)
+            pendientes.extend(reversed(hijos))
 
     def obtener_dependencias(self) -> List[DependencyInfo]:
         """Construye y devuelve la lista final de dependencias únicas."""
@@ -134,11 +153,11 @@ class PythonImportVisitor(ast.NodeVisitor):
 def analizar_python(
     contenido_lineas: List[str],
     ruta_archivo_rel: str,
-    archivos_proyecto: Set[str]
-    # dir_proyecto_raiz: str # No es necesario si trabajamos con relativas y archivos_proyecto
+    indice: IndiceModulosPython
 ) -> Optional[List[DependencyInfo]]:
     """
     Función principal para analizar dependencias de Python usando AST.
+    Los imports se resuelven con el índice de módulos del escaneo (ver python_index.py).
     """
     logger.debug(f"--- Iniciando análisis Python AST para {ruta_archivo_rel} ---")
     codigo_completo = "\n".join(contenido_lineas)
@@ -148,8 +167,8 @@ def analizar_python(
 
     try:
         arbol_ast = ast.parse(codigo_completo)
-        visitor = PythonImportVisitor(ruta_archivo_rel, archivos_proyecto)
-        visitor.visit(arbol_ast)
+        visitor = PythonImportVisitor(ruta_archivo_rel, indice)
+        visitor.recorrer(arbol_ast)
         return visitor.obtener_dependencias()
     except SyntaxError as e:
         logger.warning(f"Error de sintaxis en {ruta_archivo_rel}, no se analizan dependencias Python. Error: {e}")
@@ -0,0 +1,71 @@
+# proyscan/dependency_analysis/reference_cache.py
+# Caché de resolución de referencias del escaneo (HTML, CSS, JS/TS, PHP y Vue). La resolución de
+# `resolver_ruta_referencia` solo depende del directorio del archivo y de la referencia cruda, y
+# las mismas rutas ('../css/base.css', '/img/logo.png') se repiten en cientos de archivos.
+import functools
+import logging
+import posixpath
+from typing import Any, Dict, Iterable, NamedTuple, Optional, Set, Tuple
+
+from ..utils.path_utils import resolver_referencia_en_directorio, normalizar_ruta
+from ..tracing import obtener_trazador
+
+logger = logging.getLogger(__name__) # Usa 'proyscan.dependency_analysis.reference_cache'
+
+# Entradas por proceso: acota la memoria en monorepos con muchos directorios
+MAX_ENTRADAS_CACHE_REFERENCIAS = 65536
+
+
+class ReferenciaResuelta(NamedTuple):
+    tipo: str # 'url', 'externa', 'absoluta', 'relativa' o 'desconocida' (como resolver_ruta_referencia)
+    ruta: Optional[str] # Ruta normalizada del proyecto si es absoluta/relativa; si no, la referencia
+    en_proyecto: bool # La ruta es un archivo del escaneo
+
+
+class CacheReferencias:
+    """
+    LRU acotada (directorio de origen, referencia cruda) -> ReferenciaResuelta. Las rutas del
+    proyecto se internan en una tabla: las dependencias comparten el mismo objeto str que la
+    lista de archivos y la pertenencia al proyecto se calcula una vez por entrada.
+    """
+
+    def __init__(self, archivos_proyecto: Iterable[str], max_entradas: int = MAX_ENTRADAS_CACHE_REFERENCIAS):
+        self.archivos: Set[str] = archivos_proyecto if isinstance(archivos_proyecto, set) else set(archivos_proyecto)
+        self._rutas_proyecto: Dict[str, str] = {ruta: ruta for ruta in self.archivos}
+        self._resolver = functools.lru_cache(maxsize=max_entradas)(self._resolver_sin_cache)
+        self._volcados: Tuple[int, int] = (0, 0) # (aciertos, fallos) ya sumados a la traza
+
+    def _resolver_sin_cache(self, directorio: str, referencia: str) -> ReferenciaResuelta:
+        tipo, ruta = resolver_referencia_en_directorio(referencia, directorio)
+        if ruta and tipo in ('absoluta', 'relativa'):
+            ruta = normalizar_ruta(ruta)
+            interna = self._rutas_proyecto.get(ruta)
+            return ReferenciaResuelta(tipo, interna or ruta, interna is not None)
+        return ReferenciaResuelta(tipo, ruta, False)
+
+    def resolver(self, referencia: str, ruta_archivo_rel: str) -> ReferenciaResuelta:
+        """Resuelve `referencia` escrita en `ruta_archivo_rel` (relativa a la raíz del proyecto)."""
+        return self._resolver(posixpath.dirname(ruta_archivo_rel), referencia)
+
+    def estadisticas(self) -> Dict[str, int]:
+        info = self._resolver.cache_info()
+        return {"hits": info.hits, "misses": info.misses, "size": info.currsize}
+
+    def volcar_estadisticas(self):
+        """Suma a los contadores de la traza los aciertos y fallos desde el último volcado."""
+        info = self._resolver.cache_info()
+        aciertos, fallos = self._volcados
+        if info.hits == aciertos and info.misses == fallos:
+            return
+        trazador = obtener_trazador()
+        trazador.contar("reference_cache_hits", info.hits - aciertos)
+        trazador.contar("reference_cache_misses", info.misses - fallos)
+        self._volcados = (info.hits, info.misses)
+
+
+def resumen_cache_referencias(contadores: Dict[str, int]) -> Dict[str, Any]:
+    """Bloque 'reference_cache' de scan_info.json a partir de los contadores ya fusionados."""
+    aciertos = contadores.get("reference_cache_hits", 0)
+    fallos = contadores.get("reference_cache_misses", 0)
+    total = aciertos + fallos
+    return {"hits": aciertos, "misses": fallos, "hit_rate": round(aciertos / total, 3) if total else None}
@@ -5,55 +5,24 @@ import logging
 from typing import List, Set, Optional, Dict, Tuple
 
 # Importar utilidades y modelos
-from ..utils.path_utils import resolver_ruta_referencia, normalizar_ruta
 from ..models import DependencyInfo
+from .reference_cache import CacheReferencias
 
 # Obtener logger
 logger = logging.getLogger(__name__) # Usa 'proyscan.dependency_analysis.regex_parser'
 
-# --- Definición de Patrones Regex (Sin Java, Sin Vue) ---
+# --- Patrones Regex: solo PHP (JS/TS en js_parser.py, HTML/CSS/Vue/Java con sus propios parsers) ---
+# Protección contra backtracking catastrófico (ReDoS): la ruta incluida tiene longitud máxima y no
+# cruza saltos de línea, así que cada intento de coincidencia es acotado y el análisis es lineal
+# en el tamaño del archivo. Ver benchmarks/bench_parsers.py.
+MAX_CLAUSULA = 2000 # Caracteres máximos entre la palabra clave y la cadena importada (js_parser.py)
+MAX_REFERENCIA = 2048 # Caracteres máximos de una URL/ruta (también en url(...) de css_parser/html_parser)
 
-PATTERNS_BASE = {
-    'html': [
-        re.compile(r"""<(?:script|img|audio|video|iframe|source|embed)\s+[^>]*?src\s*=\s*["']([^"']+)["'][^>]*?>""", re.I | re.S),
-        re.compile(r"""<link\s+[^>]*?href\s*=\s*["']([^"']+)["'][^>]*?rel\s*=\s*["']stylesheet["'][^>]*?>""", re.I | re.S),
-        re.compile(r"""<a\s+[^>]*?href\s*=\s*["']([^"']+)["'][^>]*?>""", re.I | re.S),
-        re.compile(r"""<form\s+[^>]*?action\s*=\s*["']([^"']+)["'][^>]*?>""", re.I | re.S),
-        re.compile(r"""style\s*=\s*["'][^"']*?url\(["']?([^"')]+?)["']?\)[^"']*?["']""", re.I | re.S),
-    ],
-    'css': [
-        re.compile(r"""@import\s+(?:url\()?["']([^"'\)]+)["']\)?\s*;?""", re.I),
-        re.compile(r"""url\(["']?([^"')]+?)["']?\)""", re.I),
-    ],
-    'javascript': [
-        re.compile(r"""import(?:["'\s]*(?:[\w*{}\n\r\s,]+from\s*)?)(["'])([^"'\n\r]+?)\1\s*;?""", re.M),
-        re.compile(r"""require\s*\(\s*(["'])([^"'\n\r]+?)\1\s*\)\s*;?"""),
-        re.compile(r"""importScripts\s*\(\s*(["'])([^"'\n\r]+?)\1\s*\)\s*;?"""),
-        re.compile(r"""new\s+Worker\s*\(\s*(["'])([^"'\n\r]+?)\1\s*\)"""),
-        re.compile(r"""fetch\s*\(\s*(["'])([^"'\n\r]+?)\1\s*(?:,|\))""", re.M),
-    ],
+PATTERNS = {
     'php': [
-        re.compile(r"""(?:include|require|include_once|require_once)\s+(?:(?:__DIR__|\$[_a-zA-Z0-9]+)\s*\.\s*)?(["'])([^"']+\.php)\1\s*;""", re.I),
-    ],
-    'typescript': [
-        # Patrón mejorado para capturar 'from', 'require', etc. correctamente
-        re.compile(r"""(?:import|require|from)\s*(?:.*?\sfrom\s*)?(["'])([^"'\n\r]+?)\1""", re.M),
-        # Patrón específico para import type
-        re.compile(r"""import\s+type\s+.*?from\s*(["'])([^"'\n\r]+?)\1""", re.M),
-        re.compile(r"""importScripts\s*\(\s*(["'])([^"'\n\r]+?)\1\s*\)\s*;?"""),
-        re.compile(r"""new\s+Worker\s*\(\s*(["'])([^"'\n\r]+?)\1\s*\)"""),
-        re.compile(r"""fetch\s*\(\s*(["'])([^"'\n\r]+?)\1\s*(?:,|\))""", re.M),
-        re.compile(r"""///\s*<reference\s+path\s*=\s*["']([^"']+)["']\s*/>""", re.I)
+        re.compile(rf"""(?:include|require|include_once|require_once)\s+(?:(?:__DIR__|\$[_a-zA-Z0-9]+)\s*\.\s*)?(["'])([^"'\n\r]{{1,{MAX_REFERENCIA}}}\.php)\1\s*;""", re.I),
     ],
 }
-
-# Copiar patrones a los lenguajes derivados
-PATTERNS = PATTERNS_BASE.copy()
-PATTERNS['scss'] = PATTERNS['css'][:]
-PATTERNS['sass'] = PATTERNS['css'][:]
-PATTERNS['less'] = PATTERNS['css'][:]
-PATTERNS['jsx'] = PATTERNS['javascript'][:] # Usar patrones JS para JSX
-PATTERNS['tsx'] = PATTERNS['typescript'][:] # Usar patrones TS para TSX
 # ---------------------------------------------------------
 
 
@@ -61,11 +30,11 @@ def analizar_regex(
     contenido_lineas: List[str],
     lenguaje: str,
     ruta_archivo_rel: str,
-    archivos_proyecto: Set[str],
+    referencias: CacheReferencias,
     dir_proyecto_raiz: str
 ) -> Optional[List[DependencyInfo]]:
     """
-    Analiza dependencias usando Regex para JS, TS, PHP.
+    Analiza dependencias usando Regex para PHP (JS/TS usan el extractor de js_parser.py).
     """
     logger.debug(f"--- Iniciando análisis Regex para {ruta_archivo_rel} (Lenguaje: {lenguaje}) ---")
     if lenguaje not in PATTERNS:
@@ -96,15 +65,28 @@ def analizar_regex(
                      logger.debug(f"    -> Añadida dependencia cruda: '{referencia.strip()}'")
         except Exception as e: logger.warning(f"Error Regex {pattern.pattern} en {ruta_archivo_rel}: {e}")
 
-    # --- Resolución y Clasificación (Ajustada para JS/TS) ---
+    logger.debug(f"Dependencias crudas encontradas ({lenguaje}): {dependencias_encontradas_raw}")
+    dependencias_clasificadas = clasificar_referencias(dependencias_encontradas_raw, ruta_archivo_rel, referencias)
+    logger.debug(f"Dependencias Regex finales clasificadas ({lenguaje}): {dependencias_clasificadas}")
+    return dependencias_clasificadas
+
+
+def clasificar_referencias(
+    referencias_crudas: Set[str],
+    ruta_archivo_rel: str,
+    referencias: CacheReferencias
+) -> List[DependencyInfo]:
+    """
+    Resuelve y clasifica referencias crudas de JS/TS/PHP (url, library, internal, internal_broken).
+    Devuelve la lista ordenada por (type, path).
+    """
     dependencias_clasificadas: List[DependencyInfo] = []
     rutas_procesadas = set()
-    logger.debug(f"Dependencias crudas encontradas ({lenguaje}): {dependencias_encontradas_raw}")
 
-    for ref in dependencias_encontradas_raw:
+    for ref in referencias_crudas:
         if ref == '#' or ref.startswith(('javascript:', 'mailto:', 'tel:', 'data:')): continue
 
-        tipo_ref, ruta_resuelta_o_original = resolver_ruta_referencia(ref, ruta_archivo_rel)
+        tipo_ref, ruta_resuelta_o_original, en_proyecto = referencias.resolver(ref, ruta_archivo_rel)
         dep_info: Optional[DependencyInfo] = None
         key_to_check = ruta_resuelta_o_original
 
@@ -117,10 +99,10 @@ def analizar_regex(
              logger.debug(f"  -> Clasificado como LIBRARY: '{ruta_resuelta_o_original}'")
              dep_info = DependencyInfo(type='library', path=ruta_resuelta_o_original)
         elif tipo_ref in ['absoluta', 'relativa']:
-            ruta_norm = normalizar_ruta(ruta_resuelta_o_original)
+            ruta_norm = ruta_resuelta_o_original # Ya normalizada por la caché
             key_to_check = ruta_norm
             logger.debug(f"  -> Ruta normalizada interna/rota: '{ruta_norm}'")
-            if ruta_norm in archivos_proyecto:
+            if en_proyecto:
                  if ruta_norm not in rutas_procesadas:
                       dep_info = DependencyInfo(type='internal', path=ruta_norm)
                       logger.debug("    -> Clasificado como: INTERNAL")
@@ -145,5 +127,4 @@ def analizar_regex(
              logger.debug(f"  -> Duplicado omitido: '{key_to_check}'")
 
     dependencias_clasificadas.sort(key=lambda x: (x['type'], x['path']))
-    logger.debug(f"Dependencias Regex finales clasificadas ({lenguaje}): {dependencias_clasificadas}")
-    return dependencias_clasificadas
\ No newline at end of file
+    return dependencias_clasificadas
@@ -1,120 +1,138 @@
 # proyscan/dependency_analysis/vue_parser.py
+# Dependencias de componentes Vue (SFC). Un divisor ligero localiza por posición los bloques de
+# nivel superior (<template>, <script>/<script setup>, <style> y bloques propios como <i18n>),
+# como hace @vue/compiler-sfc, y cada fragmento va directo a su extractor: JS/TS para <script>,
+# CSS para <style> y HTML para <template>. No se construye ningún DOM del componente.
+import re
 import logging
-import os # Necesario para os.path.join
-from typing import List, Set, Optional, Dict, Tuple # Añadir Tuple
-
-# Intentar importar BeautifulSoup
-try:
-    from bs4 import BeautifulSoup, FeatureNotFound
-    BS4_AVAILABLE = True
-except ImportError:
-    BS4_AVAILABLE = False
-    # Clases Dummy si BS4 no está
-    class BeautifulSoup: pass
-    class FeatureNotFound(Exception): pass
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
 
 # Importar otros parsers y utilidades
 from .html_parser import analizar_html # Para analizar <template>
 from .css_parser import analizar_css # Para analizar <style>
-from .regex_parser import analizar_regex # Para analizar <script>
-# Importar utils es crucial aquí para resolver rutas relativas del src de style
-from ..utils.path_utils import resolver_ruta_referencia, normalizar_ruta
+from .js_parser import analizar_js # Para analizar <script>
+from .context import ContextoAnalisis
+from .reference_cache import CacheReferencias
 from ..models import DependencyInfo
 
 logger = logging.getLogger(__name__) # Usa 'proyscan.dependency_analysis.vue_parser'
 
+# Etiqueta de apertura de un bloque: nombre, atributos y '/' de autocierre
+_APERTURA_BLOQUE = re.compile(r"""<([A-Za-z][\w-]*)((?:\s+[^\s"'=<>/]+(?:\s*=\s*(?:"[^"]*"|'[^']*'|[^\s"'=<>`]+))?)*)\s*(/?)>""")
+_ATRIBUTO = re.compile(r"""([^\s"'=<>/]+)(?:\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'=<>`]+)))?""")
+# Dentro de <template> puede haber otros <template> (v-if, slots): se cuentan los anidados
+_TEMPLATE_ANIDADO = re.compile(r"<template\b[^>]*?(/?)>|</template\s*>", re.I)
+# Lenguaje de <script lang="..."> -> lenguaje del extractor JS
+LENGUAJES_SCRIPT = {'ts': 'typescript', 'tsx': 'tsx', 'jsx': 'jsx'}
+
+
+class BloqueSfc(NamedTuple):
+    etiqueta: str # 'template', 'script', 'style' o el nombre de un bloque propio, en minúsculas
+    atributos: Dict[str, str] # Atributo sin valor -> ''
+    inicio: int # Posición del contenido (tras la etiqueta de apertura)
+    fin: int # Posición de la etiqueta de cierre (contenido = texto[inicio:fin])
+
+
+def _cierre_bloque(texto: str, etiqueta: str, desde: int) -> Tuple[int, int]:
+    """(inicio, fin) de la etiqueta de cierre del bloque; sin cierre, el bloque llega al final."""
+    if etiqueta == 'template':
+        profundidad = 1
+        for etiqueta_anidada in _TEMPLATE_ANIDADO.finditer(texto, desde):
+            if etiqueta_anidada.group().startswith('</'):
+                profundidad -= 1
+                if profundidad == 0:
+                    return etiqueta_anidada.start(), etiqueta_anidada.end()
+            elif not etiqueta_anidada.group(1):
+                profundidad += 1
+        return len(texto), len(texto)
+    # <script>, <style> y bloques propios: su contenido es texto, acaba en el primer cierre
+    cierre = re.compile(rf"</{re.escape(etiqueta)}\s*>", re.I).search(texto, desde)
+    return (cierre.start(), cierre.end()) if cierre else (len(texto), len(texto))
+
+
+def dividir_sfc(texto: str) -> List[BloqueSfc]:
+    """Bloques de nivel superior de un SFC, en orden. Ignora comentarios HTML y texto suelto."""
+    bloques: List[BloqueSfc] = []
+    posicion = texto.find('<')
+    while posicion >= 0:
+        if texto.startswith('<!--', posicion):
+            fin_comentario = texto.find('-->', posicion + 4)
+            if fin_comentario < 0:
+                break
+            posicion = texto.find('<', fin_comentario + 3)
+            continue
+        apertura = _APERTURA_BLOQUE.match(texto, posicion)
+        if apertura is None:
+            posicion = texto.find('<', posicion + 1)
+            continue
+        etiqueta = apertura.group(1).lower()
+        atributos: Dict[str, str] = {}
+        for atributo in _ATRIBUTO.finditer(apertura.group(2)):
+            valor = next((v for v in atributo.group(2, 3, 4) if v is not None), '')
+            atributos.setdefault(atributo.group(1).lower(), valor)
+        if apertura.group(3): # <style src="..." />: bloque sin contenido
+            bloques.append(BloqueSfc(etiqueta, atributos, apertura.end(), apertura.end()))
+            posicion = texto.find('<', apertura.end())
+            continue
+        inicio_cierre, fin_cierre = _cierre_bloque(texto, etiqueta, apertura.end())
+        bloques.append(BloqueSfc(etiqueta, atributos, apertura.end(), inicio_cierre))
+        posicion = texto.find('<', fin_cierre)
+    return bloques
+
+
+def _clasificar_src(ref: str, ruta_archivo_rel: str, referencias: CacheReferencias) -> Optional[DependencyInfo]:
+    """Dependencia del atributo src de un bloque (<style src>, <script src>, <template src>)."""
+    tipo_ref, ruta_resuelta_o_original, en_proyecto = referencias.resolver(ref, ruta_archivo_rel)
+    if not ruta_resuelta_o_original: return None
+    if tipo_ref == 'url':
+        return DependencyInfo(type='url', path=ruta_resuelta_o_original)
+    if tipo_ref == 'externa': # Poco probable para src de un bloque
+        return DependencyInfo(type='external', path=ruta_resuelta_o_original)
+    if tipo_ref in ['absoluta', 'relativa']:
+        return DependencyInfo(type='internal' if en_proyecto else 'internal_broken', path=ruta_resuelta_o_original)
+    return None
+
+
 def analizar_vue(
     contenido_lineas: List[str],
     ruta_archivo_rel: str,
-    archivos_proyecto: Set[str],
-    dir_proyecto_raiz: str # Necesario para pasar a regex_parser
+    contexto: ContextoAnalisis # Archivos del proyecto e índices JS/TS y de estilos
 ) -> Optional[List[DependencyInfo]]:
     """
-    Analiza dependencias en archivos .vue (SFC) usando un enfoque multi-etapa.
-    (Versión con soporte para <style src="...">)
+    Analiza dependencias en archivos .vue (SFC): <script> y <script setup>, cada <style>
+    (contenido y atributo src) y las referencias a recursos del <template>.
     """
-    if not BS4_AVAILABLE:
-        logger.error("La biblioteca 'BeautifulSoup4' no está instalada (o falta 'lxml'). No se puede analizar Vue.")
-        return None
-
-    logger.debug(f"--- Iniciando análisis Vue (Multi-Etapa) para {ruta_archivo_rel} ---")
+    logger.debug(f"--- Iniciando análisis Vue (bloques SFC) para {ruta_archivo_rel} ---")
     contenido_completo = "\n".join(contenido_lineas)
     if not contenido_completo.strip(): return []
+    referencias = contexto.referencias
 
     # Usamos un set de tuplas (tipo, path) para evitar duplicados
     dependencias_unicas_set: Set[Tuple[str, str]] = set()
 
     try:
-        # Parsear con BS4
-        try: soup = BeautifulSoup(contenido_completo, 'lxml')
-        except FeatureNotFound: soup = BeautifulSoup(contenido_completo, 'html.parser')
-        except Exception as e_bs: logger.error(f"Error BS4 parseando {ruta_archivo_rel}", exc_info=True); return None
-
-        # 1. Analizar bloque <script>
-        script_tag = soup.find('script')
-        if script_tag and script_tag.string:
-            logger.debug("Analizando bloque <script>...")
-            script_content = script_tag.string.splitlines()
-            script_lang_attr = script_tag.get('lang', 'javascript') # Default a JS
-            # Mapear lang a nuestros tipos conocidos
-            script_lang = 'typescript' if 'ts' in script_lang_attr else 'javascript'
-            deps_script = analizar_regex(script_content, script_lang, ruta_archivo_rel, archivos_proyecto, dir_proyecto_raiz)
-            if deps_script:
-                for dep in deps_script: dependencias_unicas_set.add((dep['type'], dep['path']))
-                logger.debug(f"  -> Dependencias <script> (Regex): {[d['path'] for d in deps_script]}")
-
-        # 2. Analizar bloques <style>
-        for i, style_tag in enumerate(soup.find_all('style')):
-            # 2a. Analizar contenido interno con css_parser
-            if style_tag.string:
-                logger.debug(f"Analizando contenido <style> #{i+1} con css_parser...")
-                style_content = style_tag.string.splitlines()
-                style_lang = style_tag.get('lang', 'css') # Podríamos usar esto en el futuro
-                deps_style_content = analizar_css(style_content, ruta_archivo_rel, archivos_proyecto)
-                if deps_style_content:
-                    for dep in deps_style_content: dependencias_unicas_set.add((dep['type'], dep['path']))
-                    logger.debug(f"  -> Dependencias contenido <style> #{i+1}: {[d['path'] for d in deps_style_content]}")
-
-            # --- 2b. Analizar atributo 'src' en <style> ---
-            style_src = style_tag.get('src')
-            if style_src and isinstance(style_src, str) and style_src.strip():
-                ref = style_src.strip()
-                logger.debug(f"Analizando src='{ref}' en <style> #{i+1}...")
-                # Resolver y clasificar esta referencia
-                tipo_ref, ruta_resuelta_o_original = resolver_ruta_referencia(ref, ruta_archivo_rel)
-                key_to_check = ruta_resuelta_o_original
-                dep_info_style_src: Optional[DependencyInfo] = None
-
-                if not ruta_resuelta_o_original: continue
-
-                if tipo_ref == 'url':
-                     dep_info_style_src = DependencyInfo(type='url', path=ruta_resuelta_o_original)
-                elif tipo_ref == 'externa': # Poco probable para src de style
-                     dep_info_style_src = DependencyInfo(type='external', path=ruta_resuelta_o_original)
-                elif tipo_ref in ['absoluta', 'relativa']:
-                    ruta_norm = normalizar_ruta(ruta_resuelta_o_original)
-                    key_to_check = ruta_norm
-                    if ruta_norm in archivos_proyecto:
-                         dep_info_style_src = DependencyInfo(type='internal', path=ruta_norm)
-                    else:
-                         dep_info_style_src = DependencyInfo(type='internal_broken', path=ruta_norm)
-
-                if dep_info_style_src:
-                     logger.debug(f"  -> Dependencia <style src>: {dep_info_style_src}")
-                     dependencias_unicas_set.add((dep_info_style_src['type'], dep_info_style_src['path']))
-            # --- Fin análisis 'src' ---
-
-        # 3. Analizar bloque <template> (usando html_parser)
-        template_tag = soup.find('template')
-        if template_tag:
-             logger.debug("Analizando bloque <template> con html_parser...")
-             # Asegurarse de obtener solo el contenido como string
-             template_content_str = template_tag.decode_contents() # Mejor que .string o .text
-             if template_content_str:
-                  deps_template = analizar_html(template_content_str.splitlines(), ruta_archivo_rel, archivos_proyecto)
-                  if deps_template:
-                      for dep in deps_template: dependencias_unicas_set.add((dep['type'], dep['path']))
-                      logger.debug(f"  -> Dependencias <template>: {[d['path'] for d in deps_template]}")
+        for bloque in dividir_sfc(contenido_completo):
+            # Cada fragmento se pasa como una sola "línea": el "\n".join de los parsers no lo copia
+            fragmento = [contenido_completo[bloque.inicio:bloque.fin]]
+            lang = bloque.atributos.get('lang', '').lower()
+            deps_bloque: Optional[List[DependencyInfo]] = None
+            if bloque.etiqueta == 'script':
+                deps_bloque = analizar_js(fragmento, LENGUAJES_SCRIPT.get(lang, 'javascript'), ruta_archivo_rel, contexto.indice_js, referencias)
+            elif bloque.etiqueta == 'style':
+                deps_bloque = analizar_css(fragmento, lang or 'css', ruta_archivo_rel, contexto.indice_estilos, referencias)
+            elif bloque.etiqueta == 'template' and lang in ('', 'html'): # Pug y otros no son HTML
+                deps_bloque = analizar_html(fragmento, ruta_archivo_rel, referencias)
+            if deps_bloque:
+                for dep in deps_bloque: dependencias_unicas_set.add((dep['type'], dep['path']))
+                logger.debug(f"  -> Dependencias <{bloque.etiqueta}>: {[d['path'] for d in deps_bloque]}")
+
+            # Atributo src: el contenido del bloque está en otro archivo
+            ref = bloque.atributos.get('src', '').strip()
+            if ref and bloque.etiqueta in ('template', 'script', 'style'):
+                dep_info_src = _clasificar_src(ref, ruta_archivo_rel, referencias)
+                if dep_info_src:
+                    logger.debug(f"  -> Dependencia <{bloque.etiqueta} src>: {dep_info_src}")
+                    dependencias_unicas_set.add((dep_info_src['type'], dep_info_src['path']))
 
     except Exception as e:
         logger.error(f"Error procesando archivo Vue {ruta_archivo_rel}", exc_info=True)
@@ -124,4 +142,4 @@ def analizar_vue(
     todas_las_dependencias = [DependencyInfo(type=t, path=p) for t, p in dependencias_unicas_set]
     todas_las_dependencias.sort(key=lambda x: (x['type'], x['path']))
     logger.debug(f"Dependencias Vue finales clasificadas: {todas_las_dependencias}")
-    return todas_las_dependencias
\ No newline at end of file
+    return todas_las_dependencias
@@ -0,0 +1,375 @@
+# proyscan/dependency_graph.py
+# Grafo de dependencias internas del escaneo en formato CSR: cada archivo tiene un ID entero y
+# sus aristas salientes son destinos[desplazamientos[id]:desplazamientos[id + 1]] (arrays de
+# enteros, sin un objeto por arista). Sobre él se calculan componentes fuertemente conexas
+# (ciclos de imports), capas topológicas, fan-in/fan-out y tamaños de cierre transitivo.
+# Además del JSON se guarda un sidecar binario (solo rutas y arrays CSR) que las consultas como
+# `proyscan.py impact` cargan en milisegundos sin leer contenido_archivos.json.
+import sys
+import json
+import logging
+from array import array
+from collections import deque
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from .models import DependencyGraph
+
+logger = logging.getLogger(__name__) # Usa 'proyscan.dependency_graph'
+
+
+# Enteros de 64 bits con el mismo tamaño en todas las plataformas (el sidecar se escribe tal cual)
+TIPO_ENTERO = 'q'
+# Primera línea del sidecar binario; la segunda es una cabecera JSON con los tamaños
+MAGIA_GRAFO_COMPACTO = b"PROYSCAN-GRAFO 1\n"
+
+
+def _csr(num_nodos: int, aristas: Iterable[Tuple[int, int]]) -> Tuple[array, array]:
+    """(desplazamientos, destinos) a partir de pares (origen, destino); destinos ordenados por origen."""
+    filas: List[List[int]] = [[] for _ in range(num_nodos)]
+    for origen, destino in aristas:
+        filas[origen].append(destino)
+    desplazamientos = array(TIPO_ENTERO, [0]) * (num_nodos + 1)
+    destinos = array(TIPO_ENTERO)
+    for origen, fila in enumerate(filas):
+        if fila:
+            destinos.extend(sorted(set(fila)) if len(fila) > 1 else fila)
+        desplazamientos[origen + 1] = len(destinos)
+    return desplazamientos, destinos
+
+
+def _transponer(num_nodos: int, desplazamientos: array, destinos: array) -> Tuple[array, array]:
+    """CSR del grafo inverso (ordenación por conteo, lineal); los orígenes quedan ordenados."""
+    inversos = array(TIPO_ENTERO, [0]) * (num_nodos + 1)
+    for destino in destinos:
+        inversos[destino + 1] += 1
+    for nodo in range(num_nodos):
+        inversos[nodo + 1] += inversos[nodo]
+    siguiente = inversos[:-1]
+    origenes = array(TIPO_ENTERO, [0]) * len(destinos)
+    for origen in range(num_nodos):
+        for arista in range(desplazamientos[origen], desplazamientos[origen + 1]):
+            destino = destinos[arista]
+            origenes[siguiente[destino]] = origen
+            siguiente[destino] += 1
+    return inversos, origenes
+
+
+class GrafoDependencias:
+    """
+    Grafo dirigido archivo -> archivo del que depende. `rutas[id]` es la ruta del archivo y
+    `ids[ruta]` su ID. Guarda también el grafo inverso (quién depende de cada archivo).
+    Los análisis se calculan una vez, bajo demanda, y en tiempo lineal salvo el cierre transitivo.
+    """
+
+    def __init__(
+        self,
+        rutas: Sequence[str],
+        desplazamientos: array,
+        destinos: array,
+        desplazamientos_inversos: Optional[array] = None,
+        origenes: Optional[array] = None
+    ):
+        self.rutas: List[str] = list(rutas)
+        self.ids: Dict[str, int] = {ruta: id_nodo for id_nodo, ruta in enumerate(self.rutas)}
+        self.desplazamientos, self.destinos = desplazamientos, destinos
+        if desplazamientos_inversos is None or origenes is None:
+            desplazamientos_inversos, origenes = _transponer(len(self.rutas), desplazamientos, destinos)
+        self.desplazamientos_inversos, self.origenes = desplazamientos_inversos, origenes
+        # (inicios, fines) en bytes del objeto de cada archivo en contenido_archivos.json, si se conocen
+        self.posiciones_contenido: Optional[Tuple[array, array]] = None
+        self._componentes: Optional[Tuple[array, List[List[int]]]] = None
+
+    @classmethod
+    def desde_aristas(cls, rutas: Sequence[str], aristas: Iterable[Tuple[int, int]]) -> 'GrafoDependencias':
+        """Construye el grafo desde pares (ID origen, ID destino); se ignoran las aristas repetidas."""
+        return cls(rutas, *_csr(len(rutas), aristas))
+
+    @classmethod
+    def desde_referencias_inversas(cls, rutas: Sequence[str], dependencias_inversas: Mapping[str, Iterable[str]]) -> 'GrafoDependencias':
+        """Construye el grafo desde el índice inverso de la Fase 2 (destino -> archivos que lo importan)."""
+        ids = {ruta: id_nodo for id_nodo, ruta in enumerate(rutas)}
+        aristas = []
+        for destino, origenes in dependencias_inversas.items():
+            id_destino = ids.get(destino)
+            if id_destino is None:
+                continue # Dependencia 'internal' hacia un archivo que no está en el escaneo
+            aristas.extend((ids[origen], id_destino) for origen in origenes if origen in ids)
+        return cls.desde_aristas(rutas, aristas)
+
+    def __len__(self) -> int:
+        return len(self.rutas)
+
+    @property
+    def num_aristas(self) -> int:
+        return len(self.destinos)
+
+    def dependencias(self, id_nodo: int) -> array:
+        return self.destinos[self.desplazamientos[id_nodo]:self.desplazamientos[id_nodo + 1]]
+
+    def dependientes(self, id_nodo: int) -> array:
+        return self.origenes[self.desplazamientos_inversos[id_nodo]:self.desplazamientos_inversos[id_nodo + 1]]
+
+    def fan_out(self) -> List[int]:
+        d = self.desplazamientos
+        return [d[nodo + 1] - d[nodo] for nodo in range(len(self.rutas))]
+
+    def fan_in(self) -> List[int]:
+        d = self.desplazamientos_inversos
+        return [d[nodo + 1] - d[nodo] for nodo in range(len(self.rutas))]
+
+    def componentes_fuertes(self) -> Tuple[array, List[List[int]]]:
+        """
+        (componente de cada nodo, miembros de cada componente) con Tarjan iterativo. Las
+        componentes salen en orden topológico inverso: cada una después de todas las que alcanza.
+        """
+        if self._componentes is not None:
+            return self._componentes
+        num_nodos = len(self.rutas)
+        desplazamientos, destinos = self.desplazamientos, self.destinos
+        orden = array(TIPO_ENTERO, [-1]) * num_nodos
+        bajo = array(TIPO_ENTERO, [0]) * num_nodos
+        en_pila = bytearray(num_nodos)
+        componente = array(TIPO_ENTERO, [-1]) * num_nodos
+        pila: List[int] = []
+        componentes: List[List[int]] = []
+        contador = 0
+        for raiz in range(num_nodos):
+            if orden[raiz] != -1:
+                continue
+            orden[raiz] = bajo[raiz] = contador
+            contador += 1
+            pila.append(raiz)
+            en_pila[raiz] = 1
+            llamadas = [[raiz, desplazamientos[raiz]]] # (nodo, siguiente arista a visitar)
+            while llamadas:
+                marco = llamadas[-1]
+                nodo, arista = marco
+                if arista < desplazamientos[nodo + 1]:
+                    marco[1] = arista + 1
+                    vecino = destinos[arista]
+                    if orden[vecino] == -1:
+                        orden[vecino] = bajo[vecino] = contador
+                        contador += 1
+                        pila.append(vecino)
+                        en_pila[vecino] = 1
+                        llamadas.append([vecino, desplazamientos[vecino]])
+                    elif en_pila[vecino] and orden[vecino] < bajo[nodo]:
+                        bajo[nodo] = orden[vecino]
+                    continue
+                llamadas.pop()
+                if llamadas and bajo[nodo] < bajo[llamadas[-1][0]]:
+                    bajo[llamadas[-1][0]] = bajo[nodo]
+                if bajo[nodo] == orden[nodo]:
+                    miembros = []
+                    while True:
+                        miembro = pila.pop()
+                        en_pila[miembro] = 0
+                        componente[miembro] = len(componentes)
+                        miembros.append(miembro)
+                        if miembro == nodo:
+                            break
+                    miembros.sort()
+                    componentes.append(miembros)
+        self._componentes = (componente, componentes)
+        return self._componentes
+
+    def ciclos(self) -> List[List[int]]:
+        """Componentes con más de un archivo o con un archivo que se importa a sí mismo; las mayores primero."""
+        _, componentes = self.componentes_fuertes()
+        ciclos = [m for m in componentes if len(m) > 1 or m[0] in self.dependencias(m[0])]
+        ciclos.sort(key=lambda miembros: (-len(miembros), miembros[0]))
+        return ciclos
+
+    def capas(self) -> List[int]:
+        """
+        Capa topológica de cada archivo: 0 si no depende de ningún otro archivo del proyecto (fuera
+        de su ciclo); si no, 1 + la mayor capa de sus dependencias. Un ciclo comparte capa.
+        """
+        componente, componentes = self.componentes_fuertes()
+        capa_componente = [0] * len(componentes)
+        for id_componente, miembros in enumerate(componentes): # Dependencias antes que dependientes
+            capa = 0
+            for nodo in miembros:
+                for vecino in self.dependencias(nodo):
+                    otra = componente[vecino]
+                    if otra != id_componente and capa_componente[otra] >= capa:
+                        capa = capa_componente[otra] + 1
+            capa_componente[id_componente] = capa
+        return [capa_componente[componente[nodo]] for nodo in range(len(self.rutas))]
+
+    def _tamanos_cierre(self, inversa: bool) -> List[int]:
+        # Conjuntos de alcance como enteros de bits por componente (OR en C, 64 nodos por palabra);
+        # el conjunto de una componente se libera en cuanto la han usado todas sus predecesoras
+        componente, componentes = self.componentes_fuertes()
+        desplazamientos, vecinos = (self.desplazamientos_inversos, self.origenes) if inversa else (self.desplazamientos, self.destinos)
+        pendientes = [0] * len(componentes)
+        for nodo in range(len(self.rutas)):
+            for vecino in vecinos[desplazamientos[nodo]:desplazamientos[nodo + 1]]:
+                if componente[vecino] != componente[nodo]:
+                    pendientes[componente[vecino]] += 1
+        alcance: List[Optional[int]] = [None] * len(componentes)
+        tamano_componente = [0] * len(componentes)
+        orden = range(len(componentes) - 1, -1, -1) if inversa else range(len(componentes))
+        for id_componente in orden:
+            bits = 0
+            for nodo in componentes[id_componente]:
+                bits |= 1 << nodo
+            for nodo in componentes[id_componente]:
+                for vecino in vecinos[desplazamientos[nodo]:desplazamientos[nodo + 1]]:
+                    otra = componente[vecino]
+                    if otra != id_componente:
+                        bits |= alcance[otra]
+                        pendientes[otra] -= 1
+                        if pendientes[otra] == 0:
+                            alcance[otra] = None
+            tamano_componente[id_componente] = bits.bit_count()
+            if pendientes[id_componente]:
+                alcance[id_componente] = bits
+        return [tamano_componente[componente[nodo]] - 1 for nodo in range(len(self.rutas))]
+
+    def dependencias_transitivas(self) -> List[int]:
+        """Número de archivos de los que depende cada archivo, directa o indirectamente."""
+        return self._tamanos_cierre(inversa=False)
+
+    def dependientes_transitivos(self) -> List[int]:
+        """Número de archivos que dependen de cada archivo, directa o indirectamente."""
+        return self._tamanos_cierre(inversa=True)
+
+    def _bfs(self, ids_origen: Iterable[int], profundidad_max: Optional[int], inversa: bool) -> Tuple[array, List[Tuple[int, int, int]]]:
+        """(profundidad de cada nodo o -1, [(ID, profundidad, ID por el que llega)] en orden de la BFS)."""
+        desplazamientos, vecinos = (self.desplazamientos_inversos, self.origenes) if inversa else (self.desplazamientos, self.destinos)
+        profundidad = array(TIPO_ENTERO, [-1]) * len(self.rutas)
+        cola: deque = deque()
+        for id_nodo in ids_origen:
+            if profundidad[id_nodo] == -1:
+                profundidad[id_nodo] = 0
+                cola.append(id_nodo)
+        alcanzados: List[Tuple[int, int, int]] = []
+        while cola:
+            nodo = cola.popleft()
+            siguiente = profundidad[nodo] + 1
+            if profundidad_max is not None and siguiente > profundidad_max:
+                continue
+            for vecino in vecinos[desplazamientos[nodo]:desplazamientos[nodo + 1]]:
+                if profundidad[vecino] == -1:
+                    profundidad[vecino] = siguiente
+                    alcanzados.append((vecino, siguiente, nodo))
+                    cola.append(vecino)
+        return profundidad, alcanzados
+
+    def afectados(self, ids_origen: Iterable[int], profundidad_max: Optional[int] = None) -> List[Tuple[int, int, int]]:
+        """
+        BFS inversa: (ID, profundidad, ID por el que llega) de cada archivo que depende, directa o
+        transitivamente, de alguno de `ids_origen` (profundidad 1 = lo importa directamente).
+        Los archivos de origen no se incluyen; el orden es el de la BFS.
+        """
+        return self._bfs(ids_origen, profundidad_max, inversa=True)[1]
+
+    def cierre(self, ids_entrada: Sequence[int], profundidad_max: Optional[int] = None) -> List[int]:
+        """
+        Los archivos de entrada y todo aquello de lo que dependen (hasta `profundidad_max` saltos),
+        en orden topológico: cada archivo después de sus dependencias. Es el postorden de una DFS
+        desde las entradas, en su orden; dentro de un ciclo manda el orden de la DFS.
+        """
+        profundidad, _ = self._bfs(ids_entrada, profundidad_max, inversa=False)
+        desplazamientos, destinos = self.desplazamientos, self.destinos
+        visitado = bytearray(len(self.rutas))
+        orden: List[int] = []
+        for entrada in ids_entrada:
+            if visitado[entrada]:
+                continue
+            visitado[entrada] = 1
+            pila = [[entrada, desplazamientos[entrada]]] # (nodo, siguiente arista a visitar)
+            while pila:
+                marco = pila[-1]
+                nodo, arista = marco
+                if arista < desplazamientos[nodo + 1]:
+                    marco[1] = arista + 1
+                    vecino = destinos[arista]
+                    if profundidad[vecino] != -1 and not visitado[vecino]:
+                        visitado[vecino] = 1
+                        pila.append([vecino, desplazamientos[vecino]])
+                    continue
+                pila.pop()
+                orden.append(nodo)
+        return orden
+
+    def a_json(self) -> DependencyGraph:
+        componente, _ = self.componentes_fuertes()
+        capas = self.capas()
+        return {
+            "node_count": len(self.rutas),
+            "edge_count": self.num_aristas,
+            "nodes": self.rutas,
+            "offsets": self.desplazamientos.tolist(),
+            "targets": self.destinos.tolist(),
+            "metrics": {
+                "fan_in": self.fan_in(),
+                "fan_out": self.fan_out(),
+                "scc": componente.tolist(),
+                "layer": capas,
+                "transitive_dependencies": self.dependencias_transitivas(),
+                "transitive_dependents": self.dependientes_transitivos(),
+            },
+            "cycles": [[self.rutas[nodo] for nodo in miembros] for miembros in self.ciclos()],
+            "layer_count": max(capas) + 1 if capas else 0,
+        }
+
+    @classmethod
+    def desde_json(cls, datos: Mapping[str, Any]) -> 'GrafoDependencias':
+        return cls(datos["nodes"], array(TIPO_ENTERO, datos["offsets"]), array(TIPO_ENTERO, datos["targets"]))
+
+
+def guardar_grafo(ruta_salida: str, grafo: GrafoDependencias):
+    with open(ruta_salida, 'w', encoding='utf-8') as f:
+        json.dump(grafo.a_json(), f, ensure_ascii=False, separators=(',', ':'))
+
+
+def cargar_grafo(ruta: str) -> GrafoDependencias:
+    with open(ruta, 'r', encoding='utf-8') as f:
+        return GrafoDependencias.desde_json(json.load(f))
+
+
+def guardar_grafo_compacto(ruta_salida: str, grafo: GrafoDependencias):
+    """
+    Sidecar binario: magia, cabecera JSON, rutas separadas por NUL, los cuatro arrays CSR y, si
+    se conocen, las posiciones de cada archivo en contenido_archivos.json (little-endian).
+    """
+    rutas = '\0'.join(grafo.rutas).encode('utf-8')
+    cabecera = {"nodes": len(grafo), "edges": grafo.num_aristas, "paths_bytes": len(rutas),
+                "content_positions": grafo.posiciones_contenido is not None}
+    arrays = [grafo.desplazamientos, grafo.destinos, grafo.desplazamientos_inversos, grafo.origenes]
+    if grafo.posiciones_contenido is not None:
+        arrays.extend(grafo.posiciones_contenido)
+    with open(ruta_salida, 'wb') as f:
+        f.write(MAGIA_GRAFO_COMPACTO)
+        f.write(json.dumps(cabecera).encode('ascii') + b"\n")
+        f.write(rutas)
+        for datos in arrays:
+            if sys.byteorder == 'big':
+                datos = array(TIPO_ENTERO, datos)
+                datos.byteswap()
+            datos.tofile(f)
+
+
+def cargar_grafo_compacto(ruta: str) -> GrafoDependencias:
+    with open(ruta, 'rb') as f:
+        if f.readline() != MAGIA_GRAFO_COMPACTO:
+            raise ValueError(f"'{ruta}' no es un grafo compacto de ProyScan.")
+        cabecera = json.loads(f.readline())
+        num_nodos, num_aristas = cabecera["nodes"], cabecera["edges"]
+        rutas = f.read(cabecera["paths_bytes"]).decode('utf-8').split('\0') if num_nodos else []
+        tamanos = [num_nodos + 1, num_aristas, num_nodos + 1, num_aristas]
+        if cabecera.get("content_positions"):
+            tamanos += [num_nodos, num_nodos]
+        arrays = []
+        for tamano in tamanos:
+            datos = array(TIPO_ENTERO)
+            datos.fromfile(f, tamano)
+            if sys.byteorder == 'big':
+                datos.byteswap()
+            arrays.append(datos)
+    grafo = GrafoDependencias(rutas, *arrays[:4])
+    if len(arrays) > 4:
+        grafo.posiciones_contenido = (arrays[4], arrays[5])
+    return grafo
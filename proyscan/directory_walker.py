@@ -0,0 +1,132 @@
+# proyscan/directory_walker.py
+# Recorrido único del proyecto con os.scandir. Construye un modelo en memoria del árbol
+# (tipo, tamaño y mtime de cada entrada, leídos UNA sola vez) del que salen la lista de
+# archivos de la Fase 1, el árbol de texto y los tamaños de la Fase 2.
+import os
+import time
+import logging
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .ignore_handler import PatronesIgnorar
+from .tracing import obtener_trazador
+from .gitignore import DIRECTORIO_GIT, ReglasGitignore, cargar_reglas_raiz, reglas_para_directorio
+
+logger = logging.getLogger(__name__) # Usa 'proyscan.directory_walker'
+
+class EntradaArchivo:
+    """Un archivo (o cualquier entrada que no es directorio) del proyecto."""
+    __slots__ = ("nombre", "tamano", "mtime_ns", "es_regular", "error")
+
+    def __init__(self, nombre: str):
+        self.nombre = nombre
+        self.tamano: Optional[int] = None
+        self.mtime_ns: Optional[int] = None
+        self.es_regular = False # False para enlaces rotos, sockets, etc. (no salen en el árbol)
+        self.error: Optional[str] = None # Error de stat, si lo hubo
+
+class NodoDirectorio:
+    """Un directorio del proyecto con sus subdirectorios y archivos NO ignorados, ordenados por nombre."""
+    __slots__ = ("nombre", "ruta_relativa", "directorios", "archivos", "error", "es_enlace")
+
+    def __init__(self, nombre: str, ruta_relativa: str):
+        self.nombre = nombre
+        self.ruta_relativa = ruta_relativa # '' para la raíz, 'a/b' para subdirectorios
+        self.directorios: List["NodoDirectorio"] = []
+        self.archivos: List[EntradaArchivo] = []
+        self.error: Optional[str] = None # strerror si no se pudo listar
+        self.es_enlace = False # Enlaces a directorios: se muestran pero no se recorren (como os.walk)
+
+def recorrer_proyecto(
+    directorio_raiz: str,
+    patrones_ignorar: PatronesIgnorar,
+    nombre_script_ignorar: Optional[str],
+    usar_gitignore: bool = False
+) -> Tuple[NodoDirectorio, int]:
+    """
+    Recorre el proyecto una sola vez. Las entradas ignoradas se descartan ANTES de hacer stat
+    (los directorios ignorados no se listan). Devuelve (raíz del modelo, nº de entradas ignoradas).
+    Con `usar_gitignore`, además se aplican los .gitignore (y .ignore anidados) de cada nivel
+    con la semántica de git, y el directorio .git se omite.
+    """
+    raiz = NodoDirectorio(os.path.basename(directorio_raiz), '')
+    total_ignorados = 0
+    debug = logger.isEnabledFor(logging.DEBUG)
+    reglas_raiz = cargar_reglas_raiz(directorio_raiz) if usar_gitignore else None
+    pila: List[Tuple[NodoDirectorio, str, Optional[ReglasGitignore]]] = [(raiz, directorio_raiz, reglas_raiz)]
+    tiempo_ignorar_ns = 0 # Tiempo acumulado en las comprobaciones de ignorados (para la traza)
+    total_comprobaciones = 0
+
+    while pila:
+        nodo, ruta_absoluta, reglas_git = pila.pop()
+        if debug: logger.debug(f"Escaneando directorio: {nodo.ruta_relativa or '.'}")
+        try:
+            with os.scandir(ruta_absoluta) as iterador:
+                entradas = list(iterador)
+        except OSError as e:
+            nodo.error = e.strerror or str(e)
+            logger.warning(f"No se pudo listar {ruta_absoluta}: {e}")
+            continue
+
+        if reglas_git is not None:
+            reglas_git = reglas_para_directorio(reglas_git, ruta_absoluta, nodo.ruta_relativa, (e.name for e in entradas))
+
+        prefijo = nodo.ruta_relativa + '/' if nodo.ruta_relativa else ''
+        for entrada in entradas:
+            ruta_relativa = prefijo + entrada.name
+            try:
+                es_dir = entrada.is_dir() # Usa d_type: sin stat en la mayoría de sistemas
+            except OSError:
+                es_dir = False
+
+            inicio_ns = time.perf_counter_ns()
+            ignorar, razon = patrones_ignorar.comprobar(ruta_relativa, es_dir, nombre_script_ignorar)
+            if not ignorar and reglas_git is not None:
+                if es_dir and entrada.name == DIRECTORIO_GIT:
+                    ignorar, razon = True, "directorio_git"
+                else:
+                    ignorar, razon = reglas_git.comprobar(ruta_relativa, es_dir)
+            tiempo_ignorar_ns += time.perf_counter_ns() - inicio_ns
+            total_comprobaciones += 1
+            if ignorar:
+                total_ignorados += 1
+                if debug: logger.debug(f"Ignorando {'Directorio' if es_dir else 'Archivo'}: {ruta_relativa}{'/' if es_dir else ''} (Razón: {razon})")
+                continue
+
+            if es_dir:
+                hijo = NodoDirectorio(entrada.name, ruta_relativa)
+                nodo.directorios.append(hijo)
+                if entrada.is_symlink():
+                    hijo.es_enlace = True
+                else:
+                    pila.append((hijo, entrada.path, reglas_git))
+            else:
+                archivo = EntradaArchivo(entrada.name)
+                try:
+                    archivo.es_regular = entrada.is_file()
+                    info_stat = entrada.stat()
+                    archivo.tamano = info_stat.st_size
+                    archivo.mtime_ns = info_stat.st_mtime_ns
+                except OSError as e:
+                    archivo.error = str(e)
+                nodo.archivos.append(archivo)
+                if debug: logger.debug(f"  Archivo encontrado: '{ruta_relativa}'")
+
+        nodo.directorios.sort(key=lambda d: d.nombre)
+        nodo.archivos.sort(key=lambda a: a.nombre)
+
+    obtener_trazador().acumular("ignore_matching", "ignore", tiempo_ignorar_ns, veces=total_comprobaciones)
+    return raiz, total_ignorados
+
+def iterar_archivos(raiz: NodoDirectorio) -> Iterator[Tuple[str, EntradaArchivo]]:
+    """Recorre el modelo y devuelve (ruta relativa con '/', entrada) de cada archivo."""
+    pila = [raiz]
+    while pila:
+        nodo = pila.pop()
+        prefijo = nodo.ruta_relativa + '/' if nodo.ruta_relativa else ''
+        for archivo in nodo.archivos:
+            yield prefijo + archivo.nombre, archivo
+        pila.extend(reversed(nodo.directorios))
+
+def indexar_archivos(raiz: NodoDirectorio) -> Dict[str, EntradaArchivo]:
+    """Diccionario ruta relativa -> entrada, para consultar tamaño/mtime sin volver al disco."""
+    return dict(iterar_archivos(raiz))
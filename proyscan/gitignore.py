@@ -0,0 +1,257 @@
+# proyscan/gitignore.py
+# Semántica completa de .gitignore (comodines, '**', negaciones '!', patrones anclados y
+# archivos por directorio). Las reglas se compilan una vez por nivel de directorio durante
+# el recorrido, de modo que los subárboles ignorados se podan antes de hacer stat.
+import os
+import re
+import logging
+from typing import Iterable, List, Optional, Tuple
+
+from .config import ARCHIVO_IGNORAR, ARCHIVOS_IGNORAR_GIT
+
+logger = logging.getLogger(__name__) # Usa 'proyscan.gitignore'
+
+DIRECTORIO_GIT = ".git"
+RUTA_EXCLUDE_GIT = os.path.join(DIRECTORIO_GIT, "info", "exclude")
+
+class ReglaGit:
+    """Una línea de un archivo de ignorados ya traducida a expresión regular sobre la ruta relativa al proyecto."""
+    __slots__ = ("patron", "origen", "regex", "negada", "solo_dir")
+
+    def __init__(self, patron: str, origen: str, regex: str, negada: bool, solo_dir: bool):
+        self.patron = patron
+        self.origen = origen # Archivo de procedencia, para las razones de los logs
+        self.regex = regex
+        self.negada = negada
+        self.solo_dir = solo_dir
+
+# Clases POSIX de wildmatch (locale C). Una clase desconocida hace que el patrón no coincida nunca
+CLASES_POSIX = {
+    'alnum': 'a-zA-Z0-9', 'alpha': 'a-zA-Z', 'blank': r' \t', 'cntrl': r'\x00-\x1f\x7f',
+    'digit': '0-9', 'graph': '!-~', 'lower': 'a-z', 'print': ' -~', 'punct': r'!-/:-@\[-`{-~',
+    'space': r' \t\n\r\f\v', 'upper': 'A-Z', 'xdigit': '0-9A-Fa-f',
+}
+# Expresión que no coincide con nada: patrones que git nunca hace coincidir ('[' sin cerrar,
+# clase POSIX desconocida, barra invertida final)
+NUNCA = '(?!)'
+
+def _escapar_en_clase(caracter: str) -> str:
+    return '\\' + caracter if caracter in '\\]^-[' else caracter
+
+def _traducir_corchetes(patron: str, inicio: int) -> Tuple[str, int]:
+    """
+    Traduce una clase '[...]' que empieza en `inicio` como wildmatch de git. Devuelve (regex,
+    índice siguiente); la regex es NUNCA si git no haría coincidir el patrón.
+    """
+    n = len(patron)
+    i = inicio + 1
+    negada = i < n and patron[i] in '!^'
+    if negada:
+        i += 1
+    elementos: List[str] = []
+    anterior: Optional[str] = None # Último carácter suelto: puede abrir un rango 'a-z'
+    primero = True # El primer carácter (incluido ']') siempre pertenece a la clase
+    while primero or (i < n and patron[i] != ']'):
+        primero = False
+        if i >= n:
+            return NUNCA, n
+        caracter = patron[i]
+        if caracter == '\\':
+            i += 1
+            if i >= n:
+                return NUNCA, n
+            caracter = patron[i]
+            elementos.append(_escapar_en_clase(caracter))
+            anterior = caracter
+        elif caracter == '-' and anterior is not None and i + 1 < n and patron[i + 1] != ']':
+            i += 1
+            final = patron[i]
+            if final == '\\':
+                i += 1
+                if i >= n:
+                    return NUNCA, n
+                final = patron[i]
+            # El inicio ya está como carácter suelto: en git '[z-a]' coincide solo con 'z'
+            if anterior <= final:
+                elementos.append(_escapar_en_clase(anterior) + '-' + _escapar_en_clase(final))
+            anterior = None
+        elif caracter == '[' and patron.startswith(':', i + 1):
+            cierre = patron.find(']', i + 2)
+            if cierre == -1:
+                return NUNCA, n
+            if cierre - 1 < i + 2 or patron[cierre - 1] != ':': # Sin ':]': '[' es un carácter más
+                elementos.append(_escapar_en_clase('['))
+                anterior = '['
+            else:
+                clase = CLASES_POSIX.get(patron[i + 2:cierre - 1])
+                if clase is None:
+                    return NUNCA, cierre + 1
+                elementos.append(clase)
+                anterior = None
+                i = cierre
+        else:
+            elementos.append(_escapar_en_clase(caracter))
+            anterior = caracter
+        i += 1
+    if i >= n:
+        return NUNCA, n # '[' sin cerrar
+    conjunto = ''.join(elementos)
+    if negada:
+        return '[^/' + conjunto + ']', i + 1
+    # Con rutas, una clase nunca coincide con '/' (p. ej. el rango '[!-0]')
+    return ('(?!/)' if re.fullmatch('[' + conjunto + ']', '/') else '') + '[' + conjunto + ']', i + 1
+
+def traducir_patron(patron: str) -> str:
+    """Traduce el cuerpo de un patrón (sin '!', sin '/' inicial ni final) a expresión regular."""
+    partes: List[str] = []
+    i = 0
+    n = len(patron)
+    while i < n:
+        caracter = patron[i]
+        if caracter == '*':
+            if patron.startswith('**', i) and (i == 0 or patron[i - 1] == '/') and (i + 2 == n or patron[i + 2] == '/'):
+                # '**' como segmento completo
+                if i + 2 == n:
+                    partes.append('.*') # 'a/**': todo lo que hay dentro
+                    i += 2
+                else:
+                    partes.append('(?:.*/)?') # '**/' y '/**/': cero o más directorios
+                    i += 3
+                continue
+            while i < n and patron[i] == '*': # Otros '*' seguidos equivalen a uno
+                i += 1
+            partes.append('[^/]*')
+            continue
+        if caracter == '?':
+            partes.append('[^/]')
+        elif caracter == '[':
+            clase, i = _traducir_corchetes(patron, i)
+            partes.append(clase)
+            continue
+        elif caracter == '\\':
+            i += 1
+            partes.append(re.escape(patron[i]) if i < n else NUNCA)
+        else:
+            partes.append(re.escape(caracter))
+        i += 1
+    return ''.join(partes)
+
+def parsear_linea(linea: str, base_relativa: str, origen: str) -> Optional[ReglaGit]:
+    """Convierte una línea de un .gitignore situado en `base_relativa` ('' = raíz) en una regla."""
+    linea = linea.rstrip('\r\n')
+    if not linea or linea.startswith('#'):
+        return None
+    # Espacios finales: se quitan salvo que estén escapados
+    sin_espacios = linea.rstrip(' ')
+    if sin_espacios.endswith('\\') and len(sin_espacios) < len(linea):
+        sin_espacios += ' '
+    linea = sin_espacios
+    if not linea:
+        return None
+
+    negada = linea.startswith('!')
+    if negada:
+        linea = linea[1:]
+    elif linea.startswith('\\!') or linea.startswith('\\#'):
+        linea = linea[1:]
+
+    solo_dir = linea.endswith('/') and not linea.endswith('\\/')
+    cuerpo = linea.rstrip('/') if solo_dir else linea
+    if not cuerpo:
+        return None
+    # Con '/' al principio o en medio, el patrón es relativo al directorio del archivo
+    anclado = '/' in cuerpo
+    cuerpo = cuerpo.lstrip('/')
+    if not cuerpo:
+        return None
+
+    prefijo = re.escape(base_relativa + '/') if base_relativa else ''
+    regex = prefijo + ('' if anclado else '(?:.*/)?') + traducir_patron(cuerpo)
+    return ReglaGit(('!' if negada else '') + linea, origen, regex, negada, solo_dir)
+
+def leer_reglas_archivo(ruta_archivo: str, base_relativa: str, origen: str) -> List[ReglaGit]:
+    """Lee un archivo de ignorados con sintaxis git. Si no se puede leer, no aporta reglas."""
+    reglas: List[ReglaGit] = []
+    try:
+        with open(ruta_archivo, 'r', encoding='utf-8', errors='replace') as f:
+            for numero_linea, linea in enumerate(f, 1):
+                regla = parsear_linea(linea, base_relativa, origen)
+                if regla is None:
+                    continue
+                # Una regla que no compila no puede llegar al filtro combinado: se descarta sola
+                try:
+                    re.compile(regla.regex)
+                except re.error as e:
+                    logger.warning(f"Regla '{regla.patron}' no válida en {origen}, línea {numero_linea} ({e}). Se descarta.")
+                    continue
+                reglas.append(regla)
+    except OSError as e:
+        logger.warning(f"No se pudo leer {ruta_archivo}: {e}")
+        return []
+    logger.debug(f"  {len(reglas)} reglas cargadas desde {origen}")
+    return reglas
+
+class ReglasGitignore:
+    """
+    Reglas efectivas en un nivel de directorio: las de los niveles superiores seguidas de
+    las propias, de modo que la última regla que coincide decide (precedencia de git).
+    Se compila una expresión combinada de las reglas que ignoran como filtro rápido:
+    si no coincide, ninguna negación hace falta evaluar.
+    """
+
+    def __init__(self, reglas: List[ReglaGit]):
+        self.reglas = reglas
+        self._compiladas = [re.compile(regla.regex + r'\Z', re.DOTALL) for regla in reglas]
+        self._filtro_archivos = self._combinar(r for r in reglas if not r.negada and not r.solo_dir)
+        self._filtro_dirs = self._combinar(r for r in reglas if not r.negada)
+
+    @staticmethod
+    def _combinar(reglas: Iterable[ReglaGit]):
+        alternativas = [f"(?:{regla.regex})" for regla in reglas]
+        if not alternativas:
+            return None
+        return re.compile('(?:' + '|'.join(alternativas) + r')\Z', re.DOTALL)
+
+    def extender(self, nuevas: List[ReglaGit]) -> "ReglasGitignore":
+        """Reglas para un subdirectorio con archivos de ignorados propios (sin ellos se reutiliza este objeto)."""
+        return ReglasGitignore(self.reglas + nuevas) if nuevas else self
+
+    def comprobar(self, ruta_relativa: str, es_directorio: bool) -> Tuple[bool, Optional[str]]:
+        filtro = self._filtro_dirs if es_directorio else self._filtro_archivos
+        if filtro is None or filtro.match(ruta_relativa) is None:
+            return False, None
+        for indice in range(len(self.reglas) - 1, -1, -1):
+            regla = self.reglas[indice]
+            if regla.solo_dir and not es_directorio:
+                continue
+            if self._compiladas[indice].match(ruta_relativa):
+                if regla.negada:
+                    return False, None
+                return True, f"gitignore ({regla.patron} en {regla.origen})"
+        return False, None
+
+def cargar_reglas_raiz(directorio_raiz: str) -> ReglasGitignore:
+    """Reglas de menor precedencia: .git/info/exclude del proyecto (si existe)."""
+    ruta_exclude = os.path.join(directorio_raiz, RUTA_EXCLUDE_GIT)
+    if os.path.isfile(ruta_exclude):
+        return ReglasGitignore(leer_reglas_archivo(ruta_exclude, '', RUTA_EXCLUDE_GIT.replace(os.sep, '/')))
+    return ReglasGitignore([])
+
+def reglas_para_directorio(
+    reglas_padre: ReglasGitignore,
+    ruta_absoluta: str,
+    ruta_relativa: str,
+    nombres_entradas: Iterable[str]
+) -> ReglasGitignore:
+    """
+    Añade los archivos de ignorados del directorio (en orden de precedencia creciente).
+    El .ignore de la raíz no se lee aquí: es el archivo propio de ProyScan, con su sintaxis.
+    """
+    presentes = set(nombres_entradas)
+    nuevas: List[ReglaGit] = []
+    for nombre in ARCHIVOS_IGNORAR_GIT:
+        if nombre not in presentes or (nombre == ARCHIVO_IGNORAR and not ruta_relativa):
+            continue
+        origen = f"{ruta_relativa}/{nombre}" if ruta_relativa else nombre
+        nuevas.extend(leer_reglas_archivo(os.path.join(ruta_absoluta, nombre), ruta_relativa, origen))
+    return reglas_padre.extender(nuevas)
@@ -1,30 +1,153 @@
 # proyscan/ignore_handler.py
 import os
 import logging # Importar logging
-from typing import Set, Tuple, Optional
+from typing import Dict, Iterable, Iterator, Optional, Set, Tuple, Union
 from .config import ARCHIVO_IGNORAR, ARCHIVO_ESTRUCTURA, ARCHIVO_CONTENIDO
 
 # Obtener logger
 logger = logging.getLogger(__name__) # Usa 'proyscan.ignore_handler'
 
-def cargar_patrones_ignorar(ruta_archivo_ignore: str) -> Set[str]:
-    """Carga los patrones normalizados desde el archivo .ignore."""
-    patrones: Set[str] = set()
+_FIN_PATRON = '' # Clave del trie que marca el final de un patrón de directorio (ningún segmento real es '')
+
+class PatronesIgnorar:
+    """
+    Patrones del .ignore compilados en estructuras de búsqueda directa:
+      - conjuntos de rutas exactas y de nombres base (archivo / directorio),
+      - conjuntos de sufijos para '.ext' y '*.ext' (se prueba cada punto del nombre base),
+      - un trie por segmentos con los patrones de directorio (para los directorios padre).
+    Cada ruta se resuelve con unas pocas búsquedas en hash, sin recorrer los patrones.
+    Las decisiones y las razones son las mismas que las del recorrido lineal original.
+    """
+
+    def __init__(self, patrones: Iterable[str] = ()):
+        self.patrones: Set[str] = set()
+        self._exactos: Set[str] = set()
+        self._base_dir: Set[str] = set()
+        self._base_archivo: Set[str] = set()
+        self._extensiones: Set[str] = set() # '.pyc' -> sufijo '.pyc'
+        self._comodines_ext: Dict[str, str] = {} # sufijo -> patrón ('*.pyc' -> '.pyc')
+        self._trie_dirs: Dict[str, dict] = {}
+        for patron in patrones:
+            self.agregar(patron)
+
+    def agregar(self, patron: str):
+        """Añade un patrón ya normalizado ('dir/' para directorios)."""
+        if patron in self.patrones:
+            return
+        self.patrones.add(patron)
+        es_patron_dir = patron.endswith('/')
+        base_patron = patron.rstrip('/')
+
+        self._exactos.add(patron)
+        if '/' not in base_patron:
+            (self._base_dir if es_patron_dir else self._base_archivo).add(base_patron)
+        if not es_patron_dir and '/' not in patron:
+            if patron.startswith('.'):
+                self._extensiones.add(patron)
+            elif patron.startswith('*.'):
+                self._comodines_ext.setdefault(patron[1:], patron)
+        if es_patron_dir:
+            nodo = self._trie_dirs
+            for segmento in patron[:-1].split('/'):
+                nodo = nodo.setdefault(segmento, {})
+            nodo[_FIN_PATRON] = patron
+
+    def __len__(self) -> int:
+        return len(self.patrones)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.patrones)
+
+    def __contains__(self, patron: object) -> bool:
+        return patron in self.patrones
+
+    def _buscar_sufijo(self, nombre_base: str, sufijos) -> Optional[str]:
+        """Prueba cada sufijo del nombre base que empieza por '.' (del más largo al más corto)."""
+        indice = nombre_base.find('.')
+        while indice != -1:
+            sufijo = nombre_base[indice:]
+            if sufijo in sufijos:
+                return sufijo
+            indice = nombre_base.find('.', indice + 1)
+        return None
+
+    def _buscar_dir_padre(self, ruta_normalizada: str) -> Optional[str]:
+        """Patrón de directorio que es ancestro estricto de la ruta."""
+        # El último segmento no cuenta: un archivo no es padre, y el propio directorio es coincidencia exacta
+        nodo = self._trie_dirs
+        for segmento in ruta_normalizada.split('/')[:-1]:
+            nodo = nodo.get(segmento)
+            if nodo is None:
+                return None
+            if _FIN_PATRON in nodo:
+                return nodo[_FIN_PATRON]
+        return None
+
+    def comprobar(self, ruta_normalizada: str, es_directorio: bool, nombre_script_principal: Optional[str]) -> Tuple[bool, Optional[str]]:
+        """Como `debe_ignorar`, para una ruta ya normalizada (separador '/', sin './')."""
+        nombre_base = ruta_normalizada.rpartition('/')[2]
+
+        # Ignorar archivos propios
+        if nombre_script_principal and nombre_base == nombre_script_principal:
+            return True, "script"
+        if nombre_base == ARCHIVO_ESTRUCTURA:
+            return True, "salida_estructura"
+        if nombre_base == ARCHIVO_CONTENIDO:
+            return True, "salida_contenido"
+        if nombre_base == ARCHIVO_IGNORAR:
+            return True, "archivo_ignorar"
+        if not ruta_normalizada:
+            return False, None
+
+        # 1. Coincidencia exacta
+        ruta_comparacion = ruta_normalizada + '/' if es_directorio else ruta_normalizada
+        if ruta_comparacion in self._exactos:
+            return True, f"coincidencia_exacta ({ruta_comparacion})"
+
+        if es_directorio:
+            # 2. Coincidencia de nombre base (directorio)
+            if nombre_base in self._base_dir:
+                return True, f"coincidencia_base_dir ({nombre_base}/)"
+        else:
+            # 2. Coincidencia de nombre base (archivo)
+            if nombre_base in self._base_archivo:
+                return True, f"coincidencia_base_archivo ({nombre_base})"
+            # 3. Coincidencia de extensión ('.ext' y '*.ext')
+            if self._extensiones:
+                sufijo = self._buscar_sufijo(nombre_base, self._extensiones)
+                if sufijo is not None:
+                    return True, f"coincidencia_extension ({sufijo})"
+            if self._comodines_ext:
+                sufijo = self._buscar_sufijo(nombre_base, self._comodines_ext)
+                if sufijo is not None:
+                    return True, f"coincidencia_comodin_ext ({self._comodines_ext[sufijo]})"
+
+        # 4. Coincidencia de directorio padre
+        if self._trie_dirs and '/' in ruta_normalizada:
+            patron = self._buscar_dir_padre(ruta_normalizada)
+            if patron is not None:
+                return True, f"coincidencia_dir_padre ({patron})"
+
+        return False, None
+
+def cargar_patrones_ignorar(ruta_archivo_ignore: str) -> PatronesIgnorar:
+    """Carga los patrones normalizados desde el archivo .ignore y los compila."""
+    patrones = PatronesIgnorar()
     if os.path.exists(ruta_archivo_ignore):
         # Usar logger.info para mensajes normales
         logger.info(f"Cargando patrones de exclusión desde {os.path.basename(ruta_archivo_ignore)}...")
+        debug = logger.isEnabledFor(logging.DEBUG)
         try:
             with open(ruta_archivo_ignore, 'r', encoding='utf-8') as f:
                 for linea in f:
                     linea_limpia = linea.strip()
                     if linea_limpia and not linea_limpia.startswith('#'):
-                        # ... (lógica de normalización igual) ...
                         es_patron_dir = linea_limpia.endswith('/')
                         patron_normalizado = linea_limpia.strip('/')
                         if es_patron_dir: patron_normalizado += '/'
-                        patrones.add(patron_normalizado)
+                        patrones.agregar(patron_normalizado)
                         # Usar logger.debug para detalles finos
-                        logger.debug(f"  - Patrón ignore cargado: '{linea_limpia}' (Normalizado: '{patron_normalizado}')")
+                        if debug: logger.debug(f"  - Patrón ignore cargado: '{linea_limpia}' (Normalizado: '{patron_normalizado}')")
         except Exception as e:
              # Usar logger.warning para advertencias
             logger.warning(f"No se pudo leer {os.path.basename(ruta_archivo_ignore)}. Error: {e}")
@@ -33,75 +156,15 @@ def cargar_patrones_ignorar(ruta_archivo_ignore: str) -> Set[str]:
         logger.warning(f"No se encontró {os.path.basename(ruta_archivo_ignore)}. No se excluirá nada automáticamente.")
     return patrones
 
-def debe_ignorar(ruta_relativa: str, es_directorio: bool, patrones: Set[str], nombre_script_principal: Optional[str]) -> Tuple[bool, Optional[str]]:
+def debe_ignorar(ruta_relativa: str, es_directorio: bool, patrones: Union[PatronesIgnorar, Set[str]], nombre_script_principal: Optional[str]) -> Tuple[bool, Optional[str]]:
     """Comprueba si la ruta relativa coincide con algún patrón de ignorar."""
-    # --- Logging al inicio ---
-    logger.debug(f"--- debe_ignorar ---")
-    logger.debug(f"Comprobando: '{ruta_relativa}' (es_dir={es_directorio})")
-    logger.debug(f"Patrones a comprobar: {patrones}")
-    # ------------------------
+    if not isinstance(patrones, PatronesIgnorar):
+        patrones = PatronesIgnorar(patrones)
 
     ruta_normalizada = os.path.normpath(ruta_relativa).replace(os.sep, '/')
     if ruta_normalizada == '.': ruta_normalizada = ''
 
-    nombre_base = os.path.basename(ruta_normalizada) if ruta_normalizada else ''
-
-    # Ignorar archivos propios (con logging)
-    if nombre_script_principal and nombre_base == nombre_script_principal:
-        logger.debug(f"  -> Ignorado por ser script principal.")
-        return True, "script"
-    if nombre_base == ARCHIVO_ESTRUCTURA:
-        logger.debug(f"  -> Ignorado por ser archivo de estructura.")
-        return True, "salida_estructura"
-    if nombre_base == ARCHIVO_CONTENIDO:
-        logger.debug(f"  -> Ignorado por ser archivo de contenido.")
-        return True, "salida_contenido"
-    if nombre_base == ARCHIVO_IGNORAR:
-        logger.debug(f"  -> Ignorado por ser archivo ignore.")
-        return True, "archivo_ignorar"
-
-    ruta_comparacion = ruta_normalizada
-    if es_directorio and ruta_normalizada and not ruta_normalizada.endswith('/'):
-        ruta_comparacion += '/'
-    logger.debug(f"  Ruta para comparación: '{ruta_comparacion}'") # DEBUG
-
-    for patron in patrones:
-        es_patron_dir = patron.endswith('/')
-        base_patron = patron.rstrip('/')
-        logger.debug(f"  Comparando con patrón: '{patron}'") # DEBUG
-
-        # 1. Coincidencia exacta
-        if ruta_comparacion == patron:
-            logger.debug(f"    -> Coincidencia exacta!") # DEBUG
-            return True, f"coincidencia_exacta ({patron})"
-
-        # 2. Coincidencia de nombre base
-        if '/' not in base_patron:
-            nombre_base_actual = os.path.basename(ruta_normalizada)
-            if nombre_base_actual:
-                if es_patron_dir and es_directorio and nombre_base_actual == base_patron:
-                    logger.debug(f"    -> Coincidencia nombre base directorio!")
-                    return True, f"coincidencia_base_dir ({patron})"
-                if not es_patron_dir and not es_directorio and nombre_base_actual == base_patron:
-                    logger.debug(f"    -> Coincidencia nombre base archivo!")
-                    return True, f"coincidencia_base_archivo ({patron})"
-
-        # 3. Coincidencia de extensión
-        if not es_directorio and not es_patron_dir and '/' not in patron:
-            if patron.startswith('.') and ruta_normalizada.endswith(patron):
-                 logger.debug(f"    -> Coincidencia extensión!")
-                 return True, f"coincidencia_extension ({patron})"
-            if patron.startswith('*.'):
-                extension_patron = patron[1:]
-                if ruta_normalizada.endswith(extension_patron):
-                    logger.debug(f"    -> Coincidencia extensión comodín!")
-                    return True, f"coincidencia_comodin_ext ({patron})"
-
-        # 4. Coincidencia de directorio padre
-        if es_patron_dir and ruta_comparacion.startswith(patron) and len(ruta_comparacion) > len(patron):
-             logger.debug(f"    -> Coincidencia directorio padre!")
-             return True, f"coincidencia_dir_padre ({patron})"
-        
-    logger.debug(f"  -> No ignorado por ningún patrón.") # DEBUG
-    logger.debug(f"No ignorado: '{ruta_normalizada}'") # DEBUG final si no coincide
-    return False, None
\ No newline at end of file
+    ignorar, razon = patrones.comprobar(ruta_normalizada, es_directorio, nombre_script_principal)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"debe_ignorar: '{ruta_normalizada}' (es_dir={es_directorio}) -> {razon if ignorar else 'no ignorado'}")
+    return ignorar, razon
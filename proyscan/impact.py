@@ -0,0 +1,126 @@
+# proyscan/impact.py
+# Subcomando `impact`: qué archivos dependen, directa o transitivamente, de los archivos dados.
+# Solo carga el grafo compacto del escaneo (dependency_graph.bin), no contenido_archivos.json.
+import os
+import sys
+import json
+import logging
+import argparse
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .config import ARCHIVO_GRAFO, ARCHIVO_GRAFO_COMPACTO, ARCHIVO_INFO
+from .dependency_graph import GrafoDependencias, cargar_grafo, cargar_grafo_compacto
+from .utils.path_utils import normalizar_ruta
+
+logger = logging.getLogger(__name__) # Usa 'proyscan.impact'
+
+
+def cargar_grafo_escaneo(directorio_escaneo: str) -> Optional[GrafoDependencias]:
+    """Grafo de un escaneo: el sidecar binario o, en escaneos sin él, dependency_graph.json."""
+    ruta_compacta = os.path.join(directorio_escaneo, ARCHIVO_GRAFO_COMPACTO)
+    if os.path.isfile(ruta_compacta):
+        return cargar_grafo_compacto(ruta_compacta)
+    ruta_json = os.path.join(directorio_escaneo, ARCHIVO_GRAFO)
+    if os.path.isfile(ruta_json):
+        logger.debug(f"Sin {ARCHIVO_GRAFO_COMPACTO}; se carga {ARCHIVO_GRAFO}.")
+        return cargar_grafo(ruta_json)
+    return None
+
+
+def ruta_proyecto_original(directorio_escaneo: str) -> Optional[str]:
+    try:
+        with open(os.path.join(directorio_escaneo, ARCHIVO_INFO), 'r', encoding='utf-8') as f:
+            return json.load(f).get("original_project_path")
+    except (OSError, ValueError):
+        return None
+
+
+def resolver_objetivos(grafo: GrafoDependencias, rutas: Sequence[str], raiz_proyecto: Optional[str]) -> Tuple[List[int], List[str]]:
+    """
+    IDs de los archivos pedidos y rutas no encontradas. Acepta rutas relativas al proyecto,
+    absolutas dentro del proyecto escaneado y directorios (todos los archivos bajo ellos).
+    """
+    ids: List[int] = []
+    desconocidas: List[str] = []
+    for ruta in rutas:
+        relativa = os.path.relpath(ruta, os.path.abspath(raiz_proyecto)) if os.path.isabs(ruta) and raiz_proyecto else ruta
+        ruta_norm = normalizar_ruta(relativa.replace('\\', '/'))
+        if ruta_norm.startswith('./'):
+            ruta_norm = ruta_norm[2:]
+        id_nodo = grafo.ids.get(ruta_norm)
+        if id_nodo is not None:
+            ids.append(id_nodo)
+            continue
+        prefijo = '' if ruta_norm == '.' else ruta_norm.rstrip('/') + '/'
+        bajo_directorio = [i for i, r in enumerate(grafo.rutas) if r.startswith(prefijo)]
+        if bajo_directorio:
+            ids.extend(bajo_directorio)
+        else:
+            desconocidas.append(ruta)
+    return ids, desconocidas
+
+
+def analizar_impacto(grafo: GrafoDependencias, ids: Sequence[int], profundidad_max: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Archivos afectados ordenados por (depth, path), con el archivo por el que les llega el cambio."""
+    rutas = grafo.rutas
+    filas = sorted((profundidad, rutas[id_nodo], rutas[via]) for id_nodo, profundidad, via in grafo.afectados(ids, profundidad_max))
+    return [{"path": ruta, "depth": profundidad, "via": via} for profundidad, ruta, via in filas]
+
+
+def ejecutar_impacto(argumentos: Sequence[str]) -> int:
+    """Punto de entrada de `proyscan.py impact`; devuelve el código de salida."""
+    parser = argparse.ArgumentParser(
+        prog="proyscan.py impact",
+        description="Archivos que dependen, directa o transitivamente, de los archivos indicados."
+    )
+    parser.add_argument("scan_directory", metavar="DIRECTORIO_ESCANEO", help="Carpeta de resultados de un escaneo.")
+    parser.add_argument("paths", metavar="RUTA", nargs='+', help="Archivos o directorios, relativos al proyecto escaneado.")
+    parser.add_argument("--format", choices=("text", "json"), default="text", help="Formato de salida (por defecto: text).")
+    parser.add_argument("--max-depth", metavar="N", type=int, default=None, help="Profundidad máxima de la búsqueda (1 = solo importadores directos).")
+    args = parser.parse_args(argumentos)
+
+    try:
+        grafo = cargar_grafo_escaneo(args.scan_directory)
+    except (OSError, ValueError) as e:
+        logger.error(f"No se pudo cargar el grafo de '{args.scan_directory}': {e}")
+        return 1
+    if grafo is None:
+        logger.error(f"'{args.scan_directory}' no contiene {ARCHIVO_GRAFO_COMPACTO} ni {ARCHIVO_GRAFO}. Vuelve a escanear el proyecto.")
+        return 1
+
+    ids, desconocidas = resolver_objetivos(grafo, args.paths, ruta_proyecto_original(args.scan_directory))
+    for ruta in desconocidas:
+        logger.warning(f"'{ruta}' no está en el escaneo.")
+    if not ids:
+        return 1
+    afectados = analizar_impacto(grafo, ids, args.max_depth)
+    try:
+        _escribir_resultado(grafo, ids, desconocidas, afectados, args.format, args.max_depth)
+    except BrokenPipeError: # Salida cortada (| head): no es un error
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+    return 0
+
+
+def _escribir_resultado(
+    grafo: GrafoDependencias,
+    ids: Sequence[int],
+    desconocidas: List[str],
+    afectados: List[Dict[str, Any]],
+    formato: str,
+    profundidad_max: Optional[int]
+):
+    # Una sola escritura: con cientos de miles de afectados, escribir por líneas domina el tiempo
+    objetivos = sorted({grafo.rutas[id_nodo] for id_nodo in ids})
+    if formato == "json":
+        salida = json.dumps({
+            "targets": objetivos,
+            "unknown": desconocidas,
+            "max_depth": profundidad_max,
+            "count": len(afectados),
+            "affected": afectados,
+        }, ensure_ascii=False) # Sin indent: el codificador en C
+    else:
+        lineas = [f"{len(afectados)} archivos afectados por: {', '.join(objetivos)}"]
+        lineas.extend(f"{afectado['depth']:>4}  {afectado['path']}  (<- {afectado['via']})" for afectado in afectados)
+        salida = "\n".join(lineas)
+    sys.stdout.write(salida + "\n")
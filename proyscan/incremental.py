@@ -0,0 +1,132 @@
+# proyscan/incremental.py
+# Re-escaneo incremental: reutiliza los resultados de un escaneo anterior para los
+# archivos cuya huella (tamaño, mtime, hash de contenido) no ha cambiado.
+import os
+import json
+import hashlib
+import logging
+from functools import lru_cache
+from typing import Dict, Iterator, Optional, Set
+
+from . import __version__
+from .config import ARCHIVO_CONTENIDO, ARCHIVO_MANIFIESTO
+from .content_stream import iterar_objetos_contenido
+from .models import FileObject, Fingerprint, ScanManifest
+
+logger = logging.getLogger(__name__) # Usa 'proyscan.incremental'
+
+VERSION_MANIFIESTO = 2
+TAMANO_BLOQUE_HASH = 1024 * 1024
+DIRECTORIO_PAQUETE = os.path.dirname(os.path.abspath(__file__))
+
+def calcular_hash_bytes(datos: bytes) -> str:
+    """Hash del contenido de un archivo (blake2b de 128 bits, en hex)."""
+    return hashlib.blake2b(datos, digest_size=16).hexdigest()
+
+def calcular_hash_archivo(ruta_completa: str) -> str:
+    """Calcula el hash de contenido leyendo el archivo por bloques."""
+    h = hashlib.blake2b(digest_size=16)
+    with open(ruta_completa, 'rb') as f:
+        for bloque in iter(lambda: f.read(TAMANO_BLOQUE_HASH), b''):
+            h.update(bloque)
+    return h.hexdigest()
+
+@lru_cache(maxsize=None)
+def huella_analizadores() -> str:
+    """
+    Hash del código fuente de proyscan (rutas y contenido de cada .py). `__version__` no cambia
+    con cada cambio de los parsers, así que es esto lo que invalida los objetos de un escaneo
+    previo cuando cambia cómo se generan.
+    """
+    h = hashlib.blake2b(__version__.encode('utf-8'), digest_size=16)
+    for raiz, subdirectorios, nombres in os.walk(DIRECTORIO_PAQUETE):
+        subdirectorios[:] = sorted(d for d in subdirectorios if d != '__pycache__')
+        for nombre in sorted(n for n in nombres if n.endswith('.py')):
+            ruta = os.path.join(raiz, nombre)
+            h.update(os.path.relpath(ruta, DIRECTORIO_PAQUETE).replace(os.sep, '/').encode('utf-8') + b'\0')
+            h.update(calcular_hash_archivo(ruta).encode('ascii'))
+    return h.hexdigest()
+
+def _misma_ruta(a: str, b: str) -> bool:
+    return os.path.normcase(os.path.realpath(a)) == os.path.normcase(os.path.realpath(b))
+
+class EscaneoPrevio:
+    """
+    Huellas y objetos de archivo de un escaneo anterior.
+    Los objetos se leen en streaming del contenido_archivos.json previo (ordenado por ruta),
+    por lo que `obtener` debe llamarse con rutas en orden creciente.
+    """
+
+    def __init__(self, directorio: str, huellas: Dict[str, Fingerprint], ruta_contenido: str):
+        self.directorio = directorio
+        self.huellas = huellas
+        self._objetos: Optional[Iterator[FileObject]] = iterar_objetos_contenido(ruta_contenido)
+        self._actual: Optional[FileObject] = None
+        self._avanzar()
+
+    @property
+    def archivos(self) -> Set[str]:
+        return set(self.huellas)
+
+    def _avanzar(self):
+        try:
+            self._actual = next(self._objetos) if self._objetos else None
+        except StopIteration:
+            self._actual = None
+        except Exception as e:
+            logger.warning(f"Error leyendo el contenido del escaneo previo ({e}). No se reutilizarán más archivos.")
+            self._actual = None
+            self._objetos = None
+
+    def obtener(self, ruta_relativa: str) -> Optional[FileObject]:
+        """Devuelve el objeto previo reutilizable (sin referencias inversas, se recalculan)."""
+        while self._actual is not None and self._actual["metadata"]["path"] < ruta_relativa:
+            self._avanzar()
+        if self._actual is None or self._actual["metadata"]["path"] != ruta_relativa:
+            return None
+        objeto = self._actual
+        self._avanzar()
+        objeto["metadata"]["referenced_by"] = None
+        return objeto
+
+def cargar_escaneo_previo(directorio_previo: str, directorio_objetivo: str) -> Optional[EscaneoPrevio]:
+    """
+    Carga el manifiesto de un escaneo anterior y prepara la lectura de su contenido.
+    Devuelve None (escaneo completo) si falta algo, el manifiesto no es compatible (otra versión
+    del formato o de los analizadores) o corresponde a otro proyecto.
+    """
+    ruta_manifiesto = os.path.join(directorio_previo, ARCHIVO_MANIFIESTO)
+    ruta_contenido = os.path.join(directorio_previo, ARCHIVO_CONTENIDO)
+    if not os.path.isfile(ruta_manifiesto) or not os.path.isfile(ruta_contenido):
+        logger.warning(f"El escaneo previo '{directorio_previo}' no tiene {ARCHIVO_MANIFIESTO} o {ARCHIVO_CONTENIDO}. Se hará un escaneo completo.")
+        return None
+    try:
+        with open(ruta_manifiesto, 'r', encoding='utf-8') as f:
+            manifiesto: ScanManifest = json.load(f)
+        if (manifiesto.get("version") != VERSION_MANIFIESTO or manifiesto.get("proyscan_version") != __version__
+                or manifiesto.get("analyzer_fingerprint") != huella_analizadores()):
+            logger.warning(f"Manifiesto de '{directorio_previo}' generado por otra versión. Se hará un escaneo completo.")
+            return None
+        ruta_proyecto = manifiesto.get("project_path")
+        if not isinstance(ruta_proyecto, str) or not _misma_ruta(ruta_proyecto, directorio_objetivo):
+            logger.warning(f"El escaneo previo '{directorio_previo}' es de otro proyecto ({ruta_proyecto}). Se hará un escaneo completo.")
+            return None
+        previo = EscaneoPrevio(directorio_previo, manifiesto.get("files", {}), ruta_contenido)
+    except Exception as e:
+        logger.warning(f"No se pudo cargar el escaneo previo '{directorio_previo}': {e}. Se hará un escaneo completo.")
+        return None
+
+    logger.info(f"Escaneo previo cargado: {len(previo.huellas)} archivos en {directorio_previo}")
+    return previo
+
+def guardar_manifiesto(ruta_manifiesto: str, directorio_objetivo: str, huellas: Dict[str, Fingerprint]):
+    """Escribe el manifiesto de huellas del escaneo actual."""
+    manifiesto: ScanManifest = {
+        "version": VERSION_MANIFIESTO,
+        "proyscan_version": __version__,
+        "analyzer_fingerprint": huella_analizadores(),
+        "project_path": directorio_objetivo,
+        "files": {ruta: huellas[ruta] for ruta in sorted(huellas)},
+    }
+    with open(ruta_manifiesto, 'w', encoding='utf-8') as f:
+        json.dump(manifiesto, f, ensure_ascii=False)
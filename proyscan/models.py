@@ -35,4 +35,32 @@ class ScanInfo(TypedDict):
     scan_timestamp: str # ISO 8601 format
     scan_id: str
     output_directory: str
-    parameters_used: Dict[str, Any] # ej: {'debug_mode': True, 'ignore_file_used': 'temporal'}
\ No newline at end of file
+    parameters_used: Dict[str, Any] # ej: {'debug_mode': True, 'ignore_file_used': 'temporal'}
+    timing: Dict[str, Any] # Resumen de tiempos: total_ms, spans (por fase/parser/archivo) y slowest_files
+    stats: Dict[str, Any] # Contadores del escaneo: reference_cache (hits, misses, hit_rate) y dependency_graph (nodes, edges, cycles)
+
+# Grafo de dependencias internas (dependency_graph.json). Las listas de `metrics` van en paralelo
+# a `nodes` (índice = ID del archivo); las aristas salientes del ID i son targets[offsets[i]:offsets[i + 1]]
+class DependencyGraph(TypedDict):
+    node_count: int
+    edge_count: int
+    nodes: List[str]
+    offsets: List[int]
+    targets: List[int]
+    metrics: Dict[str, List[int]] # fan_in, fan_out, scc, layer, transitive_dependencies, transitive_dependents
+    cycles: List[List[str]] # Componentes fuertemente conexas con ciclo, las mayores primero
+    layer_count: int
+
+# Huella de un archivo para re-escaneos incrementales
+class Fingerprint(TypedDict):
+    size: int
+    mtime_ns: int
+    hash: Optional[str] # None si no se leyó el contenido (binario, demasiado grande...)
+
+# Manifiesto guardado junto a scan_info.json
+class ScanManifest(TypedDict):
+    version: int
+    proyscan_version: str
+    analyzer_fingerprint: str
+    project_path: str
+    files: Dict[str, Fingerprint]
\ No newline at end of file
@@ -0,0 +1,147 @@
+# proyscan/tracing.py
+# Instrumentación de tiempos por fase, por archivo y por parser. Los agregados van siempre
+# a scan_info.json; los tramos individuales solo se guardan si se pide una traza
+# (formato Chrome Trace / Perfetto, un tramo por archivo).
+import os
+import json
+import time
+import heapq
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__) # Usa 'proyscan.tracing'
+
+NUM_ARCHIVOS_LENTOS = 10
+
+# Evento de la traza: (nombre, categoría, inicio_ns, duración_ns, pid, tid, args)
+EventoTraza = Tuple[str, str, int, int, int, int, Optional[Dict[str, Any]]]
+
+class Trazador:
+    """
+    Acumula, por nombre de tramo, número de veces, tiempo total y máximo, y contadores sueltos
+    (aciertos de cachés...).
+    Con `registrar_eventos` guarda además cada tramo para exportarlo como traza.
+    Los trazadores de los procesos trabajadores se vacían con `extraer` y se
+    fusionan en el del proceso principal con `fusionar`.
+    """
+
+    def __init__(self, registrar_eventos: bool = False, origen_ns: Optional[int] = None):
+        self.registrar_eventos = registrar_eventos
+        self.origen_ns = origen_ns if origen_ns is not None else time.perf_counter_ns()
+        self.agregados: Dict[str, List[Any]] = {} # nombre -> [categoría, veces, total_ns, max_ns]
+        self.eventos: List[EventoTraza] = []
+        self.archivos_lentos: List[Tuple[int, str]] = [] # Montículo de (duración_ns, ruta)
+        self.contadores: Dict[str, int] = {}
+
+    def acumular(self, nombre: str, categoria: str, duracion_ns: int, veces: int = 1):
+        """
+        Suma a los agregados sin registrar un evento (para mediciones muy frecuentes).
+        Con `veces` > 1 la duración es un total, así que no cuenta para el máximo.
+        """
+        maximo = duracion_ns if veces == 1 else 0
+        agregado = self.agregados.get(nombre)
+        if agregado is None:
+            self.agregados[nombre] = [categoria, veces, duracion_ns, maximo]
+        else:
+            agregado[1] += veces
+            agregado[2] += duracion_ns
+            if maximo > agregado[3]:
+                agregado[3] = maximo
+
+    def contar(self, nombre: str, cantidad: int = 1):
+        self.contadores[nombre] = self.contadores.get(nombre, 0) + cantidad
+
+    def registrar(self, nombre: str, categoria: str, inicio_ns: int, duracion_ns: int, args: Optional[Dict[str, Any]] = None):
+        self.acumular(nombre, categoria, duracion_ns)
+        if categoria == "file" and args and "path" in args:
+            elemento = (duracion_ns, args["path"])
+            if len(self.archivos_lentos) < NUM_ARCHIVOS_LENTOS:
+                heapq.heappush(self.archivos_lentos, elemento)
+            elif elemento > self.archivos_lentos[0]:
+                heapq.heapreplace(self.archivos_lentos, elemento)
+        if self.registrar_eventos:
+            self.eventos.append((nombre, categoria, inicio_ns, duracion_ns, os.getpid(), threading.get_ident(), args))
+
+    @contextmanager
+    def tramo(self, nombre: str, categoria: str = "phase", **args: Any) -> Iterator[None]:
+        inicio = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.registrar(nombre, categoria, inicio, time.perf_counter_ns() - inicio, args or None)
+
+    def extraer(self) -> Dict[str, Any]:
+        """Devuelve lo acumulado (para enviarlo al proceso principal) y vacía el trazador."""
+        datos = {"agregados": self.agregados, "eventos": self.eventos, "archivos_lentos": self.archivos_lentos, "contadores": self.contadores}
+        self.agregados, self.eventos, self.archivos_lentos, self.contadores = {}, [], [], {}
+        return datos
+
+    def fusionar(self, datos: Dict[str, Any]):
+        for nombre, (categoria, veces, total_ns, max_ns) in datos["agregados"].items():
+            agregado = self.agregados.get(nombre)
+            if agregado is None:
+                self.agregados[nombre] = [categoria, veces, total_ns, max_ns]
+            else:
+                agregado[1] += veces
+                agregado[2] += total_ns
+                agregado[3] = max(agregado[3], max_ns)
+        self.eventos.extend(datos["eventos"])
+        for nombre, cantidad in datos["contadores"].items():
+            self.contar(nombre, cantidad)
+        for elemento in datos["archivos_lentos"]:
+            if len(self.archivos_lentos) < NUM_ARCHIVOS_LENTOS:
+                heapq.heappush(self.archivos_lentos, elemento)
+            elif elemento > self.archivos_lentos[0]:
+                heapq.heapreplace(self.archivos_lentos, elemento)
+
+    def resumen(self) -> Dict[str, Any]:
+        """Tabla para scan_info.json: tiempos por tramo (ms) y archivos más lentos."""
+        filas = sorted(self.agregados.items(), key=lambda item: item[1][2], reverse=True)
+        return {
+            "total_ms": round((time.perf_counter_ns() - self.origen_ns) / 1e6, 3),
+            "spans": {
+                nombre: {
+                    "category": categoria,
+                    "count": veces,
+                    "total_ms": round(total_ns / 1e6, 3),
+                    "max_ms": round(max_ns / 1e6, 3) if max_ns else None,
+                }
+                for nombre, (categoria, veces, total_ns, max_ns) in filas
+            },
+            "slowest_files": [
+                {"path": ruta, "ms": round(duracion_ns / 1e6, 3)}
+                for duracion_ns, ruta in sorted(self.archivos_lentos, reverse=True)
+            ],
+        }
+
+    def escribir_traza(self, ruta_salida: str):
+        """Exporta los tramos en formato Chrome Trace (chrome://tracing, ui.perfetto.dev)."""
+        with open(ruta_salida, 'w', encoding='utf-8') as f:
+            f.write('{"displayTimeUnit": "ms", "traceEvents": [')
+            for indice, (nombre, categoria, inicio_ns, duracion_ns, pid, tid, args) in enumerate(self.eventos):
+                evento: Dict[str, Any] = {
+                    "name": nombre, "cat": categoria, "ph": "X",
+                    "ts": (inicio_ns - self.origen_ns) / 1000, "dur": duracion_ns / 1000,
+                    "pid": pid, "tid": tid,
+                }
+                if args:
+                    evento["args"] = args
+                f.write((',\n' if indice else '\n') + json.dumps(evento, ensure_ascii=False, default=str))
+            f.write('\n]}\n')
+
+# Trazador activo en este proceso (cada trabajador del pool instala el suyo)
+_trazador_actual = Trazador()
+
+def obtener_trazador() -> Trazador:
+    return _trazador_actual
+
+def instalar_trazador(trazador: Trazador) -> Trazador:
+    global _trazador_actual
+    _trazador_actual = trazador
+    return trazador
+
+def tramo(nombre: str, categoria: str = "phase", **args: Any):
+    """Atajo: tramo en el trazador activo."""
+    return _trazador_actual.tramo(nombre, categoria, **args)
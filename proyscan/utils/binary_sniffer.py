@@ -0,0 +1,85 @@
+# proyscan/utils/binary_sniffer.py
+# Detección de binarios por contenido (firmas + proporción de bytes de control) sobre el
+# primer bloque del archivo, antes de intentar decodificarlo como texto.
+import os
+import codecs
+import logging
+from typing import Dict, Iterable, List, Optional, Set
+
+from ..config import EXTENSIONES_BINARIAS, MAPA_LENGUAJES, MUESTRAS_BINARIO_POR_EXTENSION
+
+logger = logging.getLogger(__name__) # Usa 'proyscan.utils.binary_sniffer'
+
+TAMANO_BLOQUE_SNIFF = 8 * 1024
+MAX_PROPORCION_CONTROL = 0.30 # Más de un 30% de bytes de control en el bloque -> binario
+
+# (desplazamiento, firma, nombre) de formatos binarios habituales. Solo firmas que no pueden
+# ser el principio de un texto; el resto de formatos los delatan los bytes nulos o de control.
+FIRMAS_BINARIAS = (
+    (0, b'\x89PNG\r\n\x1a\n', 'PNG'),
+    (0, b'\xff\xd8\xff', 'JPEG'),
+    (0, b'%PDF-', 'PDF'),
+    (0, b'PK\x03\x04', 'ZIP'), (0, b'PK\x05\x06', 'ZIP'),
+    (0, b'\x1f\x8b', 'gzip'),
+    (0, b'\xfd7zXZ\x00', 'xz'),
+    (0, b'7z\xbc\xaf\x27\x1c', '7z'),
+    (0, b'Rar!\x1a\x07', 'RAR'),
+    (0, b'\x28\xb5\x2f\xfd', 'zstd'),
+    (0, b'\x7fELF', 'ELF'),
+    (0, b'\xcf\xfa\xed\xfe', 'Mach-O'), (0, b'\xce\xfa\xed\xfe', 'Mach-O'),
+    (0, b'\xca\xfe\xba\xbe', 'Java class/Mach-O fat'),
+    (0, b'\x00asm', 'WebAssembly'),
+    (0, b'SQLite format 3\x00', 'SQLite'),
+    (0, b'\x89HDF\r\n\x1a\n', 'HDF5'),
+    (0, b'\x93NUMPY', 'NumPy'),
+    (0, b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1', 'OLE2'),
+)
+
+# Bytes que aparecen en texto: imprimibles ASCII, espacios habituales y todo el rango alto (UTF-8 / latin-1)
+_BYTES_TEXTO = bytes([7, 8, 9, 10, 11, 12, 13, 27]) + bytes(range(0x20, 0x7f)) + bytes(range(0x80, 0x100))
+_BOMS_UNICODE = (codecs.BOM_UTF8, codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE) # UTF-32 empieza igual que UTF-16
+
+def detectar_binario(bloque: bytes) -> Optional[str]:
+    """
+    Examina el primer bloque de un archivo. Devuelve la razón si parece binario, o None si parece texto.
+    """
+    if not bloque or bloque.startswith(_BOMS_UNICODE):
+        return None # Vacío o texto Unicode con BOM (UTF-16/32 contiene NULs legítimos)
+    for desplazamiento, firma, nombre in FIRMAS_BINARIAS:
+        if bloque.startswith(firma, desplazamiento):
+            return f"firma {nombre}"
+    if b'\x00' in bloque:
+        return "bytes nulos"
+    bytes_control = len(bloque.translate(None, _BYTES_TEXTO))
+    if bytes_control > len(bloque) * MAX_PROPORCION_CONTROL:
+        return f"{bytes_control * 100 // len(bloque)}% de bytes de control"
+    return None
+
+def detectar_binario_archivo(ruta_completa: str) -> Optional[str]:
+    """Lee solo el primer bloque del archivo y aplica `detectar_binario`."""
+    with open(ruta_completa, 'rb') as fb:
+        return detectar_binario(fb.read(TAMANO_BLOQUE_SNIFF))
+
+def detectar_extensiones_binarias(rutas_ordenadas: Iterable[str], directorio_objetivo: str) -> Set[str]:
+    """
+    Decide qué extensiones no listadas son binarias en ESTE proyecto: por cada extensión desconocida
+    se examinan los primeros archivos (en orden de ruta). Si todos los de la muestra son binarios,
+    el resto de archivos con esa extensión se marcan como binarios sin abrirlos.
+    Se calcula en el proceso principal para que el resultado no dependa del reparto entre procesos.
+    """
+    muestras: Dict[str, List[bool]] = {}
+    for ruta in rutas_ordenadas:
+        extension = os.path.splitext(ruta)[1].lower()
+        if not extension or extension in EXTENSIONES_BINARIAS or extension in MAPA_LENGUAJES:
+            continue
+        veredictos = muestras.setdefault(extension, [])
+        if len(veredictos) >= MUESTRAS_BINARIO_POR_EXTENSION or (veredictos and not veredictos[-1]):
+            continue # Muestra completa, o ya se vio un archivo de texto con esta extensión
+        try:
+            veredictos.append(detectar_binario_archivo(os.path.join(directorio_objetivo, ruta.replace('/', os.sep))) is not None)
+        except OSError:
+            veredictos.append(False) # procesar_archivo registrará el error
+    binarias = {extension for extension, veredictos in muestras.items() if veredictos and all(veredictos)}
+    if binarias:
+        logger.info(f"Extensiones detectadas como binarias por contenido: {', '.join(sorted(binarias))}")
+    return binarias
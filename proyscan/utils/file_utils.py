@@ -1,86 +1,94 @@
 # proyscan/utils/file_utils.py
+import mmap
 import codecs
 import chardet
 import logging # Importar
 from typing import Tuple, List, Optional
 
-from ..config import MAX_TAMANO_BYTES_TEXTO, MAX_TAMANO_MB_TEXTO
+from ..config import (
+    MAX_TAMANO_BYTES_TEXTO, MAX_TAMANO_MB_TEXTO, TAMANO_REGION_CABECERA_BYTES,
+    LINEAS_EXTRACTO_INICIO, LINEAS_EXTRACTO_FINAL
+)
+from .binary_sniffer import TAMANO_BLOQUE_SNIFF, detectar_binario
 
 # Obtener logger
 logger = logging.getLogger(__name__) # Usa 'proyscan.utils.file_utils'
 
 ReadResult = Tuple[str, Optional[str], Optional[List[str]] | str]
 
-def leer_lineas_texto(ruta_completa: str, tamano_bytes: int) -> ReadResult:
-    """
-    Intenta leer el contenido como texto y devuelve lista de líneas.
-    """
-    logger.debug(f"Intentando leer archivo: {ruta_completa} (Tamaño: {tamano_bytes} bytes)") # DEBUG
-    if tamano_bytes == 0:
-        logger.debug("Archivo vacío.") # DEBUG
-        return "ok", "empty", []
-    if tamano_bytes > MAX_TAMANO_BYTES_TEXTO:
-        msg = f"Tamaño ({tamano_bytes / 1024 / 1024:.2f} MB) excede límite ({MAX_TAMANO_MB_TEXTO} MB)"
-        logger.warning(f"{msg} en archivo {ruta_completa}") # WARNING
-        return "too_large", None, msg
+# BOMs reconocidos en la vía rápida (UTF-32 antes que UTF-16: comparten prefijo).
+# Los nombres coinciden con los que devolvía chardet para estos casos.
+BOMS_CONOCIDOS = (
+    (codecs.BOM_UTF8, 'UTF-8-SIG'),
+    (codecs.BOM_UTF32_LE, 'UTF-32'),
+    (codecs.BOM_UTF32_BE, 'UTF-32'),
+    (codecs.BOM_UTF16_LE, 'UTF-16'),
+    (codecs.BOM_UTF16_BE, 'UTF-16'),
+)
+CODIFICACIONES_FALLBACK = ['utf-8', 'cp1252', 'latin-1']
+TAMANO_MUESTRA_CHARDET = 64 * 1024
+
+def _decodificar_rapido(datos: bytes) -> Tuple[Optional[str], Optional[str]]:
+    """Vía rápida sin chardet: ASCII puro, BOM o UTF-8 estricto. Devuelve (codificación, texto) o (None, None)."""
+    if datos.isascii():
+        return 'ascii', datos.decode('ascii')
+    for bom, codificacion in BOMS_CONOCIDOS:
+        if datos.startswith(bom):
+            try:
+                return codificacion, datos.decode(codificacion)
+            except UnicodeDecodeError:
+                return None, None
+    try:
+        return 'utf-8', datos.decode('utf-8')
+    except UnicodeDecodeError:
+        return None, None
 
+def _decodificar_con_chardet(datos: bytes, ruta_completa: str) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+    """Vía lenta: chardet sobre los primeros 64 KB y después la lista de respaldo. Devuelve (codificación, texto, error)."""
     codificacion_detectada: Optional[str] = None
     mensaje_error: Optional[str] = None
-
-    # Detección de codificación
     try:
-        with open(ruta_completa, 'rb') as fb:
-            fragmento = fb.read(min(tamano_bytes, 64 * 1024))
-            resultado = chardet.detect(fragmento)
-            codificacion_detectada = resultado['encoding']
-            confianza = resultado['confidence']
-            logger.debug(f"Chardet detectó: {codificacion_detectada} (Confianza: {confianza:.2f})") # DEBUG
-            if codificacion_detectada is None or confianza < 0.6:
-                logger.debug("Confianza baja o sin detección, forzando fallback.") # DEBUG
-                codificacion_detectada = None
+        resultado = chardet.detect(datos[:TAMANO_MUESTRA_CHARDET])
+        codificacion_detectada = resultado['encoding']
+        confianza = resultado['confidence']
+        logger.debug(f"Chardet detectó: {codificacion_detectada} (Confianza: {confianza:.2f})") # DEBUG
+        if codificacion_detectada is None or confianza < 0.6:
+            logger.debug("Confianza baja o sin detección, forzando fallback.") # DEBUG
+            codificacion_detectada = None
     except Exception as e:
         mensaje_error = f"Error detectando codificación: {e}"
         logger.warning(f"{mensaje_error} en archivo {ruta_completa}") # WARNING
 
     # Lista de codificaciones a intentar
-    codificaciones_a_probar = ([codificacion_detectada] if codificacion_detectada else []) + ['utf-8', 'cp1252', 'latin-1']
     codificaciones_unicas: List[str] = []
-    vistas = set()
-    for enc in codificaciones_a_probar:
-        if enc and enc not in vistas:
+    for enc in ([codificacion_detectada] if codificacion_detectada else []) + CODIFICACIONES_FALLBACK:
+        if enc and enc not in codificaciones_unicas:
             codificaciones_unicas.append(enc)
-            vistas.add(enc)
     logger.debug(f"Codificaciones a intentar: {codificaciones_unicas}") # DEBUG
 
-    lectura_exitosa = False
-    codificacion_usada: Optional[str] = None
-    contenido_completo: Optional[str] = None
-
-    # Intento de lectura
     for enc in codificaciones_unicas:
-        logger.debug(f"Intentando leer con codificación: {enc}") # DEBUG
         try:
             effective_enc = 'utf-8-sig' if enc == 'utf-8' else enc
-            with codecs.open(ruta_completa, 'r', encoding=effective_enc, errors='strict') as f:
-                contenido_completo = f.read()
-            logger.debug(f"Lectura exitosa con {enc}") # DEBUG
-            lectura_exitosa = True
-            codificacion_usada = enc
-            mensaje_error = None
-            break
+            return enc, datos.decode(effective_enc, errors='strict'), None
         except UnicodeDecodeError:
             logger.debug(f"Fallo de decodificación (UnicodeDecodeError) con {enc}") # DEBUG
             mensaje_error = f"Fallo al decodificar con {', '.join(codificaciones_unicas)}"
-            continue
-        except Exception as e:
-            mensaje_error = f"Error leyendo archivo: {e}"
-            # Usar logger.error para errores de lectura, podría ser importante
-            logger.error(f"Error de lectura con {enc} en {ruta_completa}: {e}", exc_info=False) # No necesitamos traceback aquí usualmente
-            lectura_exitosa = False
-            break
+        except LookupError as e:
+            logger.debug(f"Codificación desconocida {enc}: {e}") # DEBUG
+            mensaje_error = f"Fallo al decodificar con {', '.join(codificaciones_unicas)}"
+    return None, None, mensaje_error
+
+def decodificar_texto(datos: bytes, ruta_completa: str) -> ReadResult:
+    """Decodifica el contenido ya leído de un archivo y lo divide en líneas."""
+    codificacion_usada, contenido_completo = _decodificar_rapido(datos)
+    mensaje_error: Optional[str] = None
+    if contenido_completo is None:
+        codificacion_usada, contenido_completo, mensaje_error = _decodificar_con_chardet(datos, ruta_completa)
+    else:
+        logger.debug(f"Decodificado por la vía rápida como {codificacion_usada}") # DEBUG
 
     # Procesamiento del resultado
-    if lectura_exitosa and contenido_completo is not None:
+    if contenido_completo is not None:
         if '\x00' in contenido_completo[:1024]:
              msg_bin = "Archivo decodificado pero contiene bytes nulos, probablemente binario."
              logger.warning(f"{msg_bin} en archivo {ruta_completa}") # WARNING
@@ -91,4 +99,163 @@ def leer_lineas_texto(ruta_completa: str, tamano_bytes: int) -> ReadResult:
     else:
         error_final = mensaje_error if mensaje_error else "Error desconocido durante la lectura"
         logger.warning(f"Lectura final fallida para {ruta_completa}. Error: {error_final}") # WARNING
-        return "read_error", None, error_final
\ No newline at end of file
+        return "read_error", None, error_final
+
+class ResumenArchivoGrande:
+    """Lo que se extrae de un archivo que supera MAX_TAMANO_BYTES_TEXTO (acompaña al estado "too_large")."""
+    __slots__ = ("mensaje", "total_lineas", "lineas_cabecera", "extracto")
+
+    def __init__(self, mensaje: str):
+        self.mensaje = mensaje
+        self.total_lineas: Optional[int] = None
+        self.lineas_cabecera: Optional[List[str]] = None # Región de cabecera, para el análisis de dependencias
+        self.extracto: Optional[List[str]] = None # Primeras / últimas líneas, si se configuró
+
+TAMANO_BLOQUE_MMAP = 4 * 1024 * 1024
+
+# Codificación sin BOM y tamaño de la unidad de código de los textos UTF-32/UTF-16 con BOM, para
+# decodificar trozos sueltos del archivo (UTF-32 antes que UTF-16: comparten prefijo)
+CODIFICACIONES_POR_BOM = (
+    (codecs.BOM_UTF32_LE, 'utf-32-le', 4),
+    (codecs.BOM_UTF32_BE, 'utf-32-be', 4),
+    (codecs.BOM_UTF16_LE, 'utf-16-le', 2),
+    (codecs.BOM_UTF16_BE, 'utf-16-be', 2),
+)
+
+def _codificacion_por_bom(inicio: bytes) -> Tuple[Optional[str], int]:
+    """(codificación, bytes por unidad de código) si el archivo empieza con un BOM UTF-16/32; si no, (None, 1)."""
+    for bom, codificacion, unidad in CODIFICACIONES_POR_BOM:
+        if inicio.startswith(bom):
+            return codificacion, unidad
+    return None, 1
+
+def _cortar_tras_ultimo_salto(datos: bytes, codificacion: str, unidad: int) -> bytes:
+    """
+    Corta `datos` tras su último '\n' codificado que empiece en una unidad de código (en UTF-16
+    el byte 0x0A también aparece dentro de otros caracteres). En UTF-8 y en las codificaciones
+    de un byte el 0x0A nunca forma parte de otro carácter.
+    """
+    salto = '\n'.encode(codificacion)
+    fin = len(datos)
+    while True:
+        posicion = datos.rfind(salto, 0, fin)
+        if posicion == -1:
+            return datos[:len(datos) - len(datos) % unidad]
+        if posicion % unidad == 0:
+            return datos[:posicion + len(salto)]
+        fin = posicion + len(salto) - 1 # Buscar solo las que empiezan antes
+
+def _contar_lineas_mmap(mapa: mmap.mmap, tamano_bytes: int, codificacion: str) -> int:
+    """
+    Cuenta las líneas con la misma regla que los archivos pequeños (`str.splitlines()` del texto
+    decodificado: '\r\n', '\r', '\n', '\x0b', '\u2028'...), decodificando por bloques.
+    """
+    decodificador = codecs.getincrementaldecoder(codificacion)(errors='replace')
+    total = 0
+    pendiente = '' # Final del bloque anterior: una línea a medias o un '\r' que puede ir con '\n'
+    for inicio in range(0, tamano_bytes, TAMANO_BLOQUE_MMAP):
+        fin = min(inicio + TAMANO_BLOQUE_MMAP, tamano_bytes)
+        lineas = (pendiente + decodificador.decode(mapa[inicio:fin], final=fin == tamano_bytes)).splitlines(keepends=True)
+        # Para contar basta con su último carácter (una línea enorme no se acumula en memoria)
+        pendiente = lineas.pop()[-1:] if lineas else ''
+        total += len(lineas)
+    return total + (1 if pendiente else 0)
+
+def _lineas_finales(mapa: mmap.mmap, tamano_bytes: int, codificacion: str, unidad: int, num_lineas: int) -> List[str]:
+    """Últimas `num_lineas` líneas, leyendo hacia atrás solo lo necesario."""
+    salto = '\n'.encode(codificacion)
+    region = 64 * 1024
+    while True:
+        inicio = max(0, tamano_bytes - region)
+        inicio -= inicio % unidad # Sin partir unidades de código UTF-16/32
+        fragmento = mapa[inicio:tamano_bytes]
+        if inicio == 0 or fragmento.count(salto) > num_lineas or region >= TAMANO_REGION_CABECERA_BYTES:
+            break # Con líneas enormes se devuelven las que quepan en la región máxima
+        region *= 4
+    lineas = fragmento.decode(codificacion, errors='replace').splitlines()
+    if inicio > 0:
+        lineas = lineas[1:] # La primera puede estar cortada
+    elif lineas:
+        lineas[0] = lineas[0].removeprefix('\ufeff') # BOM, como al decodificar el archivo entero
+    return lineas[-num_lineas:]
+
+def leer_archivo_grande(ruta_completa: str, tamano_bytes: int) -> ReadResult:
+    """
+    Modo para archivos grandes: mmap del archivo, recuento de líneas por bloques y
+    decodificación completa solo de la región de cabecera (y del extracto configurado).
+    La memoria usada no depende del tamaño del archivo.
+    """
+    msg = f"Tamaño ({tamano_bytes / 1024 / 1024:.2f} MB) excede límite ({MAX_TAMANO_MB_TEXTO} MB)"
+    logger.warning(f"{msg} en archivo {ruta_completa}. Se resume con mmap.") # WARNING
+    resumen = ResumenArchivoGrande(f"{msg}: contenido omitido")
+    codificacion: Optional[str] = None
+    try:
+        with open(ruta_completa, 'rb') as fb, mmap.mmap(fb.fileno(), 0, access=mmap.ACCESS_READ) as mapa:
+            bloque_inicial = mapa[:TAMANO_BLOQUE_SNIFF]
+            razon_binario = detectar_binario(bloque_inicial)
+            if razon_binario is not None:
+                logger.debug(f"Binario por contenido ({razon_binario}): {ruta_completa}") # DEBUG
+                return "binary", None, razon_binario
+
+            # Región de cabecera cortada tras el último salto de línea (sin líneas ni caracteres partidos)
+            codificacion_bom, unidad = _codificacion_por_bom(bloque_inicial)
+            cabecera = _cortar_tras_ultimo_salto(mapa[:TAMANO_REGION_CABECERA_BYTES], codificacion_bom or 'utf-8', unidad)
+            estado_cabecera, codificacion, lineas_o_error = decodificar_texto(cabecera, ruta_completa)
+            # Los bloques sueltos se decodifican sin BOM; una cabecera ASCII puede seguir en UTF-8
+            codificacion_bloques = codificacion_bom or ('utf-8' if estado_cabecera != "ok" or codificacion in ('ascii', 'UTF-8-SIG') else codificacion)
+            resumen.total_lineas = _contar_lineas_mmap(mapa, tamano_bytes, codificacion_bloques)
+            if estado_cabecera != "ok":
+                resumen.mensaje = f"{msg}: contenido omitido, cabecera no decodificable ({lineas_o_error})"
+                return "too_large", None, resumen
+            resumen.lineas_cabecera = lineas_o_error
+            resumen.mensaje = f"{msg}: contenido omitido, dependencias extraídas de las primeras {len(lineas_o_error)} líneas"
+
+            if LINEAS_EXTRACTO_INICIO or LINEAS_EXTRACTO_FINAL:
+                inicio = lineas_o_error[:LINEAS_EXTRACTO_INICIO] if LINEAS_EXTRACTO_INICIO else []
+                final = _lineas_finales(mapa, tamano_bytes, codificacion_bloques, unidad, LINEAS_EXTRACTO_FINAL) if LINEAS_EXTRACTO_FINAL else []
+                omitidas = max(0, resumen.total_lineas - len(inicio) - len(final))
+                resumen.extracto = inicio + [f"[... {omitidas} líneas omitidas ...]"] + final
+                resumen.mensaje += f" (content_lines es un extracto: {len(inicio)} primeras y {len(final)} últimas líneas)"
+    except (OSError, ValueError) as e:
+        logger.warning(f"No se pudo mapear {ruta_completa} en memoria: {e}")
+        return "too_large", None, ResumenArchivoGrande(msg)
+    return "too_large", codificacion, resumen
+
+def leer_archivo_texto(ruta_completa: str, tamano_bytes: int) -> Tuple[ReadResult, Optional[bytes]]:
+    """
+    Lee el archivo UNA sola vez y lo decodifica desde ese buffer.
+    Si el primer bloque delata un binario, devuelve el estado "binary" (con la razón) sin leer el resto.
+    Devuelve también los bytes leídos (None si no se leyó entero) para calcular su hash sin volver al disco.
+    """
+    logger.debug(f"Intentando leer archivo: {ruta_completa} (Tamaño: {tamano_bytes} bytes)") # DEBUG
+    if tamano_bytes == 0:
+        logger.debug("Archivo vacío.") # DEBUG
+        return ("ok", "empty", []), None
+    if tamano_bytes > MAX_TAMANO_BYTES_TEXTO:
+        return leer_archivo_grande(ruta_completa, tamano_bytes), None
+
+    try:
+        with open(ruta_completa, 'rb') as fb:
+            datos = fb.read(TAMANO_BLOQUE_SNIFF)
+            razon_binario = detectar_binario(datos)
+            if razon_binario is not None:
+                logger.debug(f"Binario por contenido ({razon_binario}): {ruta_completa}") # DEBUG
+                return ("binary", None, razon_binario), None
+            if len(datos) == TAMANO_BLOQUE_SNIFF:
+                datos += fb.read()
+    except Exception as e:
+        mensaje_error = f"Error leyendo archivo: {e}"
+        # Usar logger.error para errores de lectura, podría ser importante
+        logger.error(f"Error de lectura en {ruta_completa}: {e}", exc_info=False) # No necesitamos traceback aquí usualmente
+        return ("read_error", None, mensaje_error), None
+
+    return decodificar_texto(datos, ruta_completa), datos
+
+def leer_lineas_texto(ruta_completa: str, tamano_bytes: int) -> ReadResult:
+    """
+    Intenta leer el contenido como texto y devuelve lista de líneas.
+    """
+    resultado, _ = leer_archivo_texto(ruta_completa, tamano_bytes)
+    if isinstance(resultado[2], ResumenArchivoGrande):
+        return resultado[0], resultado[1], resultado[2].mensaje
+    return resultado
@@ -0,0 +1,41 @@
+# tests/proyecto_mixto.py
+# Proyecto de prueba con Python, JS/TS, Vue, HTML/CSS, PHP y Java que se referencian entre sí.
+import os
+from typing import Dict
+
+ARCHIVOS_PROYECTO_MIXTO: Dict[str, str] = {
+    'app/__init__.py': '',
+    'app/main.py': 'import os\nfrom app import util\nfrom .modelos import Usuario\nimport requests\n',
+    'app/util.py': 'from . import modelos\n',
+    'app/modelos.py': 'class Usuario:\n    pass\n',
+    'tsconfig.json': '{\n  // alias\n  "compilerOptions": {"baseUrl": ".", "paths": {"@/*": ["src/*"]}},\n}\n',
+    'package.json': '{"name": "mixto", "main": "src/index.ts"}\n',
+    'src/index.ts': "export * from './a';\nimport { util } from '@/util';\n",
+    'src/a.ts': "export const a = 1;\n",
+    # b.js y c.ts importan lo mismo pero se resuelve distinto (en TS './a.js' es a.ts)
+    'src/b.js': "import { a } from './a.js';\nconst fs = require('fs');\n",
+    'src/c.ts': "import { a } from './a.js';\nimport type { T } from './tipos';\n",
+    'src/tipos.d.ts': "export type T = string;\n",
+    'src/util.ts': "import React from 'react';\nexport const util = () => `${'./no-es-import'}`;\n",
+    'src/Comp.vue': '<template><img src="../web/logo.png"></template>\n<script setup lang="ts">\nimport { a } from \'./a\';\n</script>\n<style scoped>\n@import "../web/base.css";\n</style>\n',
+    'web/index.html': '<link rel="stylesheet" href="css/site.css">\n<script src="../src/b.js"></script>\n<img src="logo.png">\n',
+    'web/logo.png': '\x89PNG',
+    'web/base.css': 'body { color: red; }\n',
+    'web/css/site.css': '@import url("../base.css");\n.logo { background: url(../logo.png); }\n',
+    'web/css/_vars.scss': '$c: red;\n',
+    'web/css/main.scss': '@use "vars";\n@import "site";\n',
+    'web/page.php': "<?php\ninclude 'lib.php';\nrequire_once __DIR__ . '/falta.php';\n",
+    'web/lib.php': "<?php\nfunction f() {}\n",
+    'java/src/com/acme/Main.java': 'package com.acme;\n\nimport java.util.List;\nimport com.acme.util.Helper;\n\npublic class Main {}\n',
+    'java/src/com/acme/util/Helper.java': 'package com.acme.util;\n\npublic class Helper {}\n',
+    'docs/notas.txt': 'texto\n',
+}
+
+
+def crear_proyecto_mixto(directorio: str, archivos: Dict[str, str] = ARCHIVOS_PROYECTO_MIXTO):
+    """Escribe los archivos del proyecto de prueba bajo `directorio`."""
+    for ruta, contenido in archivos.items():
+        destino = os.path.join(directorio, *ruta.split('/'))
+        os.makedirs(os.path.dirname(destino), exist_ok=True)
+        with open(destino, 'w', encoding='utf-8', newline='') as f:
+            f.write(contenido)
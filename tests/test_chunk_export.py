@@ -0,0 +1,88 @@
+# tests/test_chunk_export.py
+# División en partes de un archivo que no cabe en un fragmento.
+import json
+import tempfile
+import unittest
+
+from proyscan.chunk_export import dividir_objeto, exportar_fragmentos
+from proyscan.content_stream import serializar_objeto_contenido
+
+
+def objeto(num_lineas: int, num_dependencias: int = 0):
+    dependencias = [{"type": "internal", "path": f"src/modulo_{i:04d}.py"} for i in range(num_dependencias)]
+    return {
+        "metadata": {"path": "src/grande.py", "size_bytes": 1, "status": "ok", "encoding": "utf-8", "language": "python",
+                     "line_count": num_lineas, "dependencies": dependencias, "referenced_by": ["src/main.py"]},
+        "content_lines": [f"valor_{i} = {i} * 2  # línea {i}" for i in range(num_lineas)],
+        "error_message": None,
+    }
+
+
+class TestDividirObjeto(unittest.TestCase):
+
+    def exportar(self, file_object, presupuesto: int):
+        """Exporta un único archivo y devuelve (entrada del manifiesto, objeto) de cada fragmento."""
+        datos = serializar_objeto_contenido(file_object)
+        with tempfile.TemporaryDirectory() as directorio:
+            fragmentos = exportar_fragmentos(lambda: iter([("src/grande.py", datos)]), ["src/grande.py"],
+                                             [len(datos) + 2], presupuesto, len, directorio)
+            resultado = []
+            for fragmento in fragmentos:
+                with open(f"{directorio}/{fragmento['file']}", encoding='utf-8') as f:
+                    resultado.append((fragmento, json.load(f)["files"][0]))
+        return resultado
+
+    def assertLineasCompletas(self, partes, original):
+        self.assertEqual([linea for _, parte in partes for linea in parte["content_lines"]], original["content_lines"])
+
+    def test_division_por_lineas(self):
+        original = objeto(200)
+        partes = self.exportar(original, 2000)
+        self.assertGreater(len(partes), 2)
+        self.assertLineasCompletas(partes, original)
+        for fragmento, parte in partes:
+            self.assertLessEqual(fragmento["bytes"], 2000)
+            self.assertEqual(parte["metadata"], original["metadata"])
+            self.assertEqual(parte["chunk_part"]["count"], len(partes))
+            self.assertNotIn("metadata_in_part", parte["chunk_part"])
+
+    def test_dependencias_mayores_que_el_presupuesto(self):
+        original = objeto(200, num_dependencias=200)
+        with self.assertLogs('proyscan.chunk_export', 'WARNING') as registro:
+            partes = self.exportar(original, 3000)
+        self.assertEqual(len(registro.output), 1)
+        self.assertIn("superan por sí solas el presupuesto", registro.output[0])
+        self.assertLineasCompletas(partes, original)
+        (primer_fragmento, primera), resto = partes[0], partes[1:]
+        # La parte 1 lleva los metadatos completos y ninguna línea; las demás caben en el presupuesto
+        self.assertEqual(primera["metadata"], original["metadata"])
+        self.assertEqual((primera["content_lines"], primera["chunk_part"]["first_line"], primera["chunk_part"]["last_line"]), ([], 1, 0))
+        self.assertGreater(primer_fragmento["bytes"], 3000)
+        for fragmento, parte in resto:
+            self.assertLessEqual(fragmento["bytes"], 3000)
+            self.assertIsNone(parte["metadata"]["dependencies"])
+            self.assertIsNone(parte["metadata"]["referenced_by"])
+            self.assertEqual(parte["metadata"]["path"], "src/grande.py")
+            self.assertEqual(parte["chunk_part"]["metadata_in_part"], 1)
+
+    def test_dependencias_que_ocupan_media_parte(self):
+        original = objeto(200, num_dependencias=12)
+        with self.assertNoLogs('proyscan.chunk_export', 'WARNING'):
+            partes = self.exportar(original, 3500)
+        self.assertLineasCompletas(partes, original)
+        self.assertTrue(all(fragmento["bytes"] <= 3500 for fragmento, _ in partes))
+        self.assertTrue(partes[0][1]["content_lines"]) # Las dependencias dejan sitio a algunas líneas
+        self.assertEqual(partes[0][1]["metadata"], original["metadata"])
+        self.assertTrue(all(parte["chunk_part"].get("metadata_in_part") == 1 for _, parte in partes[1:]))
+
+    def test_sin_lineas_que_repartir(self):
+        original = objeto(1, num_dependencias=200)
+        self.assertEqual(dividir_objeto(original, 100, len), [(serializar_objeto_contenido(original), None)])
+        with self.assertLogs('proyscan.chunk_export', 'WARNING') as registro:
+            partes = self.exportar(original, 1000)
+        self.assertEqual(len(partes), 1)
+        self.assertIn("menos de dos líneas", registro.output[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
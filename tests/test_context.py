@@ -0,0 +1,49 @@
+# tests/test_context.py
+# Qué viaja del contexto de análisis a los trabajadores del pool.
+import pickle
+import tempfile
+import unittest
+from unittest import mock
+
+from proyscan.dependency_analysis.context import ContextoAnalisis
+from proyscan.dependency_analysis.java_index import IndiceJava, ImportJava
+
+from .proyecto_mixto import ARCHIVOS_PROYECTO_MIXTO, crear_proyecto_mixto
+
+
+class TestContextoAnalisis(unittest.TestCase):
+
+    def setUp(self):
+        self._temporal = tempfile.TemporaryDirectory()
+        self.proyecto = self._temporal.name
+        crear_proyecto_mixto(self.proyecto)
+        self.contexto = ContextoAnalisis(set(ARCHIVOS_PROYECTO_MIXTO), self.proyecto)
+
+    def tearDown(self):
+        self._temporal.cleanup()
+
+    def test_indice_java_viaja_construido(self):
+        self.contexto.preparar_para_trabajadores()
+        # El trabajador no vuelve a leer las cabeceras .java
+        with mock.patch.object(IndiceJava, '_leer_paquete', side_effect=AssertionError("relectura")):
+            copia = pickle.loads(pickle.dumps(self.contexto))
+            indice = copia.indice_java
+        self.assertEqual(indice.resolver_import(ImportJava('com.acme.util.Helper', False, False)),
+                         ['java/src/com/acme/util/Helper.java'])
+
+    def test_sin_java_no_se_construye(self):
+        contexto = ContextoAnalisis({f for f in ARCHIVOS_PROYECTO_MIXTO if not f.endswith('.java')}, self.proyecto)
+        contexto.preparar_para_trabajadores()
+        self.assertIsNone(pickle.loads(pickle.dumps(contexto))._indice_java)
+
+    def test_otros_indices_no_se_serializan(self):
+        self.contexto.indice_python
+        self.contexto.referencias
+        copia = pickle.loads(pickle.dumps(self.contexto))
+        self.assertIsNone(copia._indice_python)
+        self.assertIsNone(copia._referencias)
+        self.assertEqual((copia.archivos, copia.directorio), (self.contexto.archivos, self.proyecto))
+
+
+if __name__ == '__main__':
+    unittest.main()
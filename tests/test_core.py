@@ -0,0 +1,49 @@
+# tests/test_core.py
+# Escaneo completo: la salida en paralelo debe ser idéntica byte a byte a la salida en serie.
+import os
+import json
+import tempfile
+import unittest
+
+from proyscan.config import ARCHIVO_CONTENIDO, ARCHIVO_GRAFO
+from proyscan.core import ejecutar_escaneo
+
+from .proyecto_mixto import crear_proyecto_mixto
+
+
+def escanear(directorio_objetivo: str, directorio_salida: str, **opciones) -> str:
+    os.makedirs(directorio_salida)
+    ejecutar_escaneo(directorio_objetivo, 'proyscan.py', directorio_salida, False, **opciones)
+    return directorio_salida
+
+
+def leer_bytes(directorio: str, nombre: str) -> bytes:
+    with open(os.path.join(directorio, nombre), 'rb') as f:
+        return f.read()
+
+
+class TestEscaneoParalelo(unittest.TestCase):
+
+    def setUp(self):
+        self._temporal = tempfile.TemporaryDirectory()
+        self.raiz = self._temporal.name
+        self.proyecto = os.path.join(self.raiz, 'proyecto')
+        crear_proyecto_mixto(self.proyecto)
+
+    def tearDown(self):
+        self._temporal.cleanup()
+
+    def test_serie_y_paralelo_identicos(self):
+        serie = escanear(self.proyecto, os.path.join(self.raiz, 'serie'), jobs=1)
+        # En serie b.js se procesa antes que c.ts: una caché compartida mal indexada se nota aquí
+        archivos = {fo["metadata"]["path"]: fo["metadata"] for fo in json.loads(leer_bytes(serie, ARCHIVO_CONTENIDO))["files"]}
+        self.assertIn({'type': 'internal_broken', 'path': 'src/a.js'}, archivos['src/b.js']['dependencies'])
+        self.assertIn({'type': 'internal', 'path': 'src/a.ts'}, archivos['src/c.ts']['dependencies'])
+        for jobs in (2, 3):
+            paralelo = escanear(self.proyecto, os.path.join(self.raiz, f'paralelo{jobs}'), jobs=jobs)
+            for nombre in (ARCHIVO_CONTENIDO, ARCHIVO_GRAFO):
+                self.assertEqual(leer_bytes(serie, nombre), leer_bytes(paralelo, nombre), f"{nombre} con jobs={jobs}")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,166 @@
+# tests/test_dependency_graph.py
+# Algoritmos del grafo CSR comparados con una versión de fuerza bruta sobre grafos aleatorios.
+import os
+import random
+import tempfile
+import unittest
+from array import array
+from typing import List, Optional, Sequence, Set, Tuple
+
+from proyscan.dependency_graph import (
+    GrafoDependencias, guardar_grafo, cargar_grafo, guardar_grafo_compacto, cargar_grafo_compacto
+)
+
+
+def _grafo_aleatorio(aleatorio: random.Random, max_nodos: int = 30) -> Tuple[int, List[Tuple[int, int]]]:
+    num_nodos = aleatorio.randint(1, max_nodos)
+    aristas = [(aleatorio.randrange(num_nodos), aleatorio.randrange(num_nodos)) for _ in range(aleatorio.randint(0, num_nodos * 3))]
+    return num_nodos, aristas
+
+
+def _sucesores(num_nodos: int, aristas: Sequence[Tuple[int, int]]) -> List[Set[int]]:
+    sucesores: List[Set[int]] = [set() for _ in range(num_nodos)]
+    for origen, destino in aristas:
+        sucesores[origen].add(destino)
+    return sucesores
+
+
+def _alcanzables(sucesores: List[Set[int]], origen: int) -> Set[int]:
+    """Nodos alcanzables desde `origen` con al menos una arista (incluye `origen` solo si hay ciclo)."""
+    visitados: Set[int] = set()
+    pila = [origen]
+    while pila:
+        for vecino in sucesores[pila.pop()]:
+            if vecino not in visitados:
+                visitados.add(vecino)
+                pila.append(vecino)
+    return visitados
+
+
+def _profundidades(sucesores: List[Set[int]], entradas: Sequence[int], profundidad_max: Optional[int]) -> dict:
+    profundidad = {entrada: 0 for entrada in entradas}
+    frontera = list(entradas)
+    while frontera:
+        siguiente = []
+        for nodo in frontera:
+            if profundidad_max is not None and profundidad[nodo] + 1 > profundidad_max:
+                continue
+            for vecino in sucesores[nodo]:
+                if vecino not in profundidad:
+                    profundidad[vecino] = profundidad[nodo] + 1
+                    siguiente.append(vecino)
+        frontera = siguiente
+    return profundidad
+
+
+class TestGrafoDependencias(unittest.TestCase):
+
+    def setUp(self):
+        self.aleatorio = random.Random(2024)
+
+    def casos(self, repeticiones: int = 200):
+        for _ in range(repeticiones):
+            num_nodos, aristas = _grafo_aleatorio(self.aleatorio)
+            grafo = GrafoDependencias.desde_aristas([f"d/f{i}.py" for i in range(num_nodos)], aristas)
+            sucesores = _sucesores(num_nodos, aristas)
+            yield grafo, sucesores, [_alcanzables(sucesores, nodo) for nodo in range(num_nodos)]
+
+    def test_csr_y_grafo_inverso(self):
+        grafo = GrafoDependencias.desde_aristas(['a', 'b', 'c'], [(0, 2), (0, 1), (0, 2), (1, 2)])
+        self.assertEqual(grafo.desplazamientos.tolist(), [0, 2, 3, 3])
+        self.assertEqual(grafo.destinos.tolist(), [1, 2, 2]) # Sin repetidas y ordenadas por destino
+        self.assertEqual(grafo.dependientes(2).tolist(), [0, 1])
+        self.assertEqual((grafo.fan_out(), grafo.fan_in()), ([2, 1, 0], [0, 1, 2]))
+        self.assertEqual(grafo.ids, {'a': 0, 'b': 1, 'c': 2})
+
+    def test_desde_referencias_inversas(self):
+        inversas = {'b': ['a'], 'c': ['a', 'b', 'fuera'], 'no_escaneado': ['a']}
+        grafo = GrafoDependencias.desde_referencias_inversas(['a', 'b', 'c'], inversas)
+        self.assertEqual([grafo.dependencias(n).tolist() for n in range(3)], [[1, 2], [2], []])
+
+    def test_componentes_fuertes_y_ciclos(self):
+        for grafo, sucesores, alcance in self.casos():
+            componente, componentes = grafo.componentes_fuertes()
+            for a in range(len(grafo)):
+                for b in range(len(grafo)):
+                    misma = a == b or (b in alcance[a] and a in alcance[b])
+                    self.assertEqual(misma, componente[a] == componente[b])
+            # Orden topológico inverso: una componente sale después de todas las que alcanza
+            for a in range(len(grafo)):
+                for b in sucesores[a]:
+                    self.assertLessEqual(componente[b], componente[a])
+            ciclos = grafo.ciclos()
+            esperados = sorted(m for m in componentes if len(m) > 1 or m[0] in sucesores[m[0]])
+            self.assertEqual(sorted(ciclos), esperados)
+            self.assertEqual([len(m) for m in ciclos], sorted((len(m) for m in ciclos), reverse=True))
+
+    def test_capas(self):
+        for grafo, sucesores, _ in self.casos():
+            componente, componentes = grafo.componentes_fuertes()
+            capas = grafo.capas()
+            for id_componente, miembros in enumerate(componentes):
+                esperada = max((capas[b] + 1 for a in miembros for b in sucesores[a] if componente[b] != id_componente), default=0)
+                self.assertTrue(all(capas[a] == esperada for a in miembros))
+
+    def test_cierres_transitivos(self):
+        for grafo, sucesores, alcance in self.casos():
+            nodos = range(len(grafo))
+            self.assertEqual(grafo.dependencias_transitivas(), [len(alcance[a] - {a}) for a in nodos])
+            self.assertEqual(grafo.dependientes_transitivos(), [sum(1 for b in nodos if b != a and a in alcance[b]) for a in nodos])
+
+    def test_afectados(self):
+        for grafo, sucesores, alcance in self.casos():
+            origen = self.aleatorio.randrange(len(grafo))
+            afectados = grafo.afectados([origen])
+            self.assertEqual({a for a, _, _ in afectados}, {b for b in range(len(grafo)) if b != origen and origen in alcance[b]})
+            for nodo, profundidad, via in afectados:
+                self.assertIn(origen if profundidad == 1 else via, sucesores[nodo])
+            limitados = grafo.afectados([origen], profundidad_max=1)
+            self.assertEqual({a for a, _, _ in limitados}, {b for b in range(len(grafo)) if b != origen and origen in sucesores[b]})
+
+    def test_cierre_con_profundidad_maxima(self):
+        for grafo, sucesores, _ in self.casos():
+            entradas = self.aleatorio.sample(range(len(grafo)), self.aleatorio.randint(1, min(3, len(grafo))))
+            profundidad_max = self.aleatorio.choice([None, 0, 1, 2])
+            orden = grafo.cierre(entradas, profundidad_max)
+            self.assertEqual(sorted(orden), sorted(_profundidades(sucesores, entradas, profundidad_max)))
+            # Fuera de los ciclos, cada archivo aparece después de sus dependencias
+            componente, _ = grafo.componentes_fuertes()
+            posicion = {nodo: i for i, nodo in enumerate(orden)}
+            for nodo in orden:
+                for vecino in sucesores[nodo]:
+                    if vecino in posicion and componente[vecino] != componente[nodo]:
+                        self.assertLess(posicion[vecino], posicion[nodo])
+
+    def test_json_y_sidecar_compacto(self):
+        with tempfile.TemporaryDirectory() as temporal:
+            ruta_json, ruta_compacta = os.path.join(temporal, 'grafo.json'), os.path.join(temporal, 'grafo.bin')
+            for grafo, _, _ in self.casos(50):
+                guardar_grafo(ruta_json, grafo)
+                self.assertEqual(cargar_grafo(ruta_json).a_json(), grafo.a_json())
+                grafo.posiciones_contenido = None if self.aleatorio.random() < 0.5 else (array('q', grafo.fan_in()), array('q', grafo.fan_out()))
+                guardar_grafo_compacto(ruta_compacta, grafo)
+                cargado = cargar_grafo_compacto(ruta_compacta)
+                self.assertEqual(cargado.rutas, grafo.rutas)
+                for atributo in ('desplazamientos', 'destinos', 'desplazamientos_inversos', 'origenes'):
+                    self.assertEqual(getattr(cargado, atributo).tolist(), getattr(grafo, atributo).tolist())
+                if grafo.posiciones_contenido is None:
+                    self.assertIsNone(cargado.posiciones_contenido)
+                else:
+                    self.assertEqual(cargado.posiciones_contenido, grafo.posiciones_contenido)
+
+    def test_grafo_vacio_y_sidecar_invalido(self):
+        vacio = GrafoDependencias.desde_aristas([], [])
+        self.assertEqual((vacio.a_json()["layer_count"], vacio.ciclos()), (0, []))
+        with tempfile.TemporaryDirectory() as temporal:
+            ruta = os.path.join(temporal, 'grafo.bin')
+            guardar_grafo_compacto(ruta, vacio)
+            self.assertEqual(len(cargar_grafo_compacto(ruta)), 0)
+            with open(ruta, 'wb') as f:
+                f.write(b'{}')
+            with self.assertRaises(ValueError):
+                cargar_grafo_compacto(ruta)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+# tests/test_file_utils.py
+# Resumen de archivos grandes con mmap: mismo recuento de líneas que la vía normal y cabecera
+# cortada sin partir caracteres en ninguna codificación.
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from proyscan.utils import file_utils
+from proyscan.utils.file_utils import leer_archivo_grande, leer_archivo_texto
+
+# Todos los separadores de str.splitlines(), incluido un '\r\n' que cae entre dos bloques
+TEXTO = "import a\r\nb = 'ñ€😀'\rc\nd\x0be\x0cf\x1cg\x85h i j\r\n\r\n" * 7 + "ultima sin salto"
+CODIFICACIONES = ('utf-8', 'utf-8-sig', 'utf-16', 'utf-16-be', 'utf-32')
+
+
+class TestArchivoGrande(unittest.TestCase):
+
+    def setUp(self):
+        self._temporal = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self._temporal.cleanup()
+
+    def escribir(self, datos: bytes) -> str:
+        ruta = os.path.join(self._temporal.name, 'grande.txt')
+        with open(ruta, 'wb') as f:
+            f.write(datos)
+        return ruta
+
+    def codificar(self, texto: str, codificacion: str) -> bytes:
+        if codificacion == 'utf-16-be':
+            return b'\xfe\xff' + texto.encode('utf-16-be')
+        return texto.encode(codificacion)
+
+    def test_mismas_lineas_que_la_lectura_normal(self):
+        for codificacion in CODIFICACIONES:
+            for bloque in (5, 7, 64, 1 << 20): # Bloques que parten caracteres, '\r\n' y BOMs
+                with self.subTest(codificacion=codificacion, bloque=bloque), \
+                        mock.patch.object(file_utils, 'TAMANO_BLOQUE_MMAP', bloque):
+                    datos = self.codificar(TEXTO, codificacion)
+                    ruta = self.escribir(datos)
+                    estado, _, lineas = leer_archivo_texto(ruta, len(datos))[0]
+                    self.assertEqual(estado, "ok")
+                    _, _, resumen = leer_archivo_grande(ruta, len(datos))
+                    self.assertEqual(resumen.total_lineas, len(lineas))
+                    self.assertEqual(resumen.total_lineas, len(TEXTO.splitlines()))
+
+    def test_cabecera_sin_caracteres_partidos(self):
+        lineas_esperadas = TEXTO.splitlines()
+        for codificacion in CODIFICACIONES:
+            datos = self.codificar(TEXTO, codificacion)
+            ruta = self.escribir(datos)
+            for region in range(41, 160, 3): # Tamaños impares: en UTF-16/32 caerían a mitad de un carácter
+                with self.subTest(codificacion=codificacion, region=region), \
+                        mock.patch.object(file_utils, 'TAMANO_REGION_CABECERA_BYTES', region):
+                    estado, _, resumen = leer_archivo_grande(ruta, len(datos))
+                    self.assertEqual(estado, "too_large")
+                    cabecera = resumen.lineas_cabecera
+                    self.assertIsNotNone(cabecera, resumen.mensaje)
+                    self.assertEqual(cabecera, lineas_esperadas[:len(cabecera)])
+
+    def test_extracto_final(self):
+        texto = ''.join(f"linea {i}\n" for i in range(5000))
+        for codificacion in CODIFICACIONES:
+            datos = self.codificar(texto, codificacion)
+            ruta = self.escribir(datos)
+            with self.subTest(codificacion=codificacion), \
+                    mock.patch.object(file_utils, 'LINEAS_EXTRACTO_INICIO', 2), \
+                    mock.patch.object(file_utils, 'LINEAS_EXTRACTO_FINAL', 3):
+                _, _, resumen = leer_archivo_grande(ruta, len(datos))
+                self.assertEqual(resumen.extracto, ['linea 0', 'linea 1', '[... 4995 líneas omitidas ...]',
+                                                    'linea 4997', 'linea 4998', 'linea 4999'])
+        # Archivo corto: el extracto final llega al principio, sin el BOM
+        datos = self.codificar("a\nb\n", 'utf-16')
+        with mock.patch.object(file_utils, 'LINEAS_EXTRACTO_FINAL', 5):
+            _, _, resumen = leer_archivo_grande(self.escribir(datos), len(datos))
+        self.assertEqual(resumen.extracto[1:], ['a', 'b'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+# tests/test_gitignore.py
+# Reglas .gitignore (--gitignore): resultados fijados y, si git está instalado, comparados con
+# `git ls-files -o --exclude-standard` sobre el mismo árbol.
+import os
+import shutil
+import subprocess
+import tempfile
+import unittest
+from typing import List, Optional, Sequence, Set
+from unittest import mock
+
+from proyscan import gitignore
+from proyscan.directory_walker import recorrer_proyecto, indexar_archivos
+from proyscan.ignore_handler import PatronesIgnorar
+
+ARCHIVOS = [
+    'a.txt', 'B.txt', '1.txt', 'x-y.txt', 'abc/def.txt', 'b', 'xzy', 'xay', 'x[y', 'x]y', 'z-a',
+    'build/keep.log', 'build/out.log', 'sub/build/keep.log', 'logs/debug.log', 'logs/sub/z.log',
+    'doc/a/b/c.md', 'doc/c.md', 'c.md', 'foo/bar', 'a/foo/bar', 'a/b/foo/bar',
+    '#nota', '!imp', 'esp ', 'esp', 'a.tmp', 'n/a.tmp', 'n/b.tmp', 'n/m/c.tmp', 'q.c', 'q.h',
+]
+# (reglas del .gitignore raíz, reglas de n/.gitignore, archivos ignorados)
+CASOS = {
+    'negacion_tras_regla_de_directorio': (['build/', '!build/keep.log'], None,
+                                          {'build/keep.log', 'build/out.log', 'sub/build/keep.log'}),
+    'negacion_dentro_de_directorio': (['build/*', '!build/keep.log'], None, {'build/out.log'}),
+    'doble_asterisco_inicial': (['**/foo/bar'], None, {'foo/bar', 'a/foo/bar', 'a/b/foo/bar'}),
+    'doble_asterisco_intermedio': (['doc/**/c.md'], None, {'doc/c.md', 'doc/a/b/c.md'}),
+    'doble_asterisco_final': (['logs/**'], None, {'logs/debug.log', 'logs/sub/z.log'}),
+    'anclado': (['/c.md'], None, {'c.md'}),
+    'sin_anclar': (['c.md'], None, {'c.md', 'doc/c.md', 'doc/a/b/c.md'}),
+    'anclado_por_barra_intermedia': (['doc/c.md'], None, {'doc/c.md'}),
+    'anidado_anula_al_padre': (['*.tmp'], ['!b.tmp'], {'a.tmp', 'n/a.tmp', 'n/m/c.tmp'}),
+    'anidado_con_precedencia': (['*.tmp', '!n/m/'], ['!*.tmp', 'a.tmp'], {'a.tmp', 'n/a.tmp'}),
+    'escapes': (['\\#nota', '\\!imp', 'esp\\ '], None, {'#nota', '!imp', 'esp '}),
+    'sin_escapes': (['#nota', '!imp', 'esp '], None, {'esp'}),
+    # Como en wildmatch, el inicio de un rango invertido sigue contando como carácter suelto
+    'rango_invertido': (['x[z-a]y', '[b-a]'], None, {'xzy', 'b', 'a/b/foo/bar', 'doc/a/b/c.md'}),
+    'clase_posix': (['[[:alpha:]]*.txt'], None, {'a.txt', 'B.txt', 'x-y.txt', 'abc/def.txt'}),
+    'clases_posix_digito_y_mayuscula': (['[[:digit:]].txt', '[[:upper:]].txt'], None, {'1.txt', 'B.txt'}),
+    'clase_posix_desconocida': (['[[:bogus:]]*', '*.md'], None, {'c.md', 'doc/c.md', 'doc/a/b/c.md'}),
+    'corchete_sin_cerrar': (['x[y', 'q.[ch]'], None, {'q.c', 'q.h'}),
+}
+
+
+def _crear_arbol(raiz: str, reglas: Sequence[str], reglas_anidadas: Optional[Sequence[str]]):
+    for ruta in ARCHIVOS:
+        completa = os.path.join(raiz, ruta)
+        os.makedirs(os.path.dirname(completa), exist_ok=True)
+        with open(completa, 'w', encoding='utf-8') as f:
+            f.write('x')
+    for directorio, lineas in (('', reglas), ('n', reglas_anidadas)):
+        if lineas is not None:
+            with open(os.path.join(raiz, directorio, '.gitignore'), 'w', encoding='utf-8') as f:
+                f.write('\n'.join(lineas) + '\n')
+
+
+def _visibles(raiz: str) -> Set[str]:
+    modelo, _ = recorrer_proyecto(raiz, PatronesIgnorar(), None, usar_gitignore=True)
+    return {ruta for ruta in indexar_archivos(modelo) if not ruta.endswith('.gitignore')}
+
+
+def _visibles_segun_git(raiz: str) -> Set[str]:
+    subprocess.run(['git', 'init', '-q', raiz], check=True)
+    salida = subprocess.run(['git', '-c', 'core.quotepath=off', 'ls-files', '-z', '-o', '--exclude-standard'],
+                            cwd=raiz, capture_output=True, check=True).stdout
+    return {ruta for ruta in salida.decode('utf-8').split('\0') if ruta and not ruta.endswith('.gitignore')}
+
+
+class TestReglasGitignore(unittest.TestCase):
+
+    def setUp(self):
+        self._temporal = tempfile.TemporaryDirectory()
+        self.numero = 0
+
+    def tearDown(self):
+        self._temporal.cleanup()
+
+    def arbol(self, reglas: Sequence[str], reglas_anidadas: Optional[Sequence[str]] = None) -> str:
+        self.numero += 1
+        raiz = os.path.join(self._temporal.name, str(self.numero))
+        _crear_arbol(raiz, reglas, reglas_anidadas)
+        return raiz
+
+    def test_casos_fijados(self):
+        for nombre, (reglas, anidadas, ignorados) in CASOS.items():
+            with self.subTest(nombre):
+                self.assertEqual(_visibles(self.arbol(reglas, anidadas)), set(ARCHIVOS) - ignorados)
+
+    @unittest.skipUnless(shutil.which('git'), "git no está instalado")
+    def test_diferencial_contra_git(self):
+        for nombre, (reglas, anidadas, _) in CASOS.items():
+            with self.subTest(nombre):
+                raiz = self.arbol(reglas, anidadas)
+                self.assertEqual(_visibles(raiz), _visibles_segun_git(raiz))
+
+    def test_regla_que_no_compila_se_descarta(self):
+        raiz = self.arbol(['*.md', 'q.*'])
+        traducir = gitignore.traducir_patron
+        with mock.patch.object(gitignore, 'traducir_patron', lambda p: '(' if p == '*.md' else traducir(p)), \
+                self.assertLogs('proyscan.gitignore', 'WARNING') as registro:
+            visibles = _visibles(raiz)
+        self.assertEqual(visibles, set(ARCHIVOS) - {'q.c', 'q.h'})
+        self.assertIn(".gitignore, línea 1", registro.output[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
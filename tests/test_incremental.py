@@ -0,0 +1,77 @@
+# tests/test_incremental.py
+# Re-escaneo incremental: cuándo se acepta el manifiesto de un escaneo anterior y que el resultado
+# tras modificar, añadir y borrar archivos es el mismo que el de un escaneo completo.
+import os
+import json
+import shutil
+import tempfile
+import unittest
+
+from proyscan.config import ARCHIVO_CONTENIDO, ARCHIVO_ESTRUCTURA, ARCHIVO_GRAFO, ARCHIVO_MANIFIESTO
+from proyscan.incremental import cargar_escaneo_previo
+
+from .proyecto_mixto import crear_proyecto_mixto
+from .test_core import escanear, leer_bytes
+
+
+class TestEscaneoPrevio(unittest.TestCase):
+
+    def setUp(self):
+        self._temporal = tempfile.TemporaryDirectory()
+        self.raiz = self._temporal.name
+        self.proyecto = os.path.join(self.raiz, 'proyecto')
+        crear_proyecto_mixto(self.proyecto)
+        self.previo = escanear(self.proyecto, os.path.join(self.raiz, 'previo'), jobs=1)
+
+    def tearDown(self):
+        self._temporal.cleanup()
+
+    def modificar_manifiesto(self, **campos):
+        ruta = os.path.join(self.previo, ARCHIVO_MANIFIESTO)
+        with open(ruta, encoding='utf-8') as f:
+            manifiesto = json.load(f)
+        manifiesto.update(campos)
+        with open(ruta, 'w', encoding='utf-8') as f:
+            json.dump(manifiesto, f)
+
+    def test_mismo_proyecto_reutiliza_y_da_la_misma_salida(self):
+        previo = cargar_escaneo_previo(self.previo, os.path.join(self.proyecto, '.'))
+        self.assertIsNotNone(previo)
+        self.assertIn('src/b.js', previo.archivos)
+        incremental = escanear(self.proyecto, os.path.join(self.raiz, 'incremental'), jobs=1, directorio_previo=self.previo)
+        self.assertEqual(leer_bytes(self.previo, ARCHIVO_CONTENIDO), leer_bytes(incremental, ARCHIVO_CONTENIDO))
+
+    def test_cambios_igual_que_escaneo_completo(self):
+        # Modificado, añadido y borrado; quitar a.ts cambia también cómo se resuelven b.js, c.ts, index.ts y Comp.vue
+        util = os.path.join(self.proyecto, 'app', 'util.py')
+        with open(util, 'w', encoding='utf-8') as f:
+            f.write('from . import modelos\nfrom .nuevo import x\n')
+        os.utime(util, ns=(0, 0)) # El mtime cambia aunque el sistema de archivos tenga poca resolución
+        crear_proyecto_mixto(self.proyecto, {'app/nuevo.py': 'from app import util\nx = 1\n', 'src/a.js': 'export const a = 1;\n'})
+        os.remove(os.path.join(self.proyecto, 'src', 'a.ts'))
+
+        completo = escanear(self.proyecto, os.path.join(self.raiz, 'completo'), jobs=1)
+        for jobs in (1, 2):
+            with self.assertLogs('proyscan.core', 'INFO') as registro:
+                incremental = escanear(self.proyecto, os.path.join(self.raiz, f'incremental{jobs}'), jobs=jobs, directorio_previo=self.previo)
+            self.assertTrue(any("22 archivos reutilizados, 3 procesados de nuevo" in linea for linea in registro.output))
+            for nombre in (ARCHIVO_CONTENIDO, ARCHIVO_GRAFO, ARCHIVO_ESTRUCTURA):
+                self.assertEqual(leer_bytes(completo, nombre), leer_bytes(incremental, nombre), f"{nombre} con jobs={jobs}")
+
+    def test_otro_proyecto(self):
+        otro = os.path.join(self.raiz, 'otro')
+        shutil.copytree(self.proyecto, otro)
+        with self.assertLogs('proyscan.incremental', 'WARNING'):
+            self.assertIsNone(cargar_escaneo_previo(self.previo, otro))
+        self.modificar_manifiesto(project_path=None)
+        with self.assertLogs('proyscan.incremental', 'WARNING'):
+            self.assertIsNone(cargar_escaneo_previo(self.previo, self.proyecto))
+
+    def test_otra_version_de_los_analizadores(self):
+        self.modificar_manifiesto(analyzer_fingerprint='0' * 32)
+        with self.assertLogs('proyscan.incremental', 'WARNING'):
+            self.assertIsNone(cargar_escaneo_previo(self.previo, self.proyecto))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,35 @@
+# tests/test_js_index.py
+# Resolución de especificadores JS/TS con IndiceModulosJs.
+import unittest
+
+from proyscan.dependency_analysis.analyzer import analizar_dependencias
+from proyscan.dependency_analysis.context import ContextoAnalisis
+from proyscan.dependency_analysis.js_index import IndiceModulosJs
+
+
+class TestIndiceModulosJs(unittest.TestCase):
+
+    def test_extension_js_depende_del_lenguaje_del_importador(self):
+        # En TypeScript './a.js' es a.ts; en JavaScript no. La memoización no debe mezclar ambos casos
+        for orden in (('src/b.js', 'src/c.ts'), ('src/c.ts', 'src/b.js')):
+            indice = IndiceModulosJs({'src/a.ts', 'src/b.js', 'src/c.ts'}, '.')
+            resultados = {ruta: indice.resolver('./a.js', ruta) for ruta in orden}
+            self.assertEqual(resultados, {'src/b.js': None, 'src/c.ts': 'src/a.ts'}, orden)
+
+    def test_misma_clasificacion_en_cualquier_orden(self):
+        contexto = ContextoAnalisis({'src/a.ts', 'src/b.js', 'src/c.ts'}, '.')
+        linea = ["import x from './a.js';"]
+        desde_js = analizar_dependencias(linea, 'javascript', 'src/b.js', contexto, '.')
+        desde_ts = analizar_dependencias(linea, 'typescript', 'src/c.ts', contexto, '.')
+        self.assertEqual(desde_js, [{'type': 'internal_broken', 'path': 'src/a.js'}])
+        self.assertEqual(desde_ts, [{'type': 'internal', 'path': 'src/a.ts'}])
+
+    def test_sin_extension_e_index(self):
+        indice = IndiceModulosJs({'src/utils.ts', 'src/comp/index.tsx', 'src/main.js'}, '.')
+        self.assertEqual(indice.resolver('./utils', 'src/main.js'), 'src/utils.ts')
+        self.assertEqual(indice.resolver('./comp', 'src/main.js'), 'src/comp/index.tsx')
+        self.assertIsNone(indice.resolver('./falta', 'src/main.js'))
+
+
+if __name__ == '__main__':
+    unittest.main()
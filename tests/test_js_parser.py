@@ -0,0 +1,61 @@
+# tests/test_js_parser.py
+# Extractor de imports JS/TS de una sola pasada (extraer_especificadores_js).
+import unittest
+
+from proyscan.dependency_analysis.js_parser import extraer_especificadores_js
+
+
+class TestExtractorJs(unittest.TestCase):
+
+    def extraer(self, texto: str, lenguaje: str = 'javascript'):
+        return extraer_especificadores_js(texto, lenguaje)
+
+    def test_formas_de_import(self):
+        texto = (
+            "import a from './a';\nimport { b,\n  c } from \"./bc\";\nimport './efecto';\nexport * from './reexport';\n"
+            "export { x } from './x';\nconst r = require('./r');\nconst d = await import('./dinamico');\n"
+            "new Worker(new URL('./w.js', import.meta.url));\nnew SharedWorker('./sw.js');\nimportScripts('s.js');\n"
+            "fetch('/api/datos', { method: 'POST' });\n"
+        )
+        self.assertEqual(self.extraer(texto), [
+            ('import', './a'), ('import', './bc'), ('import', './efecto'), ('export', './reexport'), ('export', './x'),
+            ('require', './r'), ('import', './dinamico'), ('Worker', './w.js'), ('Worker', './sw.js'),
+            ('importScripts', 's.js'), ('fetch', '/api/datos'),
+        ])
+
+    def test_ignora_comentarios_cadenas_plantillas_y_regex(self):
+        texto = (
+            "// import a from './c1'\n/* require('./c2')\n   import('./c3') */\n"
+            "const s = \"import x from './s1'\", t = 'require(\"./s2\")';\n"
+            "const p = `require('./p1') ${require('./p2')} ${`${import('./p3')}`}`;\n"
+            "const re = /import('.\\/re')/g, division = a / b / c;\nimport y from './y';\n"
+        )
+        self.assertEqual(self.extraer(texto), [('require', './p2'), ('import', './p3'), ('import', './y')])
+
+    def test_acceso_a_propiedad_no_es_dependencia(self):
+        texto = (
+            "obj.require('./x');\napi.fetch('./y');\ncliente?.import('./q');\nself.importScripts('s.js');\n"
+            "promesa\n  .then(f)\n  .fetch('./z');\nexports.require = 1;\nmodule.exports = require('./m');\n"
+        )
+        self.assertEqual(self.extraer(texto), [('require', './m')])
+
+    def test_spread_no_es_acceso_a_propiedad(self):
+        texto = "const c = { ...require('./cfg') };\nf(... import('./dinamico'));\n"
+        self.assertEqual(self.extraer(texto), [('require', './cfg'), ('import', './dinamico')])
+
+    def test_parte_de_otro_identificador(self):
+        texto = "myrequire('./n1'); requireX('./n2'); $import('./n3'); Workerish('./n4'); new Worker2('./n5');"
+        self.assertEqual(self.extraer(texto), [])
+
+    def test_referencias_typescript(self):
+        texto = "/// <reference path=\"./global.d.ts\" />\nimport type { T } from './tipos';\n"
+        self.assertEqual(self.extraer(texto, 'typescript'), [('reference', './global.d.ts'), ('import', './tipos')])
+        self.assertEqual(self.extraer(texto, 'javascript'), [('import', './tipos')])
+
+    def test_clausula_sin_from_no_cruza_otro_import(self):
+        texto = "import a, { b }\nimport c from './c';"
+        self.assertEqual(self.extraer(texto), [('import', './c')])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+# tests/test_python_index.py
+# Resolución de imports Python con IndiceModulosPython.
+import unittest
+
+from proyscan.dependency_analysis.python_index import IndiceModulosPython
+
+ARCHIVOS = {
+    'main.py', 'top.py',
+    'a.py', 'a/__init__.py', # El módulo a.py tiene prioridad sobre el paquete a/
+    'pkg/__init__.py', 'pkg/c.py', 'pkg/a/__init__.py', 'pkg/a/b.py',
+    'src/mipkg/__init__.py', 'src/mipkg/core.py', 'tests/test_x.py', # Layout src/
+    'svc/pyproject.toml', 'svc/lib/__init__.py', 'svc/lib/m.py', # Subproyecto instalable
+    'ns/sub/mod.py', # Paquete de espacio de nombres (sin __init__.py)
+}
+
+
+class TestIndiceModulosPython(unittest.TestCase):
+
+    def setUp(self):
+        self.indice = IndiceModulosPython(ARCHIVOS)
+
+    def resolver(self, modulo: str, nombres, nivel: int, desde: str):
+        return self.indice.resolver_import(modulo, list(nombres), nivel, desde)
+
+    def test_raices_de_fuentes(self):
+        self.assertEqual(self.indice.raices, ['', 'src/', 'svc/'])
+
+    def test_modulo_py_antes_que_paquete(self):
+        self.assertEqual(self.resolver('a', ['x'], 0, 'main.py'), [('a.x', 'a.py')])
+
+    def test_init_y_submodulo_de_paquete(self):
+        self.assertEqual(self.resolver('pkg', ['c'], 0, 'main.py'), [('pkg.c', 'pkg/__init__.py')])
+        self.assertEqual(self.indice.submodulo_de_paquete('pkg.c', 'pkg/__init__.py'), 'pkg/c.py')
+        self.assertIsNone(self.indice.submodulo_de_paquete('pkg.nada', 'pkg/__init__.py'))
+
+    def test_layout_src_y_subproyectos(self):
+        self.assertEqual(self.resolver('mipkg.core', ['f'], 0, 'tests/test_x.py'), [('mipkg.core.f', 'src/mipkg/core.py')])
+        self.assertEqual(self.resolver('lib', ['m'], 0, 'svc/app.py'), [('lib.m', 'svc/lib/__init__.py')])
+        self.assertEqual(self.resolver('lib.m', ['*'], 0, 'main.py'), [('lib.m', 'svc/lib/m.py')])
+        self.assertEqual(self.indice.submodulo_de_paquete('lib.m', 'svc/lib/__init__.py'), 'svc/lib/m.py')
+
+    def test_paquete_de_espacio_de_nombres(self):
+        # Sin __init__.py cada nombre importado solo puede ser un submódulo
+        self.assertEqual(self.resolver('ns.sub', ['mod', 'nada'], 0, 'main.py'), [('ns.sub.mod', 'ns/sub/mod.py'), ('ns.sub.nada', None)])
+        self.assertEqual(self.resolver('ns.sub', ['*'], 0, 'main.py'), [('ns.sub', None)])
+
+    def test_niveles_relativos(self):
+        self.assertEqual(self.resolver('', ['c'], 2, 'pkg/a/b.py'), [('..c', 'pkg/c.py')])
+        self.assertEqual(self.resolver('c', ['y'], 1, 'pkg/b.py'), [('.c.y', 'pkg/c.py')])
+        self.assertEqual(self.resolver('', ['top'], 3, 'pkg/a/b.py'), [('...top', 'top.py')])
+
+    def test_relativos_que_exceden_la_raiz(self):
+        with self.assertLogs('proyscan.dependency_analysis.python_index', 'WARNING'):
+            self.assertEqual(self.resolver('', ['top'], 4, 'pkg/a/b.py'), [('....top', None)])
+        # Un archivo de la raíz no tiene paquete padre
+        self.assertEqual(self.resolver('', ['top'], 1, 'main.py'), [('.top', None)])
+        with self.assertLogs('proyscan.dependency_analysis.python_index', 'WARNING'):
+            self.assertEqual(self.resolver('', ['*'], 1, 'pkg/b.py'), [('.*', None)])
+
+    def test_memoizacion_no_mezcla_directorios(self):
+        self.assertEqual(self.resolver('', ['c'], 1, 'pkg/x.py'), [('.c', 'pkg/c.py')])
+        self.assertEqual(self.resolver('', ['c'], 1, 'pkg/a/x.py'), [('.c', None)])
+        self.assertEqual(self.resolver('', ['b'], 1, 'pkg/a/x.py'), [('.b', 'pkg/a/b.py')])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+# tests/test_python_parser.py
+# Imports Python: el recorrido por listas de sentencias encuentra lo mismo que visitar todo el AST.
+import os
+import ast
+import glob
+import random
+import unittest
+from typing import List
+
+from proyscan.dependency_analysis.python_index import IndiceModulosPython
+from proyscan.dependency_analysis.python_parser import PythonImportVisitor, analizar_python
+
+RAIZ_REPO = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+ARCHIVOS = {'app/__init__.py', 'app/a.py', 'app/b.py', 'app/sub/__init__.py', 'app/sub/c.py', 'util.py'}
+IMPORTS = [
+    'import os', 'import app.a', 'from app import b', 'from . import a', 'from .sub import c',
+    'from .. import util', 'import requests', 'from util import *', 'import json as j',
+]
+# Sentencias compuestas con los campos que contienen listas de sentencias (body, orelse, handlers...)
+BLOQUES = [
+    'if x:\n{0}\nelse:\n{1}', 'for i in y:\n{0}\nelse:\n{1}', 'while x:\n{0}\nelse:\n{1}',
+    'try:\n{0}\nexcept ImportError:\n{1}\nfinally:\n{0}', 'try:\n{0}\nexcept* ValueError:\n{1}',
+    'with ctx() as c:\n{0}', 'async def f():\n{0}\n    async with a:\n    {1}', 'def g(x=lambda: 1):\n{0}',
+    'class K(Base):\n{0}', 'match v:\n    case 1:\n    {0}\n    case _:\n    {1}',
+]
+
+
+def _sangrar(codigo: str) -> str:
+    return '\n'.join('    ' + linea for linea in codigo.split('\n'))
+
+
+def _codigo_aleatorio(aleatorio: random.Random, profundidad: int) -> str:
+    sentencias: List[str] = []
+    for _ in range(aleatorio.randint(1, 3)):
+        if profundidad > 0 and aleatorio.random() < 0.5:
+            bloque = aleatorio.choice(BLOQUES)
+            cuerpo, alternativa = (_sangrar(_codigo_aleatorio(aleatorio, profundidad - 1)) for _ in range(2))
+            sentencias.append(bloque.format(cuerpo, alternativa))
+        else:
+            sentencias.append(aleatorio.choice(IMPORTS + ['pass', 'x = [i for i in y]']))
+    return '\n'.join(sentencias)
+
+
+def _dependencias(arbol: ast.AST, ruta: str, completo: bool):
+    visitor = PythonImportVisitor(ruta, IndiceModulosPython(ARCHIVOS))
+    if completo:
+        visitor.visit(arbol) # NodeVisitor genérico: visita cada nodo, expresiones incluidas
+    else:
+        visitor.recorrer(arbol)
+    return visitor.obtener_dependencias()
+
+
+class TestImportsPython(unittest.TestCase):
+
+    def test_diferencial_contra_visita_completa(self):
+        aleatorio = random.Random(1234)
+        for _ in range(300):
+            codigo = _codigo_aleatorio(aleatorio, 3)
+            try:
+                arbol = ast.parse(codigo)
+            except SyntaxError: # except* y match según la versión de Python
+                continue
+            self.assertEqual(_dependencias(arbol, 'app/sub/m.py', False), _dependencias(arbol, 'app/sub/m.py', True), codigo)
+
+    def test_diferencial_sobre_el_propio_repositorio(self):
+        for ruta in glob.glob(os.path.join(RAIZ_REPO, 'proyscan', '**', '*.py'), recursive=True):
+            with open(ruta, encoding='utf-8') as f:
+                arbol = ast.parse(f.read())
+            relativa = os.path.relpath(ruta, RAIZ_REPO).replace(os.sep, '/')
+            self.assertEqual(_dependencias(arbol, relativa, False), _dependencias(arbol, relativa, True), relativa)
+
+    def test_clasificacion(self):
+        codigo = ['import os.path', 'try:', '    from .sub import c', 'except ImportError:', '    import requests',
+                  'def f():', '    from .. import nada']
+        dependencias = analizar_python(codigo, 'app/m.py', IndiceModulosPython(ARCHIVOS))
+        self.assertEqual(dependencias, [
+            {'type': 'internal', 'path': 'app/sub/__init__.py'}, # Relativo: sin ajuste a submódulo
+            {'type': 'internal_broken', 'path': "Relative import '..nada' from 'app/m.py'"},
+            {'type': 'library', 'path': 'requests'},
+            {'type': 'stdlib', 'path': 'os'},
+        ])
+
+    def test_sintaxis_invalida(self):
+        with self.assertLogs('proyscan.dependency_analysis.python_parser', 'WARNING'):
+            self.assertIsNone(analizar_python(['def f(:'], 'app/m.py', IndiceModulosPython(ARCHIVOS)))
+
+
+if __name__ == '__main__':
+    unittest.main()
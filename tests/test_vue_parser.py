@@ -0,0 +1,59 @@
+# tests/test_vue_parser.py
+# División de componentes Vue en bloques de nivel superior y dependencias de cada bloque.
+import unittest
+
+from proyscan.dependency_analysis.context import ContextoAnalisis
+from proyscan.dependency_analysis.vue_parser import dividir_sfc, analizar_vue
+
+COMPONENTE = '''<!-- <script>import x from './comentado'</script> -->
+<template>
+  <div><template v-if="a"><img src="./logo.png"></template><template #slot/></div>
+</template>
+<script setup lang="ts">
+const s = '</template>'; import A from './A.vue'
+</script>
+<style scoped lang="scss" src="./estilos.scss" />
+<style>@import "./base.css";</style>
+<i18n lang="json">{"a": "<script>"}</i18n>
+'''
+
+
+class TestDivisionSfc(unittest.TestCase):
+
+    def test_bloques_de_nivel_superior(self):
+        bloques = dividir_sfc(COMPONENTE)
+        self.assertEqual([(b.etiqueta, b.atributos) for b in bloques], [
+            ('template', {}),
+            ('script', {'setup': '', 'lang': 'ts'}),
+            ('style', {'scoped': '', 'lang': 'scss', 'src': './estilos.scss'}),
+            ('style', {}),
+            ('i18n', {'lang': 'json'}),
+        ])
+        contenidos = [COMPONENTE[b.inicio:b.fin] for b in bloques]
+        # Los <template> anidados (v-if, slots autocerrados) no cierran el bloque
+        self.assertTrue(contenidos[0].endswith('</div>\n'))
+        self.assertEqual(contenidos[1], "\nconst s = '</template>'; import A from './A.vue'\n")
+        self.assertEqual(contenidos[2], '')
+        self.assertEqual(contenidos[4], '{"a": "<script>"}')
+
+    def test_sin_cierre_y_cierre_en_cadena(self):
+        self.assertEqual([(b.inicio, b.fin) for b in dividir_sfc('<template><p>sin cierre')], [(10, 23)])
+        # Como en el navegador y @vue/compiler-sfc, el primer </script> cierra el bloque
+        texto = '<script>const a = "</script>";</script>'
+        self.assertEqual([texto[b.inicio:b.fin] for b in dividir_sfc(texto)], ['const a = "'])
+
+    def test_comentario_sin_cerrar(self):
+        self.assertEqual(dividir_sfc('<!-- <script>import a from "./a"</script>'), [])
+
+    def test_dependencias_de_todos_los_bloques(self):
+        contexto = ContextoAnalisis({'comp/C.vue', 'comp/A.vue', 'comp/logo.png', 'comp/base.css', 'comp/estilos.scss'}, '.')
+        self.assertEqual(analizar_vue(COMPONENTE.split('\n'), 'comp/C.vue', contexto), [
+            {'type': 'internal', 'path': 'comp/A.vue'},
+            {'type': 'internal', 'path': 'comp/base.css'},
+            {'type': 'internal', 'path': 'comp/estilos.scss'},
+            {'type': 'internal', 'path': 'comp/logo.png'},
+        ])
+
+
+if __name__ == '__main__':
+    unittest.main()